@@ -0,0 +1,131 @@
+"""
+Answer Table - Precomputed recommendations for every preference combination
+The preference space (month, budget category, known country) is small and
+finite, so all unpriced answers can be built offline and fetched in O(1).
+Costs depend on trip duration and are still added at request time, and
+requests with exact travel dates or a search area are ranked live.
+
+Build the table with:
+    python answer_table.py
+"""
+
+import json
+import os
+
+from festival_data import (
+    SEASONAL_FESTIVALS,
+    COUNTRY_SPECIALTIES,
+    CITY_COUNTRY_MAP,
+    DESTINATION_PACKAGES,
+    catalog_fingerprint,
+    current_catalog
+)
+from records import Recommendation
+
+ANSWER_TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "answer_table.json")
+
+# Ranked recommendations kept per key - larger k falls back to live ranking
+ANSWER_TABLE_DEPTH = 50
+
+def preference_space(planner):
+    """All (month, country, budget category, dates, area) keys, None meaning not given"""
+    months = [None]
+    for season_data in SEASONAL_FESTIVALS.values():
+        months.extend(season_data.keys())
+    
+    countries = set(COUNTRY_SPECIALTIES) | set(CITY_COUNTRY_MAP.values())
+    for season_data in SEASONAL_FESTIVALS.values():
+        for festivals in season_data.values():
+            countries.update(festival["country"] for festival in festivals)
+    for destination in DESTINATION_PACKAGES:
+        countries.update(destination["countries"])
+    
+    budget_categories = [None] + list(planner.budget_ranges)
+    
+    for month in months:
+        for country in [None] + sorted(countries):
+            for budget_category in budget_categories:
+                yield (month, country, budget_category, None, None)
+
+def _encode_key(key):
+    return "|".join("" if part is None else str(part) for part in key)
+
+class AnswerTable:
+    def __init__(self, records, answers, fingerprint, depth=ANSWER_TABLE_DEPTH):
+        self.records = records
+        self.answers = answers
+        self.fingerprint = fingerprint
+        self.depth = depth
+    
+    def get(self, key, k):
+        """Get the top k unpriced recommendations for a key, or None if not precomputed"""
+        record_ids = self.answers.get(_encode_key(key))
+        if record_ids is None:
+            return None
+        if k > len(record_ids) and len(record_ids) >= self.depth:
+            # The stored ranking was cut off at depth - can't answer this k
+            return None
+        return [self.records[record_id] for record_id in record_ids[:k]]
+    
+    def __len__(self):
+        return len(self.answers)
+    
+    def save(self, path=ANSWER_TABLE_PATH):
+        """Write the table as compact JSON"""
+        data = {
+            "fingerprint": self.fingerprint,
+            "depth": self.depth,
+            "records": [record.to_dict() for record in self.records],
+            "answers": self.answers
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+    
+    @classmethod
+    def load(cls, path=ANSWER_TABLE_PATH):
+        """Read a table written by save()"""
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        records = [Recommendation(**record) for record in data["records"]]
+        return cls(records, data["answers"], data["fingerprint"], data["depth"])
+
+def build_answer_table(planner, depth=ANSWER_TABLE_DEPTH):
+    """
+    Rank the top `depth` recommendations for every key in the preference space
+    Identical recommendations are stored once and shared between keys.
+    """
+    catalog = current_catalog()
+    records = []
+    record_ids = {}
+    answers = {}
+    
+    for key in preference_space(planner):
+        ids = []
+        for rec in planner._evaluate_preference_key(key, depth, catalog):
+            if rec not in record_ids:
+                record_ids[rec] = len(records)
+                records.append(rec)
+            ids.append(record_ids[rec])
+        answers[_encode_key(key)] = ids
+    
+    return AnswerTable(records, answers, catalog.fingerprint, depth)
+
+def load_answer_table(path=ANSWER_TABLE_PATH):
+    """
+    Load a prebuilt table if one exists and matches the current catalog
+    Returns None otherwise, and the planner computes answers live.
+    """
+    if not os.path.exists(path):
+        return None
+    table = AnswerTable.load(path)
+    if table.fingerprint != catalog_fingerprint():
+        return None
+    return table
+
+if __name__ == "__main__":
+    from trip_planner import TripPlanner
+    
+    table = build_answer_table(TripPlanner())
+    table.save()
+    print(f"✅ Precomputed {len(table)} answers ({len(table.records)} unique recommendations)")
+    print(f"   Saved to {ANSWER_TABLE_PATH}")
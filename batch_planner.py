@@ -0,0 +1,236 @@
+"""
+Batch Planner - Non-interactive JSONL recommendations
+Reads one preference object per line (the same keys the interactive planner
+collects: travel_month, budget_category, preferred_country, duration,
+depart_date, return_date, near, radius_km) and writes one result line per
+input line, in input order.
+
+Run a batch with:
+    python main.py --batch preferences.jsonl [--output results.jsonl] [--workers N]
+"""
+
+import json
+import os
+import sys
+import time
+from collections import deque
+from itertools import islice
+
+# Keys that label a record rather than describe the trip
+RECORD_FIELDS = ("id",)
+
+# Error line for a record that failed in an unexpected way
+INTERNAL_ERROR = "internal error while planning this record"
+
+class BatchReport:
+    def __init__(self, source):
+        self.source = source
+        self.records = 0
+        self.rejected = 0
+        self.errors = []
+        self.seconds = 0.0
+        # pid -> [records, busy seconds] when run on a process pool
+        self.workers = {}
+    
+    @property
+    def records_per_sec(self):
+        return self.records / self.seconds if self.seconds else 0.0
+    
+    def __repr__(self):
+        return (f"BatchReport({self.source!r}, records={self.records}, rejected={self.rejected}, "
+                f"records_per_sec={self.records_per_sec:.0f})")
+
+def read_preference_lines(f):
+    """Lazily yield (line_number, text) for every non-blank line"""
+    for line_number, line in enumerate(f, 1):
+        if line.strip():
+            yield line_number, line
+
+def parse_preferences(text):
+    """Preference dict for one JSONL line, raising ValueError if it isn't an object"""
+    try:
+        record = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"bad JSON: {e}")
+    if not isinstance(record, dict):
+        raise ValueError("record is not an object")
+    return record
+
+def _result_line(line_number, record, recommendations=None, error=None):
+    result = {"line": line_number}
+    for field in RECORD_FIELDS:
+        if field in record:
+            result[field] = record[field]
+    if error is None:
+        result["recommendations"] = [rec.to_dict() for rec in recommendations]
+    else:
+        result["error"] = error
+    return json.dumps(result, ensure_ascii=False) + "\n"
+
+def plan_lines(planner, lines, k=3, report=None):
+    """
+    Plan a chunk of (line_number, text) pairs and return the output lines
+    The chunk goes through get_personalized_recommendations_batch, so repeated
+    preferences are ranked once. If a record in it is invalid, the chunk is
+    re-run record by record so only that record is rejected - whatever it
+    raises, a bad record becomes an error line and never stops the run.
+    Field checks run first and name the field at fault. Unexpected errors
+    are reported without their internal details.
+    """
+    from trip_planner import check_preferences
+    
+    parsed, output = [], {}
+    for line_number, text in lines:
+        record = {}
+        try:
+            record = parse_preferences(text)
+            preferences = {key: value for key, value in record.items() if key not in RECORD_FIELDS}
+            check_preferences(preferences)
+        except ValueError as e:
+            output[line_number] = _result_line(line_number, record, error=str(e))
+            if report is not None:
+                _reject(report, line_number, e)
+            continue
+        parsed.append((line_number, record, preferences))
+    
+    try:
+        results = planner.get_personalized_recommendations_batch([p for _, _, p in parsed], k)
+    except Exception:
+        results = None
+    
+    for position, (line_number, record, preferences) in enumerate(parsed):
+        if results is not None:
+            output[line_number] = _result_line(line_number, record, results[position])
+            continue
+        try:
+            recommendations = planner.get_personalized_recommendations_batch([preferences], k)[0]
+        except ValueError as e:
+            # The planner's own validation messages name the field at fault
+            output[line_number] = _result_line(line_number, record, error=str(e))
+            if report is not None:
+                _reject(report, line_number, e)
+        except Exception as e:
+            # Anything else is a bug - keep its details out of the results
+            output[line_number] = _result_line(line_number, record, error=INTERNAL_ERROR)
+            if report is not None:
+                _reject(report, line_number, f"{INTERNAL_ERROR} ({type(e).__name__})")
+        else:
+            output[line_number] = _result_line(line_number, record, recommendations)
+    
+    if report is not None:
+        report.records += len(output)
+    return [output[line_number] for line_number, text in lines]
+
+def _reject(report, line_number, error, max_errors=100):
+    report.rejected += 1
+    if len(report.errors) < max_errors:
+        report.errors.append(f"line {line_number}: {error}")
+
+def plan_file(planner, source, output, k=3, chunk_size=2000, progress=None):
+    """
+    Stream preference JSONL from source into result JSONL on output
+    source and output are open text files. Each chunk is written with one
+    call to a large write buffer, so output cost stays off the hot path.
+    """
+    report = BatchReport(getattr(source, "name", "<stdin>"))
+    started = time.perf_counter()
+    
+    lines = read_preference_lines(source)
+    while True:
+        chunk = list(islice(lines, chunk_size))
+        if not chunk:
+            break
+        output.write("".join(plan_lines(planner, chunk, k, report)))
+        report.seconds = time.perf_counter() - started
+        if progress:
+            progress(report)
+    
+    output.flush()
+    report.seconds = time.perf_counter() - started
+    return report
+
+def plan_file_parallel(planner, source, output, k=3, workers=None, chunk_size=2000, progress=None):
+    """
+    Shard a preference JSONL stream across a pool of worker processes
+    Every worker gets the current catalog snapshot and answer table once, in
+    its initializer, and plans whole chunks. Chunks are written back in input
+    order, and only a few per worker are in flight so memory stays flat.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from festival_data import current_catalog
+    
+    workers = workers or os.cpu_count() or 1
+    report = BatchReport(getattr(source, "name", "<stdin>"))
+    started = time.perf_counter()
+    
+    lines = read_preference_lines(source)
+    initargs = (current_catalog(), planner.answer_table, planner.cost_seed)
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=initargs) as pool:
+        pending = deque()
+        while True:
+            chunk = list(islice(lines, chunk_size))
+            if chunk:
+                pending.append(pool.submit(_plan_chunk, chunk, k))
+                if len(pending) < 2 * workers:
+                    continue
+            if not pending:
+                break
+            
+            # Oldest chunk first keeps the output in input order
+            pid, text, records, rejected, errors, seconds = pending.popleft().result()
+            output.write(text)
+            report.records += records
+            report.rejected += rejected
+            report.errors.extend(errors[:100 - len(report.errors)])
+            worker = report.workers.setdefault(pid, [0, 0.0])
+            worker[0] += records
+            worker[1] += seconds
+            report.seconds = time.perf_counter() - started
+            if progress:
+                progress(report)
+    
+    output.flush()
+    report.seconds = time.perf_counter() - started
+    return report
+
+# Per-process planner, set up by _init_worker
+_WORKER_PLANNER = None
+
+def _init_worker(catalog, answer_table, cost_seed):
+    global _WORKER_PLANNER
+    from festival_data import swap_catalog
+    from trip_planner import TripPlanner
+    
+    # Plan against the parent's snapshot, not whatever this process loaded itself
+    swap_catalog(catalog)
+    _WORKER_PLANNER = TripPlanner(cost_seed=cost_seed, answer_table=answer_table)
+
+def _plan_chunk(chunk, k):
+    """Plan one chunk in a worker - output text plus counts for the report"""
+    started = time.perf_counter()
+    report = BatchReport(None)
+    text = "".join(plan_lines(_WORKER_PLANNER, chunk, k, report))
+    return os.getpid(), text, report.records, report.rejected, report.errors, time.perf_counter() - started
+
+def open_output(path=None, buffer_size=1 << 20):
+    """Buffered text output for a path, or for stdout when path is None"""
+    if path is None:
+        sys.stdout.flush()
+        return open(sys.stdout.fileno(), "w", encoding="utf-8", buffering=buffer_size, closefd=False)
+    return open(path, "w", encoding="utf-8", buffering=buffer_size)
+
+def open_input(path=None):
+    """Text input for a path, or stdin when path is None or '-'"""
+    if path is None or path == "-":
+        return open(sys.stdin.fileno(), "r", encoding="utf-8", closefd=False)
+    return open(path, "r", encoding="utf-8")
+
+def print_report(report):
+    """Summary on stderr, so stdout stays pure JSONL"""
+    print(f"✅ {report.records:,} records in {report.seconds:.2f}s "
+          f"({report.records_per_sec:,.0f} records/sec), {report.rejected:,} rejected", file=sys.stderr)
+    for pid, (records, seconds) in sorted(report.workers.items()):
+        rate = records / seconds if seconds else 0.0
+        print(f"   ⚙️  worker {pid}: {records:,} records ({rate:,.0f} records/sec busy)", file=sys.stderr)
+    for error in report.errors[:10]:
+        print(f"   ❌ {error}", file=sys.stderr)
@@ -0,0 +1,236 @@
+"""
+Scaling benchmark - Public catalog and planner functions on synthetic catalogs
+For every catalog size, a fresh process builds a synthetic catalog (see
+synthetic_catalog.py), swaps it in and times each public function over
+varied inputs: latency percentiles, throughput and peak traced memory.
+Every function is timed twice. Cold calls clear the snapshot and planner
+caches first, so they measure the real lookup and ranking work. Warm calls
+repeat inputs that were already answered, so they measure cache hits.
+Results are printed as a table and saved as JSON.
+
+Run from the project folder:
+    python benchmarks/catalog_scaling.py [--sizes 100,1000,10000,100000] [--output results.json]
+
+The default sizes stop at 10^5 rows. Larger sizes can be passed with
+--sizes, and --seconds still caps the timing of each function, but building
+the catalog is not capped: it takes about 45 µs and 0.7 KiB per row, so 10^7
+rows need several minutes and GiBs before the first call is timed.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DEFAULT_SIZES = (10**2, 10**3, 10**4, 10**5)
+PERCENTILES = (50, 90, 99)
+# Distinct inputs cycled through for warm (cached) timings
+WARM_INPUTS = 20
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    index = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+def make_typo(text, rng):
+    """text with one letter replaced, to exercise the fuzzy place matcher"""
+    position = rng.randrange(len(text))
+    return text[:position] + rng.choice("aeiouxyz") + text[position + 1:]
+
+def workloads(rng, countries, cities):
+    """
+    (clear_caches, workloads)
+    workloads is a (name, function, input generator) for every benchmarked
+    public function, and clear_caches() empties every cache they go through.
+    """
+    import festival_data
+    from trip_planner import TripPlanner
+    
+    planner = TripPlanner()
+    months = ["january", "march", "june", "october", "december"]
+    
+    def place_input():
+        roll = rng.random()
+        if roll < 0.4:
+            return rng.choice(cities)
+        if roll < 0.7:
+            return rng.choice(countries)
+        if roll < 0.9:
+            return make_typo(rng.choice(cities), rng)
+        return f"nowhere {rng.randrange(10**6)}"
+    
+    def preferences_input():
+        preferences = {"duration": rng.randint(3, 14)}
+        if rng.random() < 0.8:
+            preferences["travel_month"] = rng.choice(months)
+        if rng.random() < 0.8:
+            preferences["budget_category"] = rng.choice(["budget", "moderate", "luxury"])
+        if rng.random() < 0.8:
+            preferences["preferred_country"] = place_input()
+        return preferences
+    
+    def clear_caches():
+        snapshot = festival_data.current_catalog()
+        snapshot.festivals_by_month.cache_clear()
+        snapshot.festivals_by_country.cache_clear()
+        snapshot.resolve_city.cache_clear()
+        planner.invalidate_cache()
+    
+    return clear_caches, [
+        ("get_festivals_by_country", festival_data.get_festivals_by_country, lambda: rng.choice(countries)),
+        ("query_festivals", lambda country: festival_data.query_festivals(country=country),
+         lambda: rng.choice(countries)),
+        ("normalize_country_input", festival_data.normalize_country_input, place_input),
+        ("get_personalized_recommendations", planner.get_personalized_recommendations, preferences_input),
+        ("get_seasonal_highlights", planner.get_seasonal_highlights, lambda: rng.choice(months))
+    ]
+
+def time_calls(function, inputs, seconds, before_each=None):
+    """
+    Per-call latencies in seconds, stopping early once the time budget is spent
+    before_each() runs ahead of every call, outside the timing.
+    """
+    latencies = []
+    deadline = time.perf_counter() + seconds
+    for value in inputs:
+        if before_each:
+            before_each()
+        started = time.perf_counter()
+        function(value)
+        finished = time.perf_counter()
+        latencies.append(finished - started)
+        if finished > deadline and len(latencies) >= 10:
+            break
+    return latencies
+
+def peak_memory(function, inputs, before_each):
+    """Peak traced bytes allocated while making a few cold calls"""
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    for value in inputs:
+        before_each()
+        function(value)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak - baseline
+
+def benchmark_size(rows, seed, calls, seconds):
+    """Build one catalog size in this process and benchmark every function on it"""
+    from synthetic_catalog import synthetic_catalog
+    import festival_data
+    from catalog_snapshot import build_catalog_snapshot
+    
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    store, specialties, city_country_map, city_coordinates = synthetic_catalog(rows, seed)
+    snapshot = build_catalog_snapshot(store, festival_data.DESTINATION_PACKAGES, specialties, {},
+                                      city_country_map, city_coordinates)
+    festival_data.swap_catalog(snapshot)
+    build_seconds = time.perf_counter() - started
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    
+    rng = random.Random(seed)
+    result = {
+        "rows": rows,
+        "countries": len(specialties),
+        "cities": len(city_country_map),
+        "build_seconds": build_seconds,
+        # ru_maxrss is in KiB on Linux and bytes on macOS
+        "build_peak_rss_kib": (rss_after - rss_before) // (1024 if sys.platform == "darwin" else 1),
+        "functions": {}
+    }
+    clear_caches, functions = workloads(rng, list(specialties), list(city_country_map))
+    for name, function, make_input in functions:
+        inputs = [make_input() for _ in range(calls)]
+        cold = time_calls(function, inputs, seconds, before_each=clear_caches)
+        
+        # Warm: a small set of inputs, each answered once before timing starts
+        repeated = inputs[:WARM_INPUTS]
+        for value in repeated:
+            function(value)
+        warm = time_calls(function, [repeated[i % len(repeated)] for i in range(calls)], seconds)
+        
+        result["functions"][name] = {
+            "cold": latency_stats(cold),
+            "warm": latency_stats(warm),
+            "peak_traced_kib": peak_memory(function, inputs[:50], clear_caches) / 1024
+        }
+    return result
+
+def latency_stats(latencies):
+    """Percentiles, mean, max and throughput of per-call latencies"""
+    latencies = sorted(latencies)
+    total = sum(latencies)
+    stats = {
+        "calls": len(latencies),
+        "mean_us": total / len(latencies) * 1e6,
+        "max_us": latencies[-1] * 1e6,
+        "throughput_per_sec": len(latencies) / total if total else 0.0
+    }
+    for pct in PERCENTILES:
+        stats[f"p{pct}_us"] = percentile(latencies, pct) * 1e6
+    return stats
+
+def run_in_subprocess(rows, args):
+    """Benchmark one size in a fresh interpreter, so caches and memory start clean"""
+    command = [sys.executable, os.path.abspath(__file__), "--one", str(rows),
+               "--seed", str(args.seed), "--calls", str(args.calls), "--seconds", str(args.seconds)]
+    output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
+
+def print_results(results):
+    for result in results:
+        print(f"\n📊 {result['rows']:,} festivals, {result['countries']:,} countries, {result['cities']:,} cities "
+              f"- built in {result['build_seconds']:.2f}s (+{result['build_peak_rss_kib'] / 1024:,.1f} MiB RSS)")
+        print(f"   {'function':<34}{'cache':<6}{'p50 µs':>10}{'p90 µs':>10}{'p99 µs':>10}{'calls/s':>12}{'peak KiB':>10}")
+        for name, timings in result["functions"].items():
+            for mode in ("cold", "warm"):
+                stats = timings[mode]
+                peak = f"{timings['peak_traced_kib']:>10.1f}" if mode == "cold" else ""
+                print(f"   {name if mode == 'cold' else '':<34}{mode:<6}{stats['p50_us']:>10.1f}{stats['p90_us']:>10.1f}"
+                      f"{stats['p99_us']:>10.1f}{stats['throughput_per_sec']:>12,.0f}{peak}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark catalog functions on synthetic catalogs")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma-separated festival row counts")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--calls", type=int, default=2000, help="calls per function")
+    parser.add_argument("--seconds", type=float, default=5.0, help="time budget per function")
+    parser.add_argument("--output", default="benchmark_results.json", help="JSON results file")
+    parser.add_argument("--one", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.one is not None:
+        print(json.dumps(benchmark_size(args.one, args.seed, args.calls, args.seconds)))
+        return
+    
+    results = []
+    for rows in (int(size) for size in args.sizes.split(",")):
+        print(f"⏱️  Benchmarking {rows:,} rows...", file=sys.stderr)
+        results.append(run_in_subprocess(rows, args))
+    
+    print_results(results)
+    report = {
+        "benchmark": "catalog_scaling",
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "calls": args.calls,
+        "results": results
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Saved results to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Memory benchmark - plain dicts vs slotted records
+Builds the same catalog rows both ways and compares traced allocations.
+
+Run from the project folder:
+    python benchmarks/memory_records.py [rows]
+"""
+
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from records import Festival, Recommendation
+
+def measure(build):
+    """Bytes still allocated after build() returns its rows"""
+    tracemalloc.start()
+    rows = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del rows
+    return current
+
+def festival_fields(i):
+    # Strings shared between rows, like the repeated values in a real catalog
+    return {"name": "Festival", "country": "UK", "description": "Seasonal celebration", "budget_range": "moderate"}
+
+def recommendation_fields(i):
+    return {"type": "festival", "title": "Experience Festival in UK", "description": "Seasonal celebration",
+            "country": "UK", "budget_range": "moderate", "estimated_cost": i}
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    cases = [
+        ("festivals", festival_fields, Festival),
+        ("recommendations", recommendation_fields, Recommendation)
+    ]
+    
+    print(f"📊 Memory for {rows:,} rows")
+    print("-" * 60)
+    for label, fields, record_type in cases:
+        as_dicts = measure(lambda: [dict(fields(i)) for i in range(rows)])
+        as_records = measure(lambda: [record_type(**fields(i)) for i in range(rows)])
+        saving = 1 - as_records / as_dicts
+        print(f"{label:<16} dicts: {as_dicts / 2**20:8.1f} MiB   records: {as_records / 2**20:8.1f} MiB   saved: {saving:.0%}")
+
+if __name__ == "__main__":
+    main()
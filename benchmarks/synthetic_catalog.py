@@ -0,0 +1,144 @@
+"""
+Synthetic catalog - Deterministic, scalable stand-ins for the festival data
+Generates festivals, country specialties, cities and their coordinates in
+the same shapes as festival_data, for any number of festival rows. The
+same (rows, seed) always gives the same catalog.
+
+Countries and cities grow with the festival table rather than matching it
+row for row: there are about sqrt(rows) countries and rows / 10 cities.
+Countries stop at 1,000, so past a million rows each country's posting list
+keeps growing (about rows / 1,000 ids) and country filters get costlier
+with size, as they would on real data. Beyond 256 countries the country
+column also switches from byte codes to 32-bit codes.
+
+Write a catalog out as a festival feed with:
+    python benchmarks/synthetic_catalog.py rows [feed.jsonl]
+"""
+
+import json
+import os
+import random
+import sys
+from math import isqrt
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from festival_store import FestivalStore
+from interval_index import month_bounds, month_day
+
+SEASON_MONTHS = {
+    "spring": ("march", "april", "may"),
+    "summer": ("june", "july", "august"),
+    "autumn": ("september", "october", "november"),
+    "winter": ("december", "january", "february")
+}
+MONTHS = ("january", "february", "march", "april", "may", "june", "july",
+          "august", "september", "october", "november", "december")
+BUDGET_RANGES = ("budget-friendly", "moderate", "expensive")
+SPECIALTIES = ("music festivals", "street food", "art and culture", "ancient traditions",
+               "outdoor celebrations", "religious festivals", "nightlife", "beaches")
+DESCRIPTIONS = ("Seasonal celebration", "Traditional parade", "Music and dance festival",
+                "Food and wine fair", "Lantern festival", "Harvest celebration")
+
+# Name parts - a number written in this base is always a unique, readable name
+_SYLLABLES = ("ka", "lo", "mi", "ra", "ne", "su", "to", "va", "de", "ri", "po", "za",
+              "bel", "mar", "tin", "gor", "sal", "ven")
+
+def _name(number, suffix):
+    parts = []
+    while True:
+        number, digit = divmod(number, len(_SYLLABLES))
+        parts.append(_SYLLABLES[digit])
+        if not number:
+            break
+    return "".join(parts) + suffix
+
+def catalog_scale(rows):
+    """(countries, cities) for a catalog of `rows` festivals"""
+    return min(max(10, isqrt(rows)), 1000), max(10, rows // 10)
+
+def synthetic_countries(count):
+    return [_name(i, "ia").title() for i in range(count)]
+
+def synthetic_country_specialties(countries, seed=0):
+    """COUNTRY_SPECIALTIES for the generated countries - two specialties and sometimes a budget type"""
+    rng = random.Random(f"specialties-{seed}")
+    specialties = {}
+    for country in countries:
+        picks = rng.sample(SPECIALTIES, 2)
+        if rng.random() < 0.5:
+            picks.append(rng.choice(BUDGET_RANGES))
+        specialties[country] = picks
+    return specialties
+
+def synthetic_cities(count, countries, seed=0):
+    """(CITY_COUNTRY_MAP, CITY_COORDINATES) for `count` generated cities"""
+    rng = random.Random(f"cities-{seed}")
+    city_country_map, city_coordinates = {}, {}
+    for i in range(count):
+        city = _name(i, "ton")
+        city_country_map[city] = rng.choice(countries)
+        city_coordinates[city] = (round(rng.uniform(-60, 70), 2), round(rng.uniform(-180, 180), 2))
+    return city_country_map, city_coordinates
+
+def iter_synthetic_festivals(rows, countries, seed=0):
+    """
+    Lazily yield (month, festival) pairs
+    Festivals are dicts shaped like SEASONAL_FESTIVALS entries; one in ten
+    has no fixed venue, like the touring events in the real catalog.
+    """
+    rng = random.Random(f"festivals-{seed}")
+    for i in range(rows):
+        month = rng.choice(MONTHS)
+        first, last = month_bounds(MONTHS.index(month) + 1)
+        start = rng.randint(first, last)
+        festival = {
+            "name": f"{_name(i, '').title()} Festival",
+            "country": rng.choice(countries),
+            "description": rng.choice(DESCRIPTIONS),
+            "budget_range": rng.choice(BUDGET_RANGES),
+            "start": month_day(start),
+            "end": month_day(min(start + rng.randint(0, 10), last))
+        }
+        if rng.random() < 0.9:
+            festival["lat"] = round(rng.uniform(-60, 70), 2)
+            festival["lon"] = round(rng.uniform(-180, 180), 2)
+        yield month, festival
+
+def synthetic_seasonal_festivals(rows, countries, seed=0):
+    """The nested season -> month -> festivals shape of SEASONAL_FESTIVALS"""
+    seasonal = {season: {month: [] for month in months} for season, months in SEASON_MONTHS.items()}
+    season_of = {month: season for season, months in SEASON_MONTHS.items() for month in months}
+    for month, festival in iter_synthetic_festivals(rows, countries, seed):
+        seasonal[season_of[month]][month].append(festival)
+    return seasonal
+
+def synthetic_festival_store(rows, countries, seed=0):
+    """A FestivalStore filled straight from the generator, without the nested dicts"""
+    store = FestivalStore()
+    for month, festival in iter_synthetic_festivals(rows, countries, seed):
+        store.append(festival, month)
+    return store
+
+def synthetic_catalog(rows, seed=0):
+    """
+    Every table of a synthetic catalog
+    Returns (festival store, country specialties, city -> country map, city coordinates).
+    """
+    country_count, city_count = catalog_scale(rows)
+    countries = synthetic_countries(country_count)
+    city_country_map, city_coordinates = synthetic_cities(city_count, countries, seed)
+    return (
+        synthetic_festival_store(rows, countries, seed),
+        synthetic_country_specialties(countries, seed),
+        city_country_map,
+        city_coordinates
+    )
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    countries = synthetic_countries(catalog_scale(rows)[0])
+    out = open(sys.argv[2], "w", encoding="utf-8") if len(sys.argv) > 2 else sys.stdout
+    with out:
+        for month, festival in iter_synthetic_festivals(rows, countries):
+            out.write(json.dumps(dict(festival, month=month)) + "\n")
@@ -0,0 +1,328 @@
+"""
+Catalog File - Memory-mapped binary festival catalog
+Writes the festival, country and city data to one binary file that worker
+processes map read-only. Nothing is parsed at startup: rows, strings and
+filter posting lists are decoded straight from the mapping when first used,
+and every process on the host shares the same page cache.
+
+Build the file with:
+    python catalog_file.py [path]
+and start the planner on it with `python main.py --catalog path`, or by
+setting TRIP_PLANNER_CATALOG=path for any entry point.
+"""
+
+import mmap
+import os
+import struct
+import sys
+from bisect import bisect_left
+from collections.abc import Mapping
+
+from festival_store import FestivalStore, build_festival_store
+from posting_index import PostingIndex
+
+MAGIC = b'TPCAT005'
+CATALOG_FILE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "festival_catalog.bin")
+# Environment variable naming a catalog file to serve instead of the built-in data
+CATALOG_FILE_ENV = "TRIP_PLANNER_CATALOG"
+
+_HEADER = struct.Struct('<8sI')
+_SECTION = struct.Struct('<8sQQ')
+_U32 = struct.Struct('<I')
+
+class _StringTable:
+    """Collects unique strings and hands out ids while writing"""
+    
+    def __init__(self):
+        self.ids = {}
+        self.strings = []
+    
+    def add(self, text):
+        sid = self.ids.get(text)
+        if sid is None:
+            sid = self.ids[text] = len(self.strings)
+            self.strings.append(text)
+        return sid
+    
+    def encode(self):
+        blobs = [text.encode('utf-8') for text in self.strings]
+        offsets = [0]
+        for blob in blobs:
+            offsets.append(offsets[-1] + len(blob))
+        return _u32_array([len(blobs)] + offsets) + b''.join(blobs)
+
+def _u32_array(values):
+    return struct.pack(f'<{len(values)}I', *values)
+
+def _encode_column(column, strings):
+    """Dictionary, codes and per-code posting lists of an EncodedColumn"""
+    keys = [None] * len(column.values)
+    for key, code in column.codes.items():
+        keys[code] = key
+    width = 1 if isinstance(column.data, bytearray) else 4
+    postings = [column.postings.get(code) for code in range(len(column.values))]
+    offsets = [0]
+    for rows in postings:
+        offsets.append(offsets[-1] + len(rows))
+    
+    data = bytes(column.data) if width == 1 else _u32_array(list(column.data))
+    return b''.join([
+        _u32_array([len(column.values), width]),
+        _u32_array([strings.add(value) for value in column.values]),
+        _u32_array([strings.add(key) for key in keys]),
+        data + bytes(-len(data) % 4),
+        _u32_array(offsets)
+    ] + [_u32_array(list(rows)) for rows in postings])
+
+def write_catalog(path, seasonal_festivals, country_specialties, city_country_map, fingerprint=0):
+    """
+    Write the catalog data to a binary file
+    fingerprint identifies the catalog the data came from and is handed to
+    snapshots built on the file, so answer tables built from the same data
+    keep matching.
+    """
+    write_festival_store(path, build_festival_store(seasonal_festivals), country_specialties,
+                         city_country_map, fingerprint)
+
+def write_festival_store(path, store, country_specialties, city_country_map, fingerprint=0):
+    """Write a festival store that is already built (e.g. with ingested feeds) to a catalog file"""
+    strings = _StringTable()
+    rows = len(store)
+    
+    sections = {
+        b'festival': _u32_array([rows])
+                     + _u32_array([strings.add(name) for name in store.names])
+                     + _u32_array([strings.add(text) for text in store.descriptions]),
+        b'col:mon\x00': _encode_column(store.months, strings),
+        b'col:ctry': _encode_column(store.countries, strings),
+        b'col:budg': _encode_column(store.budget_ranges, strings),
+        b'dates\x00\x00\x00': _u32_array(list(store.starts) + list(store.ends)),
+        b'venues\x00\x00': struct.pack(f'<{2 * rows}d', *store.latitudes, *store.longitudes)
+    }
+    
+    # Sorted by key so lookups can binary search the mapping
+    countries = sorted(country_specialties)
+    specialty_ids = []
+    entries = []
+    for country in countries:
+        entries += [strings.add(country), len(specialty_ids), len(country_specialties[country])]
+        specialty_ids += [strings.add(specialty) for specialty in country_specialties[country]]
+    sections[b'special\x00'] = _u32_array([len(countries)] + entries + specialty_ids)
+    
+    cities = sorted(city_country_map)
+    pairs = []
+    for city in cities:
+        pairs += [strings.add(city), strings.add(city_country_map[city])]
+    sections[b'cities\x00\x00'] = _u32_array([len(cities)] + pairs)
+    
+    sections[b'strings\x00'] = strings.encode()
+    sections[b'meta\x00\x00\x00\x00'] = _u32_array([fingerprint])
+    
+    # Header, section table, then 8-byte aligned section bodies
+    offset = _HEADER.size + _SECTION.size * len(sections)
+    table = []
+    body = []
+    for name, data in sections.items():
+        padding = -offset % 8
+        body.append(bytes(padding))
+        offset += padding
+        table.append(_SECTION.pack(name, offset, len(data)))
+        body.append(data)
+        offset += len(data)
+    
+    # Written aside and renamed over the old file, so processes still mapping
+    # it keep reading the old data until they reload
+    partial = f"{path}.{os.getpid()}.tmp"
+    with open(partial, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, len(sections)))
+        f.write(b''.join(table))
+        f.write(b''.join(body))
+    os.replace(partial, path)
+
+class _MappedStrings:
+    def __init__(self, view):
+        count = _U32.unpack_from(view, 0)[0]
+        self.offsets = view[4:8 + 4 * count].cast('I')
+        self.blob = view[8 + 4 * count:]
+    
+    def __getitem__(self, sid):
+        return str(self.blob[self.offsets[sid]:self.offsets[sid + 1]], 'utf-8')
+
+class _MappedStringColumn:
+    """Sequence of strings decoded from string ids on access"""
+    
+    def __init__(self, sids, strings):
+        self.sids = sids
+        self.strings = strings
+    
+    def __getitem__(self, row_id):
+        return self.strings[self.sids[row_id]]
+    
+    def __len__(self):
+        return len(self.sids)
+
+class _MappedPostings(PostingIndex):
+    """Read-only posting lists sliced from the mapping"""
+    
+    def __init__(self, view, count):
+        super().__init__()
+        offsets = view[:4 * (count + 1)].cast('I')
+        rows = view[4 * (count + 1):].cast('I')
+        for code in range(count):
+            self._postings[code] = rows[offsets[code]:offsets[code + 1]]
+    
+    def add(self, key, row_id):
+        raise TypeError("Mapped catalogs are read-only")
+
+class _MappedColumn:
+    """EncodedColumn backed by the mapping"""
+    
+    def __init__(self, view, strings, row_count):
+        count, width = struct.unpack_from('<II', view, 0)
+        position = 8
+        value_sids = view[position:position + 4 * count].cast('I')
+        position += 4 * count
+        key_sids = view[position:position + 4 * count].cast('I')
+        position += 4 * count
+        
+        # The dictionary is small - decode it up front
+        self.values = [strings[sid] for sid in value_sids]
+        self.codes = {strings[sid]: code for code, sid in enumerate(key_sids)}
+        
+        self.data = view[position:position + width * row_count]
+        if width == 4:
+            self.data = self.data.cast('I')
+        position += width * row_count
+        position += -position % 4
+        
+        self.postings = _MappedPostings(view[position:], count)
+    
+    def append(self, value, key=None):
+        raise TypeError("Mapped catalogs are read-only")
+    
+    def value(self, row_id):
+        return self.values[self.data[row_id]]
+    
+    def __len__(self):
+        return len(self.data)
+
+class MappedFestivalStore(FestivalStore):
+    """FestivalStore whose columns and posting lists live in a mapped catalog file"""
+    
+    def __init__(self, festival_view, column_views, dates_view, venues_view, strings, path):
+        super().__init__()
+        self.path = path
+        rows = _U32.unpack_from(festival_view, 0)[0]
+        self.names = _MappedStringColumn(festival_view[4:4 + 4 * rows].cast('I'), strings)
+        self.descriptions = _MappedStringColumn(festival_view[4 + 4 * rows:4 + 8 * rows].cast('I'), strings)
+        self.months = _MappedColumn(column_views[0], strings, rows)
+        self.countries = _MappedColumn(column_views[1], strings, rows)
+        self.budget_ranges = _MappedColumn(column_views[2], strings, rows)
+        self.starts = dates_view[:4 * rows].cast('I')
+        self.ends = dates_view[4 * rows:8 * rows].cast('I')
+        self.latitudes = venues_view[:8 * rows].cast('d')
+        self.longitudes = venues_view[8 * rows:16 * rows].cast('d')
+    
+    def append(self, festival, month):
+        raise TypeError("Mapped catalogs are read-only")
+    
+    def __reduce__(self):
+        # Worker processes map the file themselves and get the trees built so far
+        return (_map_festivals, (self.path,), {'_intervals': self._intervals, '_geo': self._geo})
+
+def _map_festivals(path):
+    return MappedCatalog(path).festivals
+
+class _SortedPairs(Mapping):
+    """Read-only mapping over key-sorted (key, value) entries, found by binary search"""
+    
+    def __init__(self, keys, lookup):
+        self._keys = keys
+        self._lookup = lookup
+    
+    def __getitem__(self, key):
+        index = bisect_left(self._keys, key)
+        if index < len(self._keys) and self._keys[index] == key:
+            return self._lookup(index)
+        raise KeyError(key)
+    
+    def __iter__(self):
+        return iter(self._keys)
+    
+    def __len__(self):
+        return len(self._keys)
+
+class MappedCatalog:
+    """
+    A catalog file mapped read-only into memory
+    The mapping is released once the catalog and every store or lookup taken
+    from it have been garbage collected.
+    """
+    
+    def __init__(self, path=CATALOG_FILE_PATH):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        
+        magic, count = _HEADER.unpack_from(self._view, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a trip planner catalog file")
+        self._sections = {}
+        for i in range(count):
+            name, offset, length = _SECTION.unpack_from(self._view, _HEADER.size + i * _SECTION.size)
+            self._sections[name] = self._view[offset:offset + length]
+        
+        self.strings = _MappedStrings(self._sections[b'strings\x00'])
+        self.festivals = MappedFestivalStore(
+            self._sections[b'festival'],
+            [self._sections[b'col:mon\x00'], self._sections[b'col:ctry'], self._sections[b'col:budg']],
+            self._sections[b'dates\x00\x00\x00'],
+            self._sections[b'venues\x00\x00'],
+            self.strings,
+            path
+        )
+        self.fingerprint = _U32.unpack_from(self._sections[b'meta\x00\x00\x00\x00'], 0)[0]
+        self.country_specialties = self._load_specialties(self._sections[b'special\x00'])
+        self.city_country_map = self._load_cities(self._sections[b'cities\x00\x00'])
+    
+    def _load_specialties(self, view):
+        count = _U32.unpack_from(view, 0)[0]
+        entries = view[4:4 + 12 * count].cast('I')
+        specialty_sids = view[4 + 12 * count:].cast('I')
+        keys = _LazyKeys(entries, 3, count, self.strings)
+        
+        def lookup(index):
+            start, length = entries[3 * index + 1], entries[3 * index + 2]
+            return [self.strings[sid] for sid in specialty_sids[start:start + length]]
+        return _SortedPairs(keys, lookup)
+    
+    def _load_cities(self, view):
+        count = _U32.unpack_from(view, 0)[0]
+        pairs = view[4:4 + 8 * count].cast('I')
+        keys = _LazyKeys(pairs, 2, count, self.strings)
+        return _SortedPairs(keys, lambda index: self.strings[pairs[2 * index + 1]])
+
+class _LazyKeys:
+    """Sorted key column decoded one entry at a time (enough for bisect)"""
+    
+    def __init__(self, entries, stride, count, strings):
+        self._entries = entries
+        self._stride = stride
+        self._count = count
+        self._strings = strings
+    
+    def __getitem__(self, index):
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        return self._strings[self._entries[self._stride * index]]
+    
+    def __len__(self):
+        return self._count
+
+if __name__ == "__main__":
+    from festival_data import SEASONAL_FESTIVALS, COUNTRY_SPECIALTIES, CITY_COUNTRY_MAP, catalog_fingerprint
+    
+    path = sys.argv[1] if len(sys.argv) > 1 else CATALOG_FILE_PATH
+    write_catalog(path, SEASONAL_FESTIVALS, COUNTRY_SPECIALTIES, CITY_COUNTRY_MAP, catalog_fingerprint())
+    print(f"✅ Wrote catalog to {path} ({os.path.getsize(path):,} bytes)")
@@ -0,0 +1,368 @@
+"""
+Catalog Snapshot - Immutable, versioned view of the festival catalog
+A snapshot bundles the festival store, destination index and place indexes
+built from one version of the catalog. Readers grab the current snapshot
+once per request and use only that, so a reload can build the next snapshot
+on the side and swap it in while requests are still running.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import sys
+import tempfile
+from functools import lru_cache
+from heapq import merge
+from itertools import count, islice
+from types import MappingProxyType
+from zlib import crc32
+
+from geo_index import GeoIndex
+from interval_index import travel_window
+from place_index import build_place_fuzzy_index, build_place_trie, typo_tolerance
+from records import Destination
+
+# Directory for the pickled snapshot cache - defaults to the user cache directory
+CACHE_DIR_ENV = "TRIP_PLANNER_CACHE_DIR"
+
+# Source of every module whose objects are pickled into a snapshot
+_HERE = os.path.dirname(os.path.abspath(__file__))
+SNAPSHOT_SOURCES = tuple(os.path.join(_HERE, f"{name}.py") for name in (
+    "catalog_snapshot", "festival_store", "geo_index", "interval_index", "place_index", "posting_index", "records"))
+
+# Versions only ever go up, across every way a snapshot can be made
+_VERSIONS = count(1)
+
+def data_fingerprint(*tables):
+    """Checksum of the catalog tables (festivals, destinations, ...) a catalog was built from"""
+    data = json.dumps(list(tables), sort_keys=True)
+    return crc32(data.encode("utf-8"))
+
+def snapshot_cache_key(*tables):
+    """
+    SHA-256 of the catalog tables plus the source of every module in the pickle
+    Editing the data or any index class gives a new key, so a cache file from
+    older code is never loaded.
+    """
+    digest = hashlib.sha256(json.dumps(list(tables), sort_keys=True).encode("utf-8"))
+    for path in SNAPSHOT_SOURCES:
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+def snapshot_cache_path():
+    """
+    Where the snapshot cache lives: $TRIP_PLANNER_CACHE_DIR, else
+    $XDG_CACHE_HOME/trip-planner or ~/.cache/trip-planner - never the source tree
+    """
+    directory = os.environ.get(CACHE_DIR_ENV)
+    if not directory:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser(os.path.join("~", ".cache"))
+        if base.startswith("~"):
+            # No home directory to expand
+            base = tempfile.gettempdir()
+        directory = os.path.join(base, "trip-planner")
+    return os.path.join(directory, "catalog_snapshot.pickle")
+
+def build_destination_index(destinations):
+    """
+    Build the destination index
+    Packages are filed under every (country, budget_range) key they cover,
+    with None standing for "any". Row ids are kept in catalog order.
+    """
+    rows = [Destination(**destination) for destination in destinations]
+    index = {}
+    for row_id, destination in enumerate(rows):
+        countries = {country.lower() for country in destination.countries}
+        if destination.country_match:
+            countries.add(destination.country_match.lower())
+        budget_range = destination.budget_range
+        for country in list(countries) + [None]:
+            for key in ((country, budget_range), (country, None)):
+                index.setdefault(key, []).append(row_id)
+    return tuple(rows), index
+
+class CatalogSnapshot:
+    """
+    One immutable version of the catalog and everything derived from it
+    Never modify a snapshot's parts - build a new one with evolve() instead,
+    which shares whatever did not change.
+    """
+    
+    def __init__(self, festivals, destinations, destination_index, place_trie, place_fuzzy,
+                 city_geo, city_coordinates, country_specialties, city_country_map, fingerprint=None):
+        self.version = next(_VERSIONS)
+        self.fingerprint = fingerprint
+        self.festivals = festivals
+        self.destinations = destinations
+        self.destination_index = destination_index
+        self.place_trie = place_trie
+        self.place_fuzzy = place_fuzzy
+        self.city_geo = city_geo
+        self.city_coordinates = city_coordinates
+        self.country_specialties = country_specialties
+        self.city_country_map = city_country_map
+        
+        # Typo corrections are only valid for this snapshot's place indexes
+        self.resolve_city = lru_cache(maxsize=4096)(self.resolve_city)
+        # Results are immutable tuples, so every caller can share one copy
+        self.festivals_by_month = lru_cache(maxsize=1024)(self.festivals_by_month)
+        self.festivals_by_country = lru_cache(maxsize=1024)(self.festivals_by_country)
+    
+    def parts(self):
+        """The indexes and tables this snapshot is made of, by constructor argument"""
+        return {
+            'festivals': self.festivals,
+            'destinations': self.destinations,
+            'destination_index': self.destination_index,
+            'place_trie': self.place_trie,
+            'place_fuzzy': self.place_fuzzy,
+            'city_geo': self.city_geo,
+            'city_coordinates': self.city_coordinates,
+            'country_specialties': self.country_specialties,
+            'city_country_map': self.city_country_map,
+            'fingerprint': self.fingerprint
+        }
+    
+    def evolve(self, **changes):
+        """New snapshot (with a new version) sharing every part not in changes"""
+        parts = self.parts()
+        parts.update(changes)
+        return CatalogSnapshot(**parts)
+    
+    def __reduce__(self):
+        # Read-only mappings can't be pickled - send plain dicts and re-wrap them
+        parts = self.parts()
+        parts['city_coordinates'] = dict(parts['city_coordinates'])
+        parts['country_specialties'] = dict(parts['country_specialties'])
+        parts['city_country_map'] = dict(parts['city_country_map'])
+        return (_restore_snapshot, (parts,))
+    
+    def __repr__(self):
+        return f"CatalogSnapshot(version={self.version}, festivals={len(self.festivals)})"
+    
+    # Places
+    
+    def normalize_country_input(self, user_input):
+        """
+        Convert user input to standardized country name
+        Handles cities, alternative names, and common variations
+        """
+        if not user_input:
+            return None
+        
+        user_input = user_input.lower().strip()
+        
+        # Cities, aliases and country names all live in one compiled trie
+        country = self.place_trie.lookup(user_input)
+        if country is not None:
+            return country
+        
+        # If no match found, return the original input capitalized. Near misses
+        # are never corrected here - "Austria" is not a typo of "Australia" - but
+        # offered through suggest_corrections() for the user to confirm.
+        return user_input.title()
+    
+    def suggest_places(self, prefix, limit=10):
+        """Autocomplete: (place name, country) pairs starting with prefix"""
+        return self.place_trie.prefix_search(prefix.lower().strip(), limit)
+    
+    def suggest_corrections(self, text, max_distance=None, limit=5):
+        """Did-you-mean: (place name, country) pairs closest to text, nearest first"""
+        text = text.lower().strip()
+        if max_distance is None:
+            max_distance = typo_tolerance(text)
+        matches = self.place_fuzzy.search(text, max_distance)
+        return [(name, country) for distance, name, country in matches[:limit]]
+    
+    def resolve_city(self, place):
+        """Known city name for user input, tolerating small typos - None if unknown"""
+        name = place.lower().strip()
+        if name in self.city_coordinates:
+            return name
+        cities = [match_name for distance, match_name, country in self.place_fuzzy.search(name, typo_tolerance(name))
+                  if match_name in self.city_coordinates]
+        return cities[0] if cities else None
+    
+    def locate_place(self, place):
+        """(lat, lon) of a known city, tolerating small typos - None if unknown"""
+        city = self.resolve_city(place)
+        return self.city_coordinates[city] if city else None
+    
+    # Festivals
+    
+    def query_festivals(self, month=None, country=None, budget_ranges=None, limit=None, dates=None, near=None):
+        """
+        Festivals matching month, country, budget ranges, dates and area
+        Returned as a tuple of read-only records, safe to share and cache.
+        """
+        return tuple(islice(self.iter_festivals(month, country, budget_ranges, dates, near=near), limit))
+    
+    def festivals_by_month(self, month):
+        """All festivals in a month - the same tuple for every caller"""
+        return self.query_festivals(month=month)
+    
+    def festivals_by_country(self, country):
+        """All festivals in a country - the same tuple for every caller"""
+        return self.query_festivals(country=country)
+    
+    def iter_festivals(self, month=None, country=None, budget_ranges=None, dates=None, window=None, near=None):
+        """
+        Lazily yield festivals matching month, country, budget ranges, dates and area in catalog order
+        window is a day-number range from travel_window(), used in place of dates.
+        """
+        if window is None:
+            window = _date_window(dates)
+        return self.festivals.rows(self.festivals.select(month, country, budget_ranges, window, near))
+    
+    def explain_festival_query(self, month=None, country=None, budget_ranges=None, dates=None, near=None):
+        """Report how many festivals each filter matches, to show its selectivity"""
+        return self.festivals.explain(month, country, budget_ranges, _date_window(dates), near)
+    
+    def festivals_near(self, place, radius_km=300, month=None, dates=None):
+        """
+        Festivals whose venue is within radius_km of a city or (lat, lon) point
+        Returns (distance_km, festival) pairs, nearest first.
+        """
+        return self.festivals_near_many([place], radius_km, month, dates)[0]
+    
+    def festivals_near_many(self, places, radius_km=300, month=None, dates=None):
+        """
+        festivals_near() for many cities or (lat, lon) points in one pass
+        The venue trees are walked once for the whole group. Returns one tuple
+        of (distance_km, festival) pairs per place, in the order given.
+        """
+        locations = [place if isinstance(place, tuple) else self.locate_place(place) for place in places]
+        known = [location for location in locations if location is not None]
+        allowed = self.festivals.matcher(month=month, window=_date_window(dates))
+        found = iter(self.festivals.within_many(known, radius_km))
+        return tuple(
+            tuple((distance, self.festivals.row(row_id)) for distance, row_id in next(found) if allowed(row_id))
+            if location is not None else ()
+            for location in locations
+        )
+    
+    def nearest_event_cities(self, place, k=5, radius_km=50, month=None, dates=None):
+        """
+        The k cities nearest to a place that have a festival within radius_km
+        Returns (distance_km, city, festivals) tuples. Cities are visited nearest
+        first through the k-d tree, k at a time, and each group's festivals
+        are found in one batched venue search.
+        """
+        location = place if isinstance(place, tuple) else self.locate_place(place)
+        if location is None:
+            return ()
+        results = []
+        cities = self.city_geo.iter_nearest(*location)
+        while len(results) < k:
+            group = list(islice(cities, k))
+            if not group:
+                break
+            nearby = self.festivals_near_many([self.city_coordinates[city] for distance, city in group],
+                                              radius_km, month, dates)
+            for (distance, city), festivals in zip(group, nearby):
+                if festivals and len(results) < k:
+                    results.append((distance, city, tuple(festival for festival_distance, festival in festivals)))
+        return tuple(results)
+    
+    # Destinations
+    
+    def has_destinations(self, country):
+        """Check whether any destination package covers a country"""
+        return (country.lower(), None) in self.destination_index
+    
+    def iter_destinations(self, country=None, budget_ranges=None):
+        """Lazily yield destination packages matching a country and budget ranges in catalog order"""
+        country_key = country.lower() if country is not None else None
+        
+        if budget_ranges is None:
+            row_ids = self.destination_index.get((country_key, None), [])
+        else:
+            postings = [self.destination_index.get((country_key, budget_range), [])
+                        for budget_range in set(budget_ranges)]
+            row_ids = merge(*postings)
+        
+        for row_id in row_ids:
+            yield self.destinations[row_id]
+    
+    def query_destinations(self, country=None, budget_ranges=None, limit=None):
+        """
+        Get destination packages matching a country and budget ranges
+        Cost is proportional to the number of packages returned.
+        """
+        return tuple(islice(self.iter_destinations(country, budget_ranges), limit))
+
+def _date_window(dates):
+    """Day-number window for a (depart, return) pair - None when not given or a year or more"""
+    if dates is None:
+        return None
+    return travel_window(*dates)
+
+def _restore_snapshot(parts):
+    """Unpickle a snapshot - it gets a fresh version in this process"""
+    parts['city_coordinates'] = MappingProxyType(parts['city_coordinates'])
+    parts['country_specialties'] = MappingProxyType(parts['country_specialties'])
+    parts['city_country_map'] = MappingProxyType(parts['city_country_map'])
+    return CatalogSnapshot(**parts)
+
+def build_catalog_snapshot(festivals, destination_packages, country_specialties, country_aliases,
+                           city_country_map, city_coordinates, fingerprint=None):
+    """
+    Build every index for a catalog into a new snapshot
+    festivals is an already built FestivalStore. The small lookup tables are
+    copied into read-only mappings so later edits can't leak into the snapshot.
+    """
+    destinations, destination_index = build_destination_index(destination_packages)
+    place_trie = build_place_trie(country_specialties, country_aliases, city_country_map)
+    city_coordinates = MappingProxyType(dict(city_coordinates))
+    return CatalogSnapshot(
+        festivals=festivals,
+        destinations=destinations,
+        destination_index=destination_index,
+        place_trie=place_trie,
+        place_fuzzy=build_place_fuzzy_index(place_trie),
+        city_geo=GeoIndex((lat, lon, city) for city, (lat, lon) in city_coordinates.items()),
+        city_coordinates=city_coordinates,
+        country_specialties=MappingProxyType({country: tuple(specialties)
+                                              for country, specialties in country_specialties.items()}),
+        city_country_map=MappingProxyType(dict(city_country_map)),
+        fingerprint=fingerprint
+    )
+
+def save_snapshot(snapshot, source_key, path=None):
+    """
+    Pickle a snapshot with every index built, for load_snapshot() to reuse
+    source_key is the snapshot_cache_key() of the data it was built from. The
+    file is written next to the target and renamed over it, so readers never
+    see half a file.
+    """
+    path = path or snapshot_cache_path()
+    snapshot.festivals.build_indexes()
+    header = (sys.version_info[:2], source_key)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(temp_path, "wb") as f:
+            pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+    except OSError:
+        # A read-only install just rebuilds on every start
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        return False
+    return True
+
+def load_snapshot(source_key, path=None):
+    """The cached snapshot built from source_key's data - None if missing or stale"""
+    path = path or snapshot_cache_path()
+    header = (sys.version_info[:2], source_key)
+    try:
+        with open(path, "rb") as f:
+            # The header is checked before the (much larger) snapshot is read
+            if pickle.load(f) != header:
+                return None
+            return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, TypeError, ValueError):
+        return None
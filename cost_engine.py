@@ -0,0 +1,62 @@
+"""
+Cost Engine - Trip cost estimation
+Seeded, batched cost estimates for trip recommendations
+"""
+
+import random
+from zlib import crc32
+
+# Base cost per day for each budget range
+BASE_DAILY_COSTS = {
+    'budget-friendly': 80,
+    'moderate': 200,
+    'expensive': 500
+}
+DEFAULT_DAILY_COST = 150
+
+# Estimates vary by up to +/- this percentage for realism
+VARIATION_PERCENT = 20
+_VARIATIONS = range(-VARIATION_PERCENT, VARIATION_PERCENT + 1)
+
+def request_seed(*parts):
+    """Derive a stable seed from the fields that identify a request"""
+    return crc32(repr(parts).encode("utf-8"))
+
+def estimate_costs(budget_ranges, durations, seed=None):
+    """
+    Estimate trip costs for parallel sequences of budget ranges and durations
+    All variations are drawn in one call from a generator seeded with `seed`,
+    so the same seed always gives the same estimates.
+    """
+    budget_ranges = list(budget_ranges)
+    if not budget_ranges:
+        return []
+    
+    rng = random.Random(seed)
+    variations = rng.choices(_VARIATIONS, k=len(budget_ranges))
+    
+    return list(map(_vary_cost, budget_ranges, durations, variations))
+
+def _vary_cost(budget_range, duration_days, variation):
+    base_cost = BASE_DAILY_COSTS.get(budget_range, DEFAULT_DAILY_COST)
+    return int(base_cost * duration_days * (1 + variation / 100))
+
+class CostStream:
+    """
+    Estimate costs one at a time
+    The n-th estimate equals the n-th one from estimate_costs with the same
+    seed. Pass `skip` to resume a stream after that many estimates.
+    """
+    
+    def __init__(self, seed=None, skip=0):
+        self._rng = random.Random(seed)
+        # Fast-forward in bounded chunks to keep memory flat
+        while skip > 0:
+            chunk = min(skip, 4096)
+            self._rng.choices(_VARIATIONS, k=chunk)
+            skip -= chunk
+    
+    def estimate(self, budget_range, duration_days):
+        """Estimate the next cost in the stream"""
+        variation = self._rng.choices(_VARIATIONS)[0]
+        return _vary_cost(budget_range, duration_days, variation)
@@ -1,220 +1,515 @@
-"""
-Festival Data - Seasonal and Country-wise recommendations
-Simple database for the trip planner prototype
-"""
-
-SEASONAL_FESTIVALS = {
-    "spring": {
-        "march": [
-            {"name": "Holi Festival", "country": "India", "description": "Festival of Colors", "budget_range": "budget-friendly"},
-            {"name": "Cherry Blossom Festival", "country": "Japan", "description": "Beautiful pink sakura blooms", "budget_range": "moderate"},
-            {"name": "St. Patrick's Day", "country": "Ireland", "description": "Irish cultural celebration", "budget_range": "moderate"},
-            {"name": "Las Fallas", "country": "Spain", "description": "Fire festival in Valencia", "budget_range": "moderate"}
-        ],
-        "april": [
-            {"name": "Songkran", "country": "Thailand", "description": "Water Festival", "budget_range": "budget-friendly"},
-            {"name": "Tulip Festival", "country": "Netherlands", "description": "Colorful tulip displays", "budget_range": "moderate"},
-            {"name": "Easter Celebrations", "country": "Greece", "description": "Orthodox Easter traditions", "budget_range": "moderate"},
-            {"name": "Queen's Birthday", "country": "UK", "description": "Royal celebrations in London", "budget_range": "expensive"}
-        ],
-        "may": [
-            {"name": "Cinco de Mayo", "country": "Mexico", "description": "Mexican celebration", "budget_range": "budget-friendly"},
-            {"name": "Chelsea Flower Show", "country": "UK", "description": "Premier gardening event in London", "budget_range": "expensive"},
-            {"name": "Cannes Film Festival", "country": "France", "description": "International film festival", "budget_range": "expensive"},
-            {"name": "Eurovision Song Contest", "country": "Europe", "description": "Annual music competition", "budget_range": "expensive"}
-        ]
-    },
-    "summer": {
-        "june": [
-            {"name": "Edinburgh Festival", "country": "Scotland", "description": "Arts and culture festival", "budget_range": "expensive"},
-            {"name": "Midsummer", "country": "Sweden", "description": "Traditional Swedish celebration", "budget_range": "moderate"},
-            {"name": "Wimbledon", "country": "UK", "description": "Tennis championships in London", "budget_range": "expensive"},
-            {"name": "White Nights", "country": "Russia", "description": "Cultural festival in St. Petersburg", "budget_range": "moderate"}
-        ],
-        "july": [
-            {"name": "Gion Matsuri", "country": "Japan", "description": "Traditional Japanese festival", "budget_range": "expensive"},
-            {"name": "Running of Bulls", "country": "Spain", "description": "Pamplona festival", "budget_range": "moderate"},
-            {"name": "Bastille Day", "country": "France", "description": "French national celebration", "budget_range": "moderate"},
-            {"name": "Notting Hill Carnival Preparation", "country": "UK", "description": "Caribbean culture in London", "budget_range": "moderate"}
-        ],
-        "august": [
-            {"name": "Edinburgh Fringe", "country": "Scotland", "description": "World's largest arts festival", "budget_range": "expensive"},
-            {"name": "Notting Hill Carnival", "country": "UK", "description": "Caribbean street festival in London", "budget_range": "moderate"},
-            {"name": "La Tomatina", "country": "Spain", "description": "Tomato throwing festival", "budget_range": "budget-friendly"},
-            {"name": "Burning Man", "country": "USA", "description": "Art and music festival in Nevada", "budget_range": "expensive"}
-        ]
-    },
-    "autumn": {
-        "september": [
-            {"name": "Oktoberfest", "country": "Germany", "description": "Beer festival in Munich", "budget_range": "moderate"},
-            {"name": "Mid-Autumn Festival", "country": "China", "description": "Moon cake festival", "budget_range": "budget-friendly"},
-            {"name": "London Fashion Week", "country": "UK", "description": "Fashion industry showcase", "budget_range": "expensive"},
-            {"name": "Harvest Festival", "country": "Italy", "description": "Wine and food celebrations", "budget_range": "moderate"}
-        ],
-        "october": [
-            {"name": "Diwali", "country": "India", "description": "Festival of Lights", "budget_range": "budget-friendly"},
-            {"name": "Day of the Dead", "country": "Mexico", "description": "Colorful Mexican tradition", "budget_range": "budget-friendly"},
-            {"name": "Halloween", "country": "Ireland", "description": "Traditional Celtic celebration", "budget_range": "budget-friendly"},
-            {"name": "Lord Mayor's Show", "country": "UK", "description": "Historic London parade", "budget_range": "budget-friendly"}
-        ],
-        "november": [
-            {"name": "Loy Krathong", "country": "Thailand", "description": "Floating lantern festival", "budget_range": "budget-friendly"},
-            {"name": "Guy Fawkes Night", "country": "UK", "description": "Bonfire night celebrations", "budget_range": "budget-friendly"},
-            {"name": "Diwali Celebrations", "country": "UK", "description": "Festival of Lights in London", "budget_range": "budget-friendly"}
-        ]
-    },
-    "winter": {
-        "december": [
-            {"name": "Christmas Markets", "country": "Germany", "description": "Traditional German markets", "budget_range": "moderate"},
-            {"name": "New Year's Eve", "country": "Australia", "description": "Sydney Harbor fireworks", "budget_range": "expensive"},
-            {"name": "London Christmas Markets", "country": "UK", "description": "Festive markets across London", "budget_range": "moderate"},
-            {"name": "Winter Solstice", "country": "UK", "description": "Stonehenge celebrations", "budget_range": "budget-friendly"}
-        ],
-        "january": [
-            {"name": "Chinese New Year", "country": "Singapore", "description": "Lunar New Year celebrations", "budget_range": "moderate"},
-            {"name": "London New Year Parade", "country": "UK", "description": "Street parade through central London", "budget_range": "budget-friendly"},
-            {"name": "Burns Night", "country": "Scotland", "description": "Scottish cultural celebration", "budget_range": "moderate"}
-        ],
-        "february": [
-            {"name": "Carnival", "country": "Brazil", "description": "Rio de Janeiro carnival", "budget_range": "expensive"},
-            {"name": "Lantern Festival", "country": "Taiwan", "description": "Sky lantern festival", "budget_range": "moderate"},
-            {"name": "Valentine's Day", "country": "UK", "description": "Romantic celebrations in London", "budget_range": "moderate"},
-            {"name": "Venice Carnival", "country": "Italy", "description": "Masked carnival in Venice", "budget_range": "expensive"}
-        ]
-    }
-}
-
-COUNTRY_SPECIALTIES = {
-    "India": ["cultural festivals", "spiritual experiences", "budget-friendly"],
-    "Japan": ["traditional culture", "seasonal beauty", "unique experiences"],
-    "Germany": ["oktoberfest", "christmas markets", "cultural events"],
-    "Thailand": ["water festivals", "floating lanterns", "tropical experiences"],
-    "Brazil": ["carnival", "vibrant culture", "beach festivals"],
-    "Mexico": ["colorful traditions", "day of dead", "cultural celebrations"],
-    "UK": ["royal events", "historic traditions", "premier cultural events"],
-    "France": ["art festivals", "culinary experiences", "cultural heritage"],
-    "Spain": ["vibrant festivals", "historical celebrations", "passionate culture"],
-    "Italy": ["art and culture", "culinary festivals", "historical events"],
-    "Ireland": ["celtic traditions", "cultural celebrations", "friendly atmosphere"],
-    "Scotland": ["highland culture", "arts festivals", "historic celebrations"],
-    "Netherlands": ["flower festivals", "cultural events", "unique experiences"],
-    "Greece": ["ancient traditions", "religious festivals", "mediterranean culture"],
-    "Sweden": ["nordic traditions", "midsummer celebrations", "natural beauty"],
-    "Russia": ["cultural festivals", "classical arts", "winter celebrations"],
-    "USA": ["diverse festivals", "music and arts", "modern celebrations"],
-    "Australia": ["outdoor celebrations", "new year events", "beach culture"],
-    "Singapore": ["multicultural festivals", "modern celebrations", "asian fusion"],
-    "Taiwan": ["traditional festivals", "lantern celebrations", "cultural heritage"],
-    "China": ["traditional festivals", "cultural heritage", "seasonal celebrations"],
-    "Europe": ["diverse cultures", "international events", "historic celebrations"]
-}
-
-# City to Country Mapping for intelligent matching
-CITY_COUNTRY_MAP = {
-    "london": "UK",
-    "paris": "France", 
-    "madrid": "Spain",
-    "barcelona": "Spain",
-    "rome": "Italy",
-    "venice": "Italy",
-    "florence": "Italy",
-    "dublin": "Ireland",
-    "edinburgh": "Scotland",
-    "glasgow": "Scotland",
-    "amsterdam": "Netherlands",
-    "athens": "Greece",
-    "stockholm": "Sweden",
-    "moscow": "Russia",
-    "st petersburg": "Russia",
-    "new york": "USA",
-    "los angeles": "USA",
-    "las vegas": "USA",
-    "sydney": "Australia",
-    "melbourne": "Australia",
-    "tokyo": "Japan",
-    "osaka": "Japan",
-    "kyoto": "Japan",
-    "mumbai": "India",
-    "delhi": "India",
-    "bangalore": "India",
-    "bangkok": "Thailand",
-    "phuket": "Thailand",
-    "berlin": "Germany",
-    "munich": "Germany",
-    "rio": "Brazil",
-    "sao paulo": "Brazil",
-    "cancun": "Mexico",
-    "mexico city": "Mexico"
-}
-
-def normalize_country_input(user_input):
-    """
-    Convert user input to standardized country name
-    Handles cities, alternative names, and common variations
-    """
-    if not user_input:
-        return None
-    
-    user_input = user_input.lower().strip()
-    
-    # Direct city mapping
-    if user_input in CITY_COUNTRY_MAP:
-        return CITY_COUNTRY_MAP[user_input]
-    
-    # Common country name variations
-    country_variations = {
-        "england": "UK",
-        "britain": "UK", 
-        "great britain": "UK",
-        "united kingdom": "UK",
-        "uk": "UK",
-        "usa": "USA",
-        "united states": "USA",
-        "america": "USA",
-        "us": "USA",
-        "holland": "Netherlands",
-        "russia": "Russia",
-        "russian federation": "Russia"
-    }
-    
-    if user_input in country_variations:
-        return country_variations[user_input]
-    
-    # Check if it matches any existing country (case insensitive)
-    for country in COUNTRY_SPECIALTIES.keys():
-        if user_input == country.lower():
-            return country
-    
-    # If no match found, return the original input capitalized
-    return user_input.title()
-
-def get_festivals_by_season(season):
-    """Get all festivals for a specific season"""
-    return SEASONAL_FESTIVALS.get(season.lower(), {})
-
-def get_festivals_by_month(month):
-    """Get festivals for a specific month"""
-    for season, months in SEASONAL_FESTIVALS.items():
-        if month.lower() in months:
-            return months[month.lower()]
-    return []
-
-def get_festivals_by_country(country):
-    """Get all festivals for a specific country"""
-    festivals = []
-    for season_data in SEASONAL_FESTIVALS.values():
-        for month_data in season_data.values():
-            for festival in month_data:
-                if festival["country"].lower() == country.lower():
-                    festivals.append(festival)
-    return festivals
-
-def get_budget_friendly_festivals():
-    """Get all budget-friendly festivals"""
-    budget_festivals = []
-    for season_data in SEASONAL_FESTIVALS.values():
-        for month_data in season_data.values():
-            for festival in month_data:
-                if festival["budget_range"] == "budget-friendly":
-                    budget_festivals.append(festival)
-    return budget_festivals
+"""
+Festival Data - Seasonal and Country-wise recommendations
+Simple database for the trip planner prototype
+"""
+
+import os
+import threading
+from functools import lru_cache
+from types import MappingProxyType
+
+from catalog_file import CATALOG_FILE_ENV, MappedCatalog
+from catalog_snapshot import (
+    build_catalog_snapshot,
+    data_fingerprint,
+    load_snapshot,
+    save_snapshot,
+    snapshot_cache_key
+)
+from festival_store import build_festival_store
+
+# Festivals are filed under the month they start in; "start"/"end" are yearly
+# "MM-DD" dates and may run into the next month (or year). "lat"/"lon" place
+# the main venue - festivals that move every year have none.
+SEASONAL_FESTIVALS = {
+    "spring": {
+        "march": [
+            {"name": "Holi Festival", "country": "India", "description": "Festival of Colors", "budget_range": "budget-friendly", "start": "03-14", "end": "03-15", "lat": 27.49, "lon": 77.67},
+            {"name": "Cherry Blossom Festival", "country": "Japan", "description": "Beautiful pink sakura blooms", "budget_range": "moderate", "start": "03-20", "end": "04-10", "lat": 35.68, "lon": 139.69},
+            {"name": "St. Patrick's Day", "country": "Ireland", "description": "Irish cultural celebration", "budget_range": "moderate", "start": "03-17", "end": "03-17", "lat": 53.35, "lon": -6.26},
+            {"name": "Las Fallas", "country": "Spain", "description": "Fire festival in Valencia", "budget_range": "moderate", "start": "03-15", "end": "03-19", "lat": 39.47, "lon": -0.38}
+        ],
+        "april": [
+            {"name": "Songkran", "country": "Thailand", "description": "Water Festival", "budget_range": "budget-friendly", "start": "04-13", "end": "04-15", "lat": 13.76, "lon": 100.5},
+            {"name": "Tulip Festival", "country": "Netherlands", "description": "Colorful tulip displays", "budget_range": "moderate", "start": "04-01", "end": "04-30", "lat": 52.27, "lon": 4.55},
+            {"name": "Easter Celebrations", "country": "Greece", "description": "Orthodox Easter traditions", "budget_range": "moderate", "start": "04-10", "end": "04-20", "lat": 37.98, "lon": 23.73},
+            {"name": "Queen's Birthday", "country": "UK", "description": "Royal celebrations in London", "budget_range": "expensive", "start": "04-21", "end": "04-21", "lat": 51.5, "lon": -0.14}
+        ],
+        "may": [
+            {"name": "Cinco de Mayo", "country": "Mexico", "description": "Mexican celebration", "budget_range": "budget-friendly", "start": "05-05", "end": "05-05", "lat": 19.04, "lon": -98.21},
+            {"name": "Chelsea Flower Show", "country": "UK", "description": "Premier gardening event in London", "budget_range": "expensive", "start": "05-20", "end": "05-24", "lat": 51.49, "lon": -0.16},
+            {"name": "Cannes Film Festival", "country": "France", "description": "International film festival", "budget_range": "expensive", "start": "05-13", "end": "05-24", "lat": 43.55, "lon": 7.02},
+            {"name": "Eurovision Song Contest", "country": "Europe", "description": "Annual music competition", "budget_range": "expensive", "start": "05-10", "end": "05-17"}
+        ]
+    },
+    "summer": {
+        "june": [
+            {"name": "Edinburgh Festival", "country": "Scotland", "description": "Arts and culture festival", "budget_range": "expensive", "start": "06-14", "end": "06-25", "lat": 55.95, "lon": -3.19},
+            {"name": "Midsummer", "country": "Sweden", "description": "Traditional Swedish celebration", "budget_range": "moderate", "start": "06-19", "end": "06-21", "lat": 59.33, "lon": 18.07},
+            {"name": "Wimbledon", "country": "UK", "description": "Tennis championships in London", "budget_range": "expensive", "start": "06-30", "end": "07-13", "lat": 51.43, "lon": -0.21},
+            {"name": "White Nights", "country": "Russia", "description": "Cultural festival in St. Petersburg", "budget_range": "moderate", "start": "06-01", "end": "07-10", "lat": 59.94, "lon": 30.31}
+        ],
+        "july": [
+            {"name": "Gion Matsuri", "country": "Japan", "description": "Traditional Japanese festival", "budget_range": "expensive", "start": "07-01", "end": "07-31", "lat": 35.0, "lon": 135.77},
+            {"name": "Running of Bulls", "country": "Spain", "description": "Pamplona festival", "budget_range": "moderate", "start": "07-06", "end": "07-14", "lat": 42.81, "lon": -1.64},
+            {"name": "Bastille Day", "country": "France", "description": "French national celebration", "budget_range": "moderate", "start": "07-14", "end": "07-14", "lat": 48.86, "lon": 2.35},
+            {"name": "Notting Hill Carnival Preparation", "country": "UK", "description": "Caribbean culture in London", "budget_range": "moderate", "start": "07-01", "end": "07-31", "lat": 51.51, "lon": -0.2}
+        ],
+        "august": [
+            {"name": "Edinburgh Fringe", "country": "Scotland", "description": "World's largest arts festival", "budget_range": "expensive", "start": "08-01", "end": "08-25", "lat": 55.95, "lon": -3.19},
+            {"name": "Notting Hill Carnival", "country": "UK", "description": "Caribbean street festival in London", "budget_range": "moderate", "start": "08-24", "end": "08-25", "lat": 51.51, "lon": -0.2},
+            {"name": "La Tomatina", "country": "Spain", "description": "Tomato throwing festival", "budget_range": "budget-friendly", "start": "08-27", "end": "08-27", "lat": 39.42, "lon": -0.79},
+            {"name": "Burning Man", "country": "USA", "description": "Art and music festival in Nevada", "budget_range": "expensive", "start": "08-24", "end": "09-01", "lat": 40.79, "lon": -119.2}
+        ]
+    },
+    "autumn": {
+        "september": [
+            {"name": "Oktoberfest", "country": "Germany", "description": "Beer festival in Munich", "budget_range": "moderate", "start": "09-20", "end": "10-05", "lat": 48.13, "lon": 11.55},
+            {"name": "Mid-Autumn Festival", "country": "China", "description": "Moon cake festival", "budget_range": "budget-friendly", "start": "09-15", "end": "09-17", "lat": 39.9, "lon": 116.41},
+            {"name": "London Fashion Week", "country": "UK", "description": "Fashion industry showcase", "budget_range": "expensive", "start": "09-12", "end": "09-16", "lat": 51.51, "lon": -0.13},
+            {"name": "Harvest Festival", "country": "Italy", "description": "Wine and food celebrations", "budget_range": "moderate", "start": "09-01", "end": "09-30", "lat": 43.77, "lon": 11.26}
+        ],
+        "october": [
+            {"name": "Diwali", "country": "India", "description": "Festival of Lights", "budget_range": "budget-friendly", "start": "10-20", "end": "10-24", "lat": 25.32, "lon": 82.97},
+            {"name": "Day of the Dead", "country": "Mexico", "description": "Colorful Mexican tradition", "budget_range": "budget-friendly", "start": "10-31", "end": "11-02", "lat": 17.07, "lon": -96.73},
+            {"name": "Halloween", "country": "Ireland", "description": "Traditional Celtic celebration", "budget_range": "budget-friendly", "start": "10-31", "end": "10-31", "lat": 53.35, "lon": -6.26},
+            {"name": "Lord Mayor's Show", "country": "UK", "description": "Historic London parade", "budget_range": "budget-friendly", "start": "10-25", "end": "10-25", "lat": 51.51, "lon": -0.09}
+        ],
+        "november": [
+            {"name": "Loy Krathong", "country": "Thailand", "description": "Floating lantern festival", "budget_range": "budget-friendly", "start": "11-05", "end": "11-06", "lat": 18.79, "lon": 98.98},
+            {"name": "Guy Fawkes Night", "country": "UK", "description": "Bonfire night celebrations", "budget_range": "budget-friendly", "start": "11-05", "end": "11-05", "lat": 50.87, "lon": 0.01},
+            {"name": "Diwali Celebrations", "country": "UK", "description": "Festival of Lights in London", "budget_range": "budget-friendly", "start": "11-01", "end": "11-03", "lat": 51.51, "lon": -0.13}
+        ]
+    },
+    "winter": {
+        "december": [
+            {"name": "Christmas Markets", "country": "Germany", "description": "Traditional German markets", "budget_range": "moderate", "start": "11-25", "end": "12-23", "lat": 49.45, "lon": 11.08},
+            {"name": "New Year's Eve", "country": "Australia", "description": "Sydney Harbor fireworks", "budget_range": "expensive", "start": "12-31", "end": "01-01", "lat": -33.86, "lon": 151.21},
+            {"name": "London Christmas Markets", "country": "UK", "description": "Festive markets across London", "budget_range": "moderate", "start": "11-14", "end": "01-04", "lat": 51.51, "lon": -0.16},
+            {"name": "Winter Solstice", "country": "UK", "description": "Stonehenge celebrations", "budget_range": "budget-friendly", "start": "12-21", "end": "12-22", "lat": 51.18, "lon": -1.83}
+        ],
+        "january": [
+            {"name": "Chinese New Year", "country": "Singapore", "description": "Lunar New Year celebrations", "budget_range": "moderate", "start": "01-25", "end": "02-08", "lat": 1.28, "lon": 103.84},
+            {"name": "London New Year Parade", "country": "UK", "description": "Street parade through central London", "budget_range": "budget-friendly", "start": "01-01", "end": "01-01", "lat": 51.51, "lon": -0.13},
+            {"name": "Burns Night", "country": "Scotland", "description": "Scottish cultural celebration", "budget_range": "moderate", "start": "01-25", "end": "01-25", "lat": 55.95, "lon": -3.19}
+        ],
+        "february": [
+            {"name": "Carnival", "country": "Brazil", "description": "Rio de Janeiro carnival", "budget_range": "expensive", "start": "02-13", "end": "02-18", "lat": -22.91, "lon": -43.17},
+            {"name": "Lantern Festival", "country": "Taiwan", "description": "Sky lantern festival", "budget_range": "moderate", "start": "02-12", "end": "02-16", "lat": 25.03, "lon": 121.74},
+            {"name": "Valentine's Day", "country": "UK", "description": "Romantic celebrations in London", "budget_range": "moderate", "start": "02-14", "end": "02-14", "lat": 51.51, "lon": -0.13},
+            {"name": "Venice Carnival", "country": "Italy", "description": "Masked carnival in Venice", "budget_range": "expensive", "start": "02-01", "end": "02-17", "lat": 45.44, "lon": 12.34}
+        ]
+    }
+}
+
+COUNTRY_SPECIALTIES = {
+    "India": ["cultural festivals", "spiritual experiences", "budget-friendly"],
+    "Japan": ["traditional culture", "seasonal beauty", "unique experiences"],
+    "Germany": ["oktoberfest", "christmas markets", "cultural events"],
+    "Thailand": ["water festivals", "floating lanterns", "tropical experiences"],
+    "Brazil": ["carnival", "vibrant culture", "beach festivals"],
+    "Mexico": ["colorful traditions", "day of dead", "cultural celebrations"],
+    "UK": ["royal events", "historic traditions", "premier cultural events"],
+    "France": ["art festivals", "culinary experiences", "cultural heritage"],
+    "Spain": ["vibrant festivals", "historical celebrations", "passionate culture"],
+    "Italy": ["art and culture", "culinary festivals", "historical events"],
+    "Ireland": ["celtic traditions", "cultural celebrations", "friendly atmosphere"],
+    "Scotland": ["highland culture", "arts festivals", "historic celebrations"],
+    "Netherlands": ["flower festivals", "cultural events", "unique experiences"],
+    "Greece": ["ancient traditions", "religious festivals", "mediterranean culture"],
+    "Sweden": ["nordic traditions", "midsummer celebrations", "natural beauty"],
+    "Russia": ["cultural festivals", "classical arts", "winter celebrations"],
+    "USA": ["diverse festivals", "music and arts", "modern celebrations"],
+    "Australia": ["outdoor celebrations", "new year events", "beach culture"],
+    "Singapore": ["multicultural festivals", "modern celebrations", "asian fusion"],
+    "Taiwan": ["traditional festivals", "lantern celebrations", "cultural heritage"],
+    "China": ["traditional festivals", "cultural heritage", "seasonal celebrations"],
+    "Europe": ["diverse cultures", "international events", "historic celebrations"]
+}
+
+# Destination packages offered alongside festivals
+DESTINATION_PACKAGES = [
+    {"title": "London Cultural Experience", "description": "Explore royal palaces, museums, and historic landmarks in London", "countries": ["UK"], "country_match": "UK", "budget_range": "expensive"},
+    {"title": "UK Heritage Trail", "description": "Discover castles, countryside, and British culture", "countries": ["UK"], "country_match": "UK", "budget_range": "moderate"},
+    {"title": "Paris Art & Romance", "description": "Museums, cafes, and iconic landmarks in the City of Light", "countries": ["France"], "country_match": "France", "budget_range": "expensive"},
+    {"title": "Mediterranean Adventure", "description": "Beaches, history, and culture in Southern Europe", "countries": ["Spain", "Italy", "Greece"], "country_match": "Spain", "budget_range": "moderate"},
+    {"title": "Cultural Heritage Tour - Europe", "description": "Explore historical sites and local traditions", "countries": ["Italy", "France", "Spain"], "country_match": None, "budget_range": "moderate"},
+    {"title": "Tropical Paradise - Southeast Asia", "description": "Beautiful beaches and exotic culture", "countries": ["Thailand", "Indonesia", "Philippines"], "country_match": "Thailand", "budget_range": "budget-friendly"},
+    {"title": "Japanese Cultural Discovery", "description": "Traditional temples, modern cities, and cherry blossoms", "countries": ["Japan"], "country_match": "Japan", "budget_range": "expensive"},
+    {"title": "German Cultural Experience", "description": "Historic cities, castles, and beer culture", "countries": ["Germany"], "country_match": "Germany", "budget_range": "moderate"}
+]
+
+# City to Country Mapping for intelligent matching
+CITY_COUNTRY_MAP = {
+    "london": "UK",
+    "paris": "France", 
+    "madrid": "Spain",
+    "barcelona": "Spain",
+    "rome": "Italy",
+    "venice": "Italy",
+    "florence": "Italy",
+    "dublin": "Ireland",
+    "edinburgh": "Scotland",
+    "glasgow": "Scotland",
+    "amsterdam": "Netherlands",
+    "athens": "Greece",
+    "stockholm": "Sweden",
+    "moscow": "Russia",
+    "st petersburg": "Russia",
+    "new york": "USA",
+    "los angeles": "USA",
+    "las vegas": "USA",
+    "sydney": "Australia",
+    "melbourne": "Australia",
+    "tokyo": "Japan",
+    "osaka": "Japan",
+    "kyoto": "Japan",
+    "mumbai": "India",
+    "delhi": "India",
+    "bangalore": "India",
+    "bangkok": "Thailand",
+    "phuket": "Thailand",
+    "berlin": "Germany",
+    "munich": "Germany",
+    "rio": "Brazil",
+    "sao paulo": "Brazil",
+    "cancun": "Mexico",
+    "mexico city": "Mexico"
+}
+
+# City coordinates (lat, lon) for radius and nearest-city searches
+CITY_COORDINATES = {
+    "london": (51.5074, -0.1278),
+    "paris": (48.8566, 2.3522),
+    "madrid": (40.4168, -3.7038),
+    "barcelona": (41.3874, 2.1686),
+    "rome": (41.9028, 12.4964),
+    "venice": (45.4408, 12.3155),
+    "florence": (43.7696, 11.2558),
+    "dublin": (53.3498, -6.2603),
+    "edinburgh": (55.9533, -3.1883),
+    "glasgow": (55.8642, -4.2518),
+    "amsterdam": (52.3676, 4.9041),
+    "athens": (37.9838, 23.7275),
+    "stockholm": (59.3293, 18.0686),
+    "moscow": (55.7558, 37.6173),
+    "st petersburg": (59.9311, 30.3609),
+    "new york": (40.7128, -74.006),
+    "los angeles": (34.0522, -118.2437),
+    "las vegas": (36.1699, -115.1398),
+    "sydney": (-33.8688, 151.2093),
+    "melbourne": (-37.8136, 144.9631),
+    "tokyo": (35.6762, 139.6503),
+    "osaka": (34.6937, 135.5023),
+    "kyoto": (35.0116, 135.7681),
+    "mumbai": (19.076, 72.8777),
+    "delhi": (28.7041, 77.1025),
+    "bangalore": (12.9716, 77.5946),
+    "bangkok": (13.7563, 100.5018),
+    "phuket": (7.8804, 98.3923),
+    "berlin": (52.52, 13.405),
+    "munich": (48.1351, 11.582),
+    "rio": (-22.9068, -43.1729),
+    "sao paulo": (-23.5558, -46.6396),
+    "cancun": (21.1619, -86.8515),
+    "mexico city": (19.4326, -99.1332)
+}
+
+# Common country name variations
+COUNTRY_ALIASES = {
+    "england": "UK",
+    "britain": "UK", 
+    "great britain": "UK",
+    "united kingdom": "UK",
+    "uk": "UK",
+    "usa": "USA",
+    "united states": "USA",
+    "america": "USA",
+    "us": "USA",
+    "holland": "Netherlands",
+    "russia": "Russia",
+    "russian federation": "Russia"
+}
+
+def current_catalog():
+    """
+    The catalog snapshot serving requests right now
+    Take it once per request and query only it, so a reload mid-request
+    can't mix two versions of the catalog.
+    """
+    return _SNAPSHOT
+
+def swap_catalog(snapshot):
+    """Atomically make a snapshot current; requests already running keep their old one"""
+    global _SNAPSHOT
+    previous, _SNAPSHOT = _SNAPSHOT, snapshot
+    return previous
+
+def normalize_country_input(user_input):
+    """
+    Convert user input to standardized country name
+    Handles cities, alternative names, and common variations
+    """
+    return _SNAPSHOT.normalize_country_input(user_input)
+
+def suggest_places(prefix, limit=10):
+    """Autocomplete: (place name, country) pairs starting with prefix"""
+    return _SNAPSHOT.suggest_places(prefix, limit)
+
+def suggest_corrections(text, max_distance=None, limit=5):
+    """Did-you-mean: (place name, country) pairs closest to text, nearest first"""
+    return _SNAPSHOT.suggest_corrections(text, max_distance, limit)
+
+def get_festivals_by_season(season):
+    """Get all festivals for a specific season, as a read-only month -> festivals mapping"""
+    snapshot = _SNAPSHOT
+    return MappingProxyType({month: snapshot.festivals_by_month(month)
+                             for month in SEASONAL_FESTIVALS.get(season.lower(), {})})
+
+def get_festivals_by_month(month):
+    """Get festivals for a specific month"""
+    return _SNAPSHOT.festivals_by_month(month)
+
+def get_festivals_by_country(country):
+    """Get all festivals for a specific country"""
+    return _SNAPSHOT.festivals_by_country(country)
+
+def get_festivals_by_dates(depart, return_date):
+    """Get festivals running at any point between two dates"""
+    return query_festivals(dates=(depart, return_date))
+
+def get_budget_friendly_festivals():
+    """Get all budget-friendly festivals"""
+    return query_festivals(budget_ranges=["budget-friendly"])
+
+def query_festivals(month=None, country=None, budget_ranges=None, limit=None, dates=None, near=None):
+    """
+    Get festivals matching any combination of month, country, budget ranges, dates and area
+    The most selective filter drives the scan over the columnar store.
+    dates is a (depart, return) pair of dates or ISO strings, near a
+    (lat, lon, radius_km) circle. Results are tuples of read-only records.
+    """
+    return _SNAPSHOT.query_festivals(month, country, budget_ranges, limit, dates, near)
+
+def iter_festivals(month=None, country=None, budget_ranges=None, dates=None, window=None, near=None):
+    """
+    Lazily yield festivals matching month, country, budget ranges, dates and area in catalog order
+    window is a day-number range from travel_window(), used in place of dates.
+    """
+    return _SNAPSHOT.iter_festivals(month, country, budget_ranges, dates, window, near)
+
+def explain_festival_query(month=None, country=None, budget_ranges=None, dates=None, near=None):
+    """Report how many festivals each filter matches, to show its selectivity"""
+    return _SNAPSHOT.explain_festival_query(month, country, budget_ranges, dates, near)
+
+def resolve_city(place):
+    """Known city name for user input, tolerating small typos - None if unknown"""
+    return _SNAPSHOT.resolve_city(place)
+
+def locate_place(place):
+    """(lat, lon) of a known city, tolerating small typos - None if unknown"""
+    return _SNAPSHOT.locate_place(place)
+
+def festivals_near(place, radius_km=300, month=None, dates=None):
+    """
+    Festivals whose venue is within radius_km of a city or (lat, lon) point
+    Returns (distance_km, festival) pairs, nearest first.
+    """
+    return _SNAPSHOT.festivals_near(place, radius_km, month, dates)
+
+def festivals_near_many(places, radius_km=300, month=None, dates=None):
+    """
+    festivals_near() for many cities or (lat, lon) points in one batched search
+    Returns one tuple of (distance_km, festival) pairs per place.
+    """
+    return _SNAPSHOT.festivals_near_many(places, radius_km, month, dates)
+
+def nearest_event_cities(place, k=5, radius_km=50, month=None, dates=None):
+    """The k cities nearest to a place that have a festival within radius_km"""
+    return _SNAPSHOT.nearest_event_cities(place, k, radius_km, month, dates)
+
+def available_countries_view():
+    """
+    Countries grouped by budget type and cities grouped by country
+    Worked out once per catalog snapshot rather than on every visit.
+    """
+    return _countries_view(_SNAPSHOT)
+
+@lru_cache(maxsize=1)
+def _countries_view(catalog):
+    countries_by_type = {}
+    for country, specialties in catalog.country_specialties.items():
+        budget_types = [s for s in specialties if s in ['budget-friendly', 'moderate', 'expensive']]
+        if not budget_types:
+            budget_type = 'moderate'  # default
+        else:
+            budget_type = budget_types[0]
+        
+        if budget_type not in countries_by_type:
+            countries_by_type[budget_type] = []
+        countries_by_type[budget_type].append(country)
+    
+    countries_view = []
+    for budget_type in ['budget-friendly', 'moderate', 'expensive']:
+        if budget_type in countries_by_type:
+            countries = [(country, ', '.join(catalog.country_specialties[country][:2]))  # Show first 2 specialties
+                         for country in sorted(countries_by_type[budget_type])]
+            countries_view.append((budget_type, countries))
+    
+    cities_by_country = {}
+    for city, country in catalog.city_country_map.items():
+        if country not in cities_by_country:
+            cities_by_country[country] = []
+        cities_by_country[country].append(city.title())
+    
+    cities_view = [(country, ', '.join(sorted(cities_by_country[country])[:3]))  # Show up to 3 cities
+                   for country in sorted(cities_by_country.keys())]
+    
+    return countries_view, cities_view
+
+def has_destinations(country):
+    """Check whether any destination package covers a country"""
+    return _SNAPSHOT.has_destinations(country)
+
+def query_destinations(country=None, budget_ranges=None, limit=None):
+    """
+    Get destination packages matching a country and budget ranges
+    Cost is proportional to the number of packages returned.
+    """
+    return _SNAPSHOT.query_destinations(country, budget_ranges, limit)
+
+def iter_destinations(country=None, budget_ranges=None):
+    """Lazily yield destination packages matching a country and budget ranges in catalog order"""
+    return _SNAPSHOT.iter_destinations(country, budget_ranges)
+
+def _catalog_tables():
+    return (SEASONAL_FESTIVALS, DESTINATION_PACKAGES, COUNTRY_SPECIALTIES,
+            COUNTRY_ALIASES, CITY_COUNTRY_MAP, CITY_COORDINATES)
+
+def catalog_fingerprint():
+    """Checksum of every catalog table recommendations are computed from"""
+    return data_fingerprint(*_catalog_tables())
+
+def rebuild_catalog_indexes(use_cache=True):
+    """
+    Rebuild the festival, destination and place indexes after editing the catalog
+    The new snapshot is built on the side and swapped in with a new version,
+    so caches built on the old data stop being used. Built indexes are pickled
+    to the user cache directory (see snapshot_cache_path) and reused by the
+    next start while both the data and the index code are unchanged.
+    """
+    global _CATALOG_SOURCE
+    with _RELOAD_LOCK:
+        snapshot, _CATALOG_SOURCE = _table_snapshot(use_cache)
+        swap_catalog(snapshot)
+    return snapshot
+
+def load_catalog_file(path):
+    """
+    Serve the catalog from a memory-mapped catalog file
+    Build the file with `python catalog_file.py`. Festivals, country
+    specialties and cities come from the file - the festival literals above
+    are never built. Destination packages, aliases and city coordinates are
+    not in the file and still come from this module. Returns the MappedCatalog.
+    """
+    global _CATALOG_SOURCE
+    catalog = MappedCatalog(path)
+    with _RELOAD_LOCK:
+        swap_catalog(_file_snapshot(catalog))
+        _CATALOG_SOURCE = f"catalog file {path}"
+    return catalog
+
+def ingest_festival_file(path, file_format=None, chunk_size=10000, progress=None):
+    """
+    Stream a JSONL or CSV festival feed into a copy of the festival store
+    See festival_ingest.py. The copy shares the trees already built, so only
+    the new rows are indexed before it is swapped in once the whole feed is
+    loaded; ingested rows last until rebuild_catalog_indexes().
+    """
+    with _RELOAD_LOCK:
+        snapshot, report = _ingested(_SNAPSHOT, path, file_format, chunk_size, progress)
+        swap_catalog(snapshot)
+    return report
+
+def reload_catalog(feeds=()):
+    """
+    Reload the catalog from where this process first loaded it, then ingest feeds
+    The file named in $TRIP_PLANNER_CATALOG is mapped again, so a file rebuilt
+    with catalog_file.py is picked up; otherwise the tables are rebuilt. The
+    feeds are ingested into the new store before the single swap, so requests
+    see the old catalog or the complete new one. Returns the ingest reports.
+    """
+    global _CATALOG_SOURCE
+    path = os.environ.get(CATALOG_FILE_ENV)
+    with _RELOAD_LOCK:
+        if path:
+            snapshot, source = _file_snapshot(MappedCatalog(path)), f"catalog file {path}"
+        else:
+            snapshot, source = _table_snapshot(use_cache=True)
+        reports = []
+        for feed in feeds:
+            snapshot, report = _ingested(snapshot, feed)
+            reports.append(report)
+        swap_catalog(snapshot)
+        _CATALOG_SOURCE = source
+    return reports
+
+def _table_snapshot(use_cache):
+    """Snapshot of the tables above, from the snapshot cache when allowed, and where it came from"""
+    source_key = snapshot_cache_key(*_catalog_tables())
+    snapshot = load_snapshot(source_key) if use_cache else None
+    if snapshot is not None:
+        return snapshot, "snapshot cache"
+    snapshot = build_catalog_snapshot(
+        build_festival_store(SEASONAL_FESTIVALS),
+        DESTINATION_PACKAGES,
+        COUNTRY_SPECIALTIES,
+        COUNTRY_ALIASES,
+        CITY_COUNTRY_MAP,
+        CITY_COORDINATES,
+        fingerprint=catalog_fingerprint()
+    )
+    if use_cache:
+        save_snapshot(snapshot, source_key)
+    return snapshot, "built from data"
+
+def _file_snapshot(catalog):
+    """Snapshot serving a MappedCatalog"""
+    return build_catalog_snapshot(
+        catalog.festivals,
+        DESTINATION_PACKAGES,
+        catalog.country_specialties,
+        COUNTRY_ALIASES,
+        catalog.city_country_map,
+        CITY_COORDINATES,
+        fingerprint=catalog.fingerprint
+    )
+
+def _ingested(snapshot, path, file_format=None, chunk_size=10000, progress=None):
+    """Copy of snapshot with a festival feed appended to its store, and the ingest report"""
+    from festival_ingest import ingest_festivals
+    
+    store = snapshot.festivals.copy()
+    report = ingest_festivals(path, store, file_format, chunk_size, progress=progress)
+    store.build_indexes()
+    return snapshot.evolve(festivals=store, fingerprint=None), report
+
+def get_catalog_version():
+    """Get the catalog version (changes whenever a new snapshot is swapped in)"""
+    return _SNAPSHOT.version
+
+def get_catalog_source():
+    """Where the current catalog came from - the snapshot cache, a fresh build or a catalog file"""
+    return _CATALOG_SOURCE
+
+# Serializes reloads; readers never wait on it
+_RELOAD_LOCK = threading.Lock()
+
+# Built once at load time, from the catalog file named in $TRIP_PLANNER_CATALOG
+# when there is one and from the tables above otherwise
+_SNAPSHOT = None
+_CATALOG_SOURCE = None
+if os.environ.get(CATALOG_FILE_ENV):
+    load_catalog_file(os.environ[CATALOG_FILE_ENV])
+else:
+    rebuild_catalog_indexes()
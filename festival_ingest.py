@@ -0,0 +1,205 @@
+"""
+Festival Ingest - Streaming bulk loader for partner festival feeds
+Reads JSONL or CSV files in chunks, validates every row against the festival
+schema and appends it straight into a FestivalStore, so a feed with millions
+of rows never has to exist as nested dicts.
+
+Add feeds to the catalog and write the result to a catalog file with:
+    python festival_ingest.py --output catalog.bin feed.jsonl [feed.csv ...]
+then serve it with `--catalog catalog.bin`. Only validate feeds, reporting
+rejected rows by line number, with:
+    python festival_ingest.py --check feed.jsonl [feed.csv ...]
+"""
+
+import argparse
+import csv
+import json
+import sys
+import time
+from functools import lru_cache
+from itertools import islice
+
+from festival_data import normalize_country_input
+from festival_store import FestivalStore
+from interval_index import month_bounds, month_day, parse_month_day, ranges_overlap
+
+FESTIVAL_FIELDS = ("name", "country", "description", "budget_range", "month")
+# Optional "MM-DD" dates - festivals without them span their whole month
+DATE_FIELDS = ("start", "end")
+# Optional venue coordinates in degrees
+VENUE_FIELDS = ("lat", "lon")
+BUDGET_RANGES = ("budget-friendly", "moderate", "expensive")
+MONTHS = ("january", "february", "march", "april", "may", "june", "july",
+          "august", "september", "october", "november", "december")
+
+class IngestReport:
+    def __init__(self, source):
+        self.source = source
+        self.rows = 0
+        self.rejected = 0
+        self.errors = []
+        self.seconds = 0.0
+    
+    @property
+    def rows_per_sec(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+    
+    def __repr__(self):
+        return (f"IngestReport({self.source!r}, rows={self.rows}, rejected={self.rejected}, "
+                f"rows_per_sec={self.rows_per_sec:.0f})")
+
+def read_festival_rows(path, file_format=None):
+    """
+    Lazily yield (line number, raw row) from a JSONL or CSV file (format taken from the extension)
+    CSV rows come out as dicts, numbered by the line they end on. JSONL lines
+    come out undecoded, so that validate_festival_row can reject a malformed
+    line on its own.
+    """
+    file_format = file_format or ("csv" if path.lower().endswith(".csv") else "jsonl")
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if file_format == "csv":
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row
+        elif file_format == "jsonl":
+            for line_number, line in enumerate(f, 1):
+                if line.strip():
+                    yield line_number, line
+        else:
+            raise ValueError(f"Unsupported feed format: {file_format}")
+
+def validate_festival_row(row, normalize_country=normalize_country_input):
+    """
+    Check a raw row against the festival schema and normalize it
+    row is a dict or a JSONL line. Returns a clean dict, or raises ValueError
+    explaining what is wrong.
+    """
+    if isinstance(row, str):
+        try:
+            row = json.loads(row)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"bad JSON: {e}")
+    if not isinstance(row, dict):
+        raise ValueError("row is not an object")
+    
+    missing = [field for field in FESTIVAL_FIELDS if not str(row.get(field) or "").strip()]
+    if missing:
+        raise ValueError(f"missing {', '.join(missing)}")
+    
+    budget_range = row["budget_range"].strip().lower()
+    if budget_range not in BUDGET_RANGES:
+        raise ValueError(f"unknown budget_range {row['budget_range']!r}")
+    
+    month = row["month"].strip().lower()
+    if month not in MONTHS:
+        raise ValueError(f"unknown month {row['month']!r}")
+    
+    festival = {
+        "name": row["name"].strip(),
+        "country": normalize_country(row["country"]),
+        "description": row["description"].strip(),
+        "budget_range": budget_range,
+        "month": month
+    }
+    
+    for field in DATE_FIELDS:
+        value = str(row.get(field) or "").strip()
+        if value:
+            try:
+                parse_month_day(value)
+            except ValueError:
+                raise ValueError(f"bad {field} date {value!r}, expected MM-DD")
+            festival[field] = value
+    
+    # Dates may run into the months around it, but must be on during the month it is filed under.
+    # A lone date is paired with the month's other end, so it has to be inside the month.
+    month_start, month_end = month_bounds(MONTHS.index(month) + 1)
+    start = parse_month_day(festival["start"]) if "start" in festival else month_start
+    end = parse_month_day(festival["end"]) if "end" in festival else month_end
+    if ("start" in festival) != ("end" in festival):
+        field = "start" if "start" in festival else "end"
+        if not month_start <= parse_month_day(festival[field]) <= month_end:
+            raise ValueError(f"{field} date {festival[field]!r} without the other date misses {month}")
+    elif not ranges_overlap(start, end, month_start, month_end):
+        raise ValueError(f"dates {month_day(start)} to {month_day(end)} miss {month}")
+    
+    lat, lon = ("" if row.get(field) is None else str(row[field]).strip() for field in VENUE_FIELDS)
+    if lat or lon:
+        try:
+            lat, lon = float(lat), float(lon)
+        except ValueError:
+            raise ValueError(f"bad venue coordinates {row.get('lat')!r}, {row.get('lon')!r}")
+        if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+            raise ValueError(f"venue coordinates out of range: {lat}, {lon}")
+        festival["lat"], festival["lon"] = lat, lon
+    
+    return festival
+
+def ingest_festivals(path, store, file_format=None, chunk_size=10000, max_errors=100, progress=None):
+    """
+    Stream a feed into a FestivalStore chunk by chunk
+    Invalid rows are skipped and counted; the first `max_errors` reasons are
+    kept on the report. `progress(report)` is called after every chunk.
+    """
+    report = IngestReport(path)
+    # Feeds repeat a handful of countries - normalize each spelling once
+    normalize_country = lru_cache(maxsize=4096)(normalize_country_input)
+    started = time.perf_counter()
+    
+    records = read_festival_rows(path, file_format)
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            break
+        
+        for line_number, row in chunk:
+            try:
+                festival = validate_festival_row(row, normalize_country)
+            except (ValueError, AttributeError) as e:
+                report.rejected += 1
+                if len(report.errors) < max_errors:
+                    report.errors.append(f"line {line_number}: {e}")
+                continue
+            
+            store.append(festival, festival["month"])
+            report.rows += 1
+        
+        report.seconds = time.perf_counter() - started
+        if progress:
+            progress(report)
+    
+    report.seconds = time.perf_counter() - started
+    return report
+
+def print_progress(report):
+    print(f"   📥 {report.rows:,} rows loaded ({report.rows_per_sec:,.0f} rows/sec)")
+
+if __name__ == "__main__":
+    from festival_data import current_catalog, ingest_festival_file
+    from catalog_file import write_festival_store
+    
+    parser = argparse.ArgumentParser(description="Load partner festival feeds")
+    parser.add_argument("feeds", nargs="+", metavar="FEED", help="JSONL or CSV festival feed")
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--output", metavar="FILE", help="write the catalog plus the feeds to a catalog file")
+    mode.add_argument("--check", action="store_true", help="only validate the feeds")
+    args = parser.parse_args()
+    
+    rejected = 0
+    for path in args.feeds:
+        print(f"\n📂 {'Checking' if args.check else 'Ingesting'} {path}")
+        if args.check:
+            report = ingest_festivals(path, FestivalStore(), progress=print_progress)
+        else:
+            report = ingest_festival_file(path, progress=print_progress)
+        rejected += report.rejected
+        print(f"✅ {report.rows:,} rows in {report.seconds:.2f}s ({report.rows_per_sec:,.0f} rows/sec), "
+              f"{report.rejected:,} rejected")
+        for error in report.errors[:10]:
+            print(f"   ❌ {error}")
+    
+    if args.output:
+        catalog = current_catalog()
+        write_festival_store(args.output, catalog.festivals, catalog.country_specialties, catalog.city_country_map)
+        print(f"\n💾 Wrote {len(catalog.festivals):,} festivals to {args.output} - serve it with --catalog {args.output}")
+    sys.exit(1 if args.check and rejected else 0)
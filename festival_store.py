@@ -0,0 +1,324 @@
+"""
+Festival Store - Columnar, dictionary-encoded festival storage
+Festival fields live in parallel columns. Repeating values (month, country,
+budget range) are stored once in a dictionary and referenced by small
+integer codes, and every code has a posting list of its rows so filters
+never scan the whole store.
+Festival dates are kept as day numbers and searched through interval trees,
+venues as coordinates searched through k-d trees. Appended rows get trees of
+their own, so loading more festivals never re-indexes the rows already there.
+"""
+
+from array import array
+from heapq import merge
+from itertools import chain
+from math import isnan, nan
+
+from geo_index import GeoIndex, radius_test
+from interval_index import IntervalIndex, month_bounds, month_day, parse_month_day, ranges_overlap
+from posting_index import PostingIndex, union
+from records import Festival
+
+MONTH_NUMBERS = {name: number for number, name in enumerate(
+    ("january", "february", "march", "april", "may", "june", "july",
+     "august", "september", "october", "november", "december"), 1)}
+
+class EncodedColumn:
+    """
+    Column of small integer codes plus the dictionary of values they stand for
+    Each code also gets a posting list of the rows that hold it.
+    """
+    
+    def __init__(self):
+        self.values = []      # code -> value as first seen
+        self.codes = {}       # lookup key -> code
+        self.data = bytearray()
+        self.postings = PostingIndex()
+    
+    def append(self, value, key=None):
+        """Append a value, encoding it under key (defaults to the value itself)"""
+        key = value if key is None else key
+        code = self.codes.get(key)
+        if code is None:
+            code = len(self.values)
+            self.codes[key] = code
+            self.values.append(value)
+            if code == 256 and isinstance(self.data, bytearray):
+                # More than 256 distinct values - widen to 32-bit codes
+                self.data = array('I', list(self.data))
+        self.postings.add(code, len(self.data))
+        self.data.append(code)
+    
+    def value(self, row_id):
+        return self.values[self.data[row_id]]
+    
+    def __len__(self):
+        return len(self.data)
+
+class FestivalStore:
+    def __init__(self):
+        self.names = []
+        self.descriptions = []
+        self.months = EncodedColumn()
+        self.countries = EncodedColumn()
+        self.budget_ranges = EncodedColumn()
+        self.starts = array('H')
+        self.ends = array('H')
+        self.latitudes = array('d')     # NaN when the festival has no fixed venue
+        self.longitudes = array('d')
+        self._intervals = _TreeLayers()
+        self._geo = _TreeLayers()
+    
+    def append(self, festival, month):
+        """
+        Add a festival dict (or record) for a month
+        Festivals without 'start'/'end' dates ('MM-DD') span the whole month.
+        """
+        start, end = month_bounds(MONTH_NUMBERS[month.lower()])
+        if festival.get("start"):
+            start = parse_month_day(festival["start"])
+        if festival.get("end"):
+            end = parse_month_day(festival["end"])
+        
+        self.names.append(festival["name"])
+        self.descriptions.append(festival["description"])
+        self.months.append(month.lower())
+        self.countries.append(festival["country"], festival["country"].lower())
+        self.budget_ranges.append(festival["budget_range"])
+        self.starts.append(start)
+        self.ends.append(end)
+        has_venue = festival.get("lat") is not None and festival.get("lon") is not None
+        self.latitudes.append(float(festival["lat"]) if has_venue else nan)
+        self.longitudes.append(float(festival["lon"]) if has_venue else nan)
+    
+    def __len__(self):
+        return len(self.names)
+    
+    def row(self, row_id):
+        """Decode one row as a Festival record"""
+        return Festival(
+            name=self.names[row_id],
+            country=self.countries.value(row_id),
+            description=self.descriptions[row_id],
+            budget_range=self.budget_ranges.value(row_id),
+            start=month_day(self.starts[row_id]),
+            end=month_day(self.ends[row_id]),
+            **self.venue(row_id)
+        )
+    
+    def venue(self, row_id):
+        """{'lat': ..., 'lon': ...} for a row, or {} without a fixed venue"""
+        lat = self.latitudes[row_id]
+        if isnan(lat):
+            return {}
+        return {'lat': lat, 'lon': self.longitudes[row_id]}
+    
+    def overlapping(self, start, end):
+        """Row ids of festivals overlapping the day range [start, end], in no order and maybe repeated"""
+        trees = self._intervals.update(len(self), self._build_intervals)
+        return chain.from_iterable(tree.overlapping(start, end) for tree in trees)
+    
+    def within(self, lat, lon, radius_km):
+        """(distance_km, row id) for every festival venue within radius_km, nearest first"""
+        trees = self._geo.update(len(self), self._build_geo)
+        return list(merge(*(tree.within(lat, lon, radius_km) for tree in trees)))
+    
+    def within_many(self, points, radius_km):
+        """within() for many (lat, lon) points, walking each tree once for the whole group"""
+        points = list(points)
+        trees = self._geo.update(len(self), self._build_geo)
+        per_tree = [tree.within_many(points, radius_km) for tree in trees]
+        return [list(merge(*matches)) for matches in zip(*per_tree)] if per_tree else [[] for _ in points]
+    
+    def build_indexes(self):
+        """Build the date and venue trees for every row now, instead of on the first query"""
+        self._intervals.update(len(self), self._build_intervals)
+        self._geo.update(len(self), self._build_geo)
+    
+    def _build_intervals(self, first, end):
+        return IntervalIndex(zip(self.starts[first:end], self.ends[first:end], range(first, end)))
+    
+    def _build_geo(self, first, end):
+        return GeoIndex((self.latitudes[row_id], self.longitudes[row_id], row_id)
+                        for row_id in range(first, end) if not isnan(self.latitudes[row_id]))
+    
+    def select(self, month=None, country=None, budget_ranges=None, window=None, near=None):
+        """
+        Row ids matching every given filter, in catalog order
+        Budget ranges are ORed together, then all predicates are ANDed. A
+        month matches every festival whose dates overlap it, whichever month
+        it is filed under. window is a (start, end) day-number range the
+        festival must overlap, and near a (lat, lon, radius_km) circle its
+        venue must lie in. The filter with the fewest rows drives the scan and
+        the others are tested row by row, so the cost follows the most
+        selective filter, not the store size.
+        """
+        predicates = list(self._predicates(month, country, budget_ranges, window, near).values())
+        if not predicates:
+            return iter(range(len(self)))
+        
+        # Tree matches are only gathered while they are the fewest so far
+        limit = min((predicate.size for predicate in predicates if predicate.size is not None), default=None)
+        for predicate in predicates:
+            predicate.collect(limit)
+            if predicate.size is not None and (limit is None or predicate.size < limit):
+                limit = predicate.size
+        
+        driver = min((predicate for predicate in predicates if predicate.size is not None),
+                     key=lambda predicate: predicate.size)
+        tests = [predicate.test for predicate in predicates if predicate is not driver]
+        return (row_id for row_id in driver.rows() if all(test(row_id) for test in tests))
+    
+    def matcher(self, month=None, country=None, budget_ranges=None, window=None, near=None):
+        """Test for whether one row matches every given filter, for rows found some other way"""
+        tests = [predicate.test for predicate in
+                 self._predicates(month, country, budget_ranges, window, near).values()]
+        return lambda row_id: all(test(row_id) for test in tests)
+    
+    def explain(self, month=None, country=None, budget_ranges=None, window=None, near=None):
+        """Cardinality of each predicate and of the combined filter"""
+        report = {}
+        for name, predicate in self._predicates(month, country, budget_ranges, window, near).items():
+            predicate.collect()
+            report[name] = predicate.size
+        report['matched'] = sum(1 for row_id in self.select(month, country, budget_ranges, window, near))
+        report['rows'] = len(self)
+        return report
+    
+    def _predicates(self, month, country, budget_ranges, window=None, near=None):
+        predicates = {}
+        if month is not None:
+            # Every festival on during the month, whichever month it is filed under
+            month_number = MONTH_NUMBERS.get(month.lower())
+            if month_number is None:
+                predicates['month'] = _column_predicate(self.months, [])
+            else:
+                predicates['month'] = self._window_predicate(month_bounds(month_number))
+        if country is not None:
+            predicates['country'] = _column_predicate(self.countries, [country.lower()])
+        if budget_ranges is not None:
+            predicates['budget_range'] = _column_predicate(self.budget_ranges, budget_ranges)
+        if window is not None:
+            predicates['dates'] = self._window_predicate(window)
+        if near is not None:
+            latitudes, longitudes = self.latitudes, self.longitudes
+            inside = radius_test(*near)
+            predicates['near'] = _Predicate(
+                lambda row_id: inside(latitudes[row_id], longitudes[row_id]),
+                matches=lambda: (row_id for distance, row_id in self.within(*near))
+            )
+        return predicates
+    
+    def _window_predicate(self, window):
+        starts, ends = self.starts, self.ends
+        return _Predicate(
+            lambda row_id: ranges_overlap(starts[row_id], ends[row_id], *window),
+            matches=lambda: self.overlapping(*window)
+        )
+    
+    def copy(self):
+        """
+        Independent store holding the same rows, for copy-on-write reloads
+        Columns are copied whole without decoding any row and the trees
+        already built are shared, so appending to the copy and querying it
+        only indexes the new rows.
+        """
+        store = FestivalStore()
+        store.names = list(self.names)
+        store.descriptions = list(self.descriptions)
+        store.months = _copy_column(self.months)
+        store.countries = _copy_column(self.countries)
+        store.budget_ranges = _copy_column(self.budget_ranges)
+        store.starts = array('H', self.starts)
+        store.ends = array('H', self.ends)
+        store.latitudes = array('d', self.latitudes)
+        store.longitudes = array('d', self.longitudes)
+        store._intervals = self._intervals.copy()
+        store._geo = self._geo.copy()
+        return store
+    
+    def rows(self, row_ids):
+        """Lazily decode row ids into Festival records"""
+        return map(self.row, row_ids)
+
+class _TreeLayers:
+    """
+    Static trees over consecutive row ranges
+    Rows appended since the last query get a tree of their own. A new tree
+    absorbs the layers before it that are no larger, so there are O(log n)
+    layers and each row is indexed O(log n) times over any run of appends.
+    """
+    
+    def __init__(self, layers=()):
+        self.layers = tuple(layers)     # (first row, end row, tree)
+    
+    def update(self, rows, build):
+        """Trees covering the first `rows` rows, building the missing layer with build(first, end)"""
+        layers = self.layers
+        first = layers[-1][1] if layers else 0
+        if first < rows:
+            while layers and layers[-1][1] - layers[-1][0] <= rows - first:
+                first = layers[-1][0]
+                layers = layers[:-1]
+            # Swapped in whole, so concurrent readers see the old or the new layers
+            self.layers = layers = layers + ((first, rows, build(first, rows)),)
+        return [tree for first, end, tree in layers]
+    
+    def copy(self):
+        return _TreeLayers(self.layers)
+
+def _copy_column(column):
+    """Plain EncodedColumn with the same codes and postings as column"""
+    copy = EncodedColumn()
+    copy.values = list(column.values)
+    copy.codes = dict(column.codes)
+    copy.data = array('I', column.data) if len(column.values) > 256 else bytearray(column.data)
+    copy.postings = column.postings.copy()
+    return copy
+
+class _Predicate:
+    """
+    Rows matching one filter: a per-row test, plus their count and ascending
+    ids once known. Date and area filters find their rows through a tree and
+    only gather them on collect().
+    """
+    
+    def __init__(self, test, size=None, rows=None, matches=None):
+        self.test = test
+        self.size = size
+        self._rows = rows           # () -> ascending row ids
+        self._matches = matches     # () -> row ids in any order, maybe repeated
+    
+    def rows(self):
+        return self._rows()
+    
+    def collect(self, limit=None):
+        """Gather the rows from the tree, giving up once there are more than limit"""
+        if self.size is not None:
+            return
+        found = set()
+        for row_id in self._matches():
+            found.add(row_id)
+            if limit is not None and len(found) > limit:
+                return
+        found = sorted(found)
+        self.size = len(found)
+        self._rows = lambda: iter(found)
+
+def _column_predicate(column, keys):
+    """Predicate for an encoded column holding any of the keys"""
+    codes = {column.codes[key] for key in keys if key in column.codes}
+    postings = [column.postings.get(code) for code in codes]
+    data = column.data
+    return _Predicate(lambda row_id: data[row_id] in codes,
+                      size=sum(len(rows) for rows in postings),
+                      rows=lambda: union(postings))
+
+def build_festival_store(seasonal_festivals):
+    """Load the nested season -> month -> festivals data into a store"""
+    store = FestivalStore()
+    for months in seasonal_festivals.values():
+        for month, festivals in months.items():
+            for festival in festivals:
+                store.append(festival, month)
+    return store
@@ -0,0 +1,182 @@
+"""
+Geo Index - Spatial lookups for cities and festivals
+Points are stored as unit vectors on the globe in a static k-d tree, so
+straight-line (chord) distance orders points exactly like great-circle
+distance. Radius and nearest-neighbour queries only visit the branches that
+can hold a match, which keeps them fast on a global gazetteer.
+"""
+
+import heapq
+from array import array
+from math import asin, cos, pi, radians, sin, sqrt
+
+EARTH_RADIUS_KM = 6371.0088
+
+def to_unit_vector(lat, lon):
+    """(x, y, z) on the unit sphere for a latitude/longitude in degrees"""
+    lat, lon = radians(lat), radians(lon)
+    return (cos(lat) * cos(lon), cos(lat) * sin(lon), sin(lat))
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance between two points in km"""
+    lat1, lon1, lat2, lon2 = map(radians, (lat1, lon1, lat2, lon2))
+    a = sin((lat2 - lat1) / 2) ** 2 + cos(lat1) * cos(lat2) * sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * asin(min(1.0, sqrt(a)))
+
+def _chord_squared(distance_km):
+    """Squared chord length on the unit sphere for a surface distance"""
+    angle = min(distance_km / EARTH_RADIUS_KM, pi)
+    return (2 * sin(angle / 2)) ** 2
+
+def _surface_km(chord_squared):
+    """Surface distance for a squared chord length"""
+    return 2 * EARTH_RADIUS_KM * asin(min(1.0, sqrt(chord_squared) / 2))
+
+def radius_test(lat, lon, radius_km):
+    """
+    Test for whether a (lat, lon) point lies within radius_km of a centre
+    Uses the same chord comparison as GeoIndex.within, so both agree exactly.
+    """
+    x, y, z = to_unit_vector(lat, lon)
+    limit = _chord_squared(radius_km)
+    
+    def test(point_lat, point_lon):
+        point_x, point_y, point_z = to_unit_vector(point_lat, point_lon)
+        return (point_x - x) ** 2 + (point_y - y) ** 2 + (point_z - z) ** 2 <= limit
+    return test
+
+class GeoIndex:
+    """
+    Static k-d tree over (lat, lon, value) points
+    The tree is implicit: points are reordered so each range's median is its
+    node, with the split axis cycling x, y, z. Coordinates live in flat arrays.
+    """
+    
+    def __init__(self, points):
+        items = [(to_unit_vector(lat, lon), value) for lat, lon, value in points]
+        
+        # Median split every range on its axis, top down
+        stack = [(0, len(items), 0)]
+        while stack:
+            lo, hi, axis = stack.pop()
+            if hi - lo <= 1:
+                continue
+            items[lo:hi] = sorted(items[lo:hi], key=lambda item: item[0][axis])
+            mid = (lo + hi) // 2
+            next_axis = (axis + 1) % 3
+            stack.append((lo, mid, next_axis))
+            stack.append((mid + 1, hi, next_axis))
+        
+        self.coords = array('d', [c for vector, value in items for c in vector])
+        self.values = [value for vector, value in items]
+    
+    def __len__(self):
+        return len(self.values)
+    
+    def _squared_distance(self, index, query):
+        x, y, z = self.coords[3 * index:3 * index + 3]
+        return (x - query[0]) ** 2 + (y - query[1]) ** 2 + (z - query[2]) ** 2
+    
+    def within(self, lat, lon, radius_km):
+        """(distance_km, value) for every point within radius_km, nearest first"""
+        query = to_unit_vector(lat, lon)
+        limit = _chord_squared(radius_km)
+        coords = self.coords
+        matches = []
+        
+        stack = [(0, len(self.values), 0)]
+        while stack:
+            lo, hi, axis = stack.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            distance = self._squared_distance(mid, query)
+            if distance <= limit:
+                matches.append((distance, mid))
+            
+            next_axis = (axis + 1) % 3
+            offset = query[axis] - coords[3 * mid + axis]
+            near, far = ((mid + 1, hi), (lo, mid)) if offset > 0 else ((lo, mid), (mid + 1, hi))
+            stack.append((*near, next_axis))
+            if offset * offset <= limit:
+                stack.append((*far, next_axis))
+        
+        matches.sort()
+        return [(_surface_km(distance), self.values[index]) for distance, index in matches]
+    
+    def within_many(self, points, radius_km):
+        """
+        within() for many (lat, lon) points at once, one result list per point
+        The tree is walked once for the whole group: each node is visited with
+        the points whose circles can still reach it, so nodes near several
+        points are read once instead of once per point.
+        """
+        queries = [to_unit_vector(lat, lon) for lat, lon in points]
+        limit = _chord_squared(radius_km)
+        coords = self.coords
+        matches = [[] for _ in queries]
+        
+        stack = [(0, len(self.values), 0, range(len(queries)))]
+        while stack:
+            lo, hi, axis, active = stack.pop()
+            if lo >= hi or not active:
+                continue
+            mid = (lo + hi) // 2
+            x, y, z = coords[3 * mid:3 * mid + 3]
+            split = coords[3 * mid + axis]
+            left, right = [], []
+            for query_id in active:
+                query = queries[query_id]
+                distance = (x - query[0]) ** 2 + (y - query[1]) ** 2 + (z - query[2]) ** 2
+                if distance <= limit:
+                    matches[query_id].append((distance, mid))
+                # Same pruning as within(): the far side only when the circle crosses the split
+                offset = query[axis] - split
+                reaches = offset * offset <= limit
+                if offset > 0 or reaches:
+                    right.append(query_id)
+                if offset <= 0 or reaches:
+                    left.append(query_id)
+            
+            next_axis = (axis + 1) % 3
+            stack.append((lo, mid, next_axis, left))
+            stack.append((mid + 1, hi, next_axis, right))
+        
+        values = self.values
+        return [[(_surface_km(distance), values[index]) for distance, index in sorted(found)]
+                for found in matches]
+    
+    def iter_nearest(self, lat, lon):
+        """
+        Lazily yield (distance_km, value) from the nearest point outwards
+        Best-first search: branches are expanded in order of the closest they
+        could possibly be, so taking the first k results costs O(k log n).
+        """
+        query = to_unit_vector(lat, lon)
+        coords = self.coords
+        # (squared distance or lower bound, is_range, lo/index, hi, axis)
+        heap = [(0.0, True, 0, len(self.values), 0)]
+        while heap:
+            bound, is_range, lo, hi, axis = heapq.heappop(heap)
+            if not is_range:
+                yield _surface_km(bound), self.values[lo]
+                continue
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            heapq.heappush(heap, (self._squared_distance(mid, query), False, mid, mid, axis))
+            
+            next_axis = (axis + 1) % 3
+            offset = query[axis] - coords[3 * mid + axis]
+            near, far = ((mid + 1, hi), (lo, mid)) if offset > 0 else ((lo, mid), (mid + 1, hi))
+            heapq.heappush(heap, (bound, True, *near, next_axis))
+            heapq.heappush(heap, (max(bound, offset * offset), True, *far, next_axis))
+    
+    def nearest(self, lat, lon, k=1):
+        """The k nearest (distance_km, value) pairs"""
+        results = []
+        for match in self.iter_nearest(lat, lon):
+            if len(results) == k:
+                break
+            results.append(match)
+        return results
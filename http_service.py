@@ -0,0 +1,304 @@
+"""
+HTTP Service - JSON API over one warm trip planner
+A small asyncio HTTP/1.1 server: connections are kept alive, and pipelined
+requests are answered in order with a single write per batch of requests
+that arrived together.
+
+Endpoints:
+    GET  /recommendations?travel_month=march&budget_category=budget&...
+    POST /recommendations           (JSON preference object as the body)
+    GET  /festivals?month=march     (and/or country=japan)
+    GET  /highlights?month=april
+    GET  /places?name=london        (country, city and location of a place)
+    GET  /countries
+
+Start the service with:
+    python http_service.py [--host 127.0.0.1] [--port 8080] [--catalog FILE] [--feed FEED ...]
+and reload the catalog (and re-ingest the feeds) without a restart with:
+    kill -HUP <pid>
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+from http import HTTPStatus
+from urllib.parse import parse_qsl, urlsplit
+
+from catalog_file import CATALOG_FILE_ENV
+
+# Query parameters that arrive as text but are numbers
+INTEGER_PARAMS = ("duration", "radius_km", "k")
+
+MAX_HEADER_BYTES = 64 * 1024
+MAX_BODY_BYTES = 1024 * 1024
+IDLE_TIMEOUT = 15.0
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+class PlannerService:
+    """Routes requests to the planner and festival queries, returning JSON-ready payloads"""
+    
+    def __init__(self, planner):
+        self.planner = planner
+        self.routes = {
+            "recommendations": self.recommendations,
+            "festivals": self.festivals,
+            "highlights": self.highlights,
+            "places": self.places,
+            "countries": self.countries
+        }
+    
+    def handle(self, method, target, body):
+        """(status, payload) for one HTTP request"""
+        url = urlsplit(target)
+        name = url.path.strip("/")
+        if name not in self.routes:
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"No endpoint at {url.path}")
+        if method not in ("GET", "POST") or (method == "POST" and name != "recommendations"):
+            raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, f"{method} is not supported on {url.path}")
+        
+        params = dict(parse_qsl(url.query))
+        if method == "POST":
+            params.update(_json_body(body))
+        for param in INTEGER_PARAMS:
+            if isinstance(params.get(param), str):
+                try:
+                    params[param] = int(params[param])
+                except ValueError:
+                    raise HTTPError(HTTPStatus.BAD_REQUEST, f"{param} must be a whole number")
+        
+        return HTTPStatus.OK, self.call(name, params)
+    
+    def call(self, name, params):
+        """JSON-ready payload of one endpoint, raising HTTPError for a bad request"""
+        handler = self.routes.get(name)
+        if handler is None:
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"No endpoint named {name!r}")
+        # Only the explicit validation errors of the endpoints and the planner
+        # are the client's fault - anything else is a bug and answers 500
+        try:
+            return handler(params)
+        except (ValueError, KeyError) as e:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, str(e))
+    
+    def recommendations(self, params):
+        k = params.pop("k", 3)
+        if isinstance(k, bool) or not isinstance(k, int) or k < 1:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "k must be a positive whole number")
+        recommendations = self.planner.get_personalized_recommendations(params, k)
+        return {"recommendations": [rec.to_dict() for rec in recommendations]}
+    
+    def festivals(self, params):
+        from festival_data import query_festivals
+        
+        month, country = _text_param(params, "month"), _text_param(params, "country")
+        if not month and not country:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Give a month, a country or both")
+        return {"festivals": [festival.to_dict() for festival in query_festivals(month=month, country=country)]}
+    
+    def highlights(self, params):
+        month = _text_param(params, "month")
+        if not month:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Give a month")
+        highlights = self.planner.get_seasonal_highlights(month)
+        return dict(highlights, festivals=[festival.to_dict() for festival in highlights["festivals"]])
+    
+    def places(self, params):
+        name = _text_param(params, "name")
+        if not name:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Give a place name")
+        return self.planner.lookup_place(name)
+    
+    def countries(self, params):
+        from festival_data import available_countries_view
+        
+        countries_by_type, cities_by_country = available_countries_view()
+        return {
+            "countries": {budget_type: dict(countries) for budget_type, countries in countries_by_type},
+            "cities": dict(cities_by_country)
+        }
+
+def _text_param(params, name):
+    """A text parameter, or None when not given"""
+    value = params.get(name)
+    if value is not None and not isinstance(value, str):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"{name} must be text")
+    return value
+
+def _json_body(body):
+    try:
+        params = json.loads(body or b"{}")
+    except ValueError as e:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"bad JSON: {e}")
+    if not isinstance(params, dict):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "body is not a JSON object")
+    return params
+
+def _response(status, payload, keep_alive):
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    head = (f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode("latin-1") + body
+
+class PlannerProtocol(asyncio.Protocol):
+    """
+    One HTTP/1.1 connection
+    Every complete request in the buffer is answered before writing, so a
+    client pipelining requests gets all its responses back in one write.
+    """
+    
+    def __init__(self, service):
+        self.service = service
+        self.buffer = bytearray()
+        self.transport = None
+        self.idle_timer = None
+    
+    def connection_made(self, transport):
+        self.transport = transport
+        self._reset_idle_timer()
+    
+    def connection_lost(self, exc):
+        if self.idle_timer is not None:
+            self.idle_timer.cancel()
+    
+    def _reset_idle_timer(self):
+        if self.idle_timer is not None:
+            self.idle_timer.cancel()
+        self.idle_timer = asyncio.get_running_loop().call_later(IDLE_TIMEOUT, self.transport.close)
+    
+    def data_received(self, data):
+        self._reset_idle_timer()
+        self.buffer += data
+        responses = []
+        keep_alive = True
+        
+        while keep_alive:
+            request = self._next_request()
+            if request is None:
+                break
+            if isinstance(request, HTTPError):
+                responses.append(_response(request.status, {"error": str(request)}, False))
+                keep_alive = False
+                break
+            
+            method, target, keep_alive, body = request
+            try:
+                status, payload = self.service.handle(method, target, body)
+            except HTTPError as e:
+                status, payload = e.status, {"error": str(e)}
+            except Exception as e:
+                status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)}
+            responses.append(_response(status, payload, keep_alive))
+        
+        if responses:
+            self.transport.write(b"".join(responses))
+        if not keep_alive:
+            self.transport.close()
+    
+    def _next_request(self):
+        """
+        Pop one complete request from the buffer as (method, target, keep_alive, body)
+        None if it hasn't fully arrived yet, an HTTPError if it is malformed.
+        """
+        header_end = self.buffer.find(b"\r\n\r\n")
+        if header_end < 0:
+            if len(self.buffer) > MAX_HEADER_BYTES:
+                return HTTPError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Request headers too large")
+            return None
+        
+        lines = self.buffer[:header_end].decode("latin-1").split("\r\n")
+        try:
+            method, target, version = lines[0].split(" ")
+        except ValueError:
+            return HTTPError(HTTPStatus.BAD_REQUEST, "Malformed request line")
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            return HTTPError(HTTPStatus.BAD_REQUEST, "Bad Content-Length")
+        if length < 0:
+            return HTTPError(HTTPStatus.BAD_REQUEST, "Bad Content-Length")
+        if length > MAX_BODY_BYTES:
+            return HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body too large")
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            return HTTPError(HTTPStatus.LENGTH_REQUIRED, "Chunked bodies are not supported")
+        
+        body_start = header_end + 4
+        if len(self.buffer) < body_start + length:
+            return None
+        body = bytes(self.buffer[body_start:body_start + length])
+        del self.buffer[:body_start + length]
+        
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+        return method, target, keep_alive, body
+
+async def serve(host="127.0.0.1", port=8080, planner=None, feeds=()):
+    """Run the service until cancelled, with the festival feeds ingested on start and on every reload"""
+    if planner is None:
+        from main import TripPlannerApp
+        planner = TripPlannerApp().planner
+    service = PlannerService(planner)
+    
+    loop = asyncio.get_running_loop()
+    load_feeds(feeds)
+    reload_on_sighup(loop, feeds)
+    server = await loop.create_server(lambda: PlannerProtocol(service), host, port)
+    print(f"🌐 Trip planner API on http://{host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+def load_feeds(feeds):
+    """Ingest festival feeds into the current catalog"""
+    from festival_data import ingest_festival_file
+    
+    for feed in feeds:
+        report = ingest_festival_file(feed)
+        print(f"📥 {feed}: {report.rows:,} rows loaded, {report.rejected:,} rejected")
+
+def reload_on_sighup(loop, feeds=()):
+    """
+    Reload the catalog on SIGHUP, see festival_data.reload_catalog
+    The reload runs in a worker thread, so requests keep being answered from
+    the old snapshot until the new one is swapped in. A failed reload leaves
+    the old catalog in place.
+    """
+    import festival_data
+    
+    def reload():
+        try:
+            reports = festival_data.reload_catalog(feeds)
+        except Exception as e:
+            print(f"❌ Catalog reload failed, still serving version {festival_data.get_catalog_version()}: {e}")
+            return
+        rejected = sum(report.rejected for report in reports)
+        print(f"🔄 Catalog reloaded from {festival_data.get_catalog_source()} "
+              f"(version {festival_data.get_catalog_version()}, {rejected:,} feed rows rejected)")
+    
+    loop.add_signal_handler(signal.SIGHUP, lambda: loop.run_in_executor(None, reload))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Trip planner HTTP service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--catalog", metavar="FILE", help="serve the catalog from a file built by catalog_file.py")
+    parser.add_argument("--feed", action="append", default=[], help="festival feed to ingest, re-read on SIGHUP")
+    args = parser.parse_args()
+    if args.catalog:
+        os.environ[CATALOG_FILE_ENV] = args.catalog
+    
+    try:
+        asyncio.run(serve(args.host, args.port, feeds=args.feed))
+    except KeyboardInterrupt:
+        print("\n👋 Service stopped")
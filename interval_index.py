@@ -0,0 +1,143 @@
+"""
+Interval Index - Festival date ranges and overlap queries
+Festivals recur every year, so their dates are kept as day numbers in a
+365-day calendar (0 = Jan 1). A static centered interval tree answers
+"which festivals overlap [depart, return]" in O(log n + k).
+"""
+
+from datetime import date, timedelta
+
+DAYS_IN_YEAR = 365
+LAST_DAY = DAYS_IN_YEAR - 1
+
+# Any non-leap year works as the reference calendar
+_REFERENCE_YEAR = 2001
+
+def day_of_year(month, day):
+    """Day number of a month/day (Feb 29 counts as Feb 28)"""
+    if month == 2 and day == 29:
+        day = 28
+    return date(_REFERENCE_YEAR, month, day).timetuple().tm_yday - 1
+
+def parse_month_day(text):
+    """Day number of an 'MM-DD' string, raising ValueError if it isn't one"""
+    month, day = text.strip().split('-')
+    return day_of_year(int(month), int(day))
+
+def month_day(day):
+    """'MM-DD' string for a day number"""
+    return f"{date(_REFERENCE_YEAR, 1, 1) + timedelta(days=day):%m-%d}"
+
+def format_date_range(start, end):
+    """Readable range such as 'Sep 20 - Oct 5' for two 'MM-DD' dates"""
+    first = date(_REFERENCE_YEAR, 1, 1) + timedelta(days=parse_month_day(start))
+    last = date(_REFERENCE_YEAR, 1, 1) + timedelta(days=parse_month_day(end))
+    if first == last:
+        return f"{first:%b} {first.day}"
+    return f"{first:%b} {first.day} - {last:%b} {last.day}"
+
+def month_bounds(month_number):
+    """(first, last) day numbers of a month"""
+    start = day_of_year(month_number, 1)
+    if month_number == 12:
+        return start, LAST_DAY
+    return start, day_of_year(month_number + 1, 1) - 1
+
+def parse_date(value):
+    """Accept a date or an ISO 'YYYY-MM-DD' string"""
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(value.strip())
+
+def travel_window(depart, return_date):
+    """
+    (start, end) day numbers covered by a trip, or None for a year or more
+    The window wraps (start > end) when the trip crosses New Year.
+    """
+    depart = parse_date(depart)
+    return_date = parse_date(return_date)
+    if return_date < depart:
+        raise ValueError("Return date is before the departure date")
+    if (return_date - depart).days >= LAST_DAY:
+        return None
+    return day_of_year(depart.month, depart.day), day_of_year(return_date.month, return_date.day)
+
+def split_range(start, end):
+    """A day range as one or two non-wrapping pieces"""
+    if start <= end:
+        return [(start, end)]
+    return [(start, LAST_DAY), (0, end)]
+
+def ranges_overlap(start, end, other_start, other_end):
+    """Whether two inclusive day ranges share a day - either may wrap"""
+    return any(piece_start <= other_piece_end and other_piece_start <= piece_end
+               for piece_start, piece_end in split_range(start, end)
+               for other_piece_start, other_piece_end in split_range(other_start, other_end))
+
+class IntervalIndex:
+    """
+    Static centered interval tree over (start, end, value) day ranges
+    Each node keeps the intervals containing its center point sorted by start
+    and by end, so a query only scans intervals that are known to overlap.
+    """
+    
+    def __init__(self, intervals):
+        pieces = [(piece_start, piece_end, value)
+                  for start, end, value in intervals
+                  for piece_start, piece_end in split_range(start, end)]
+        self.size = len(pieces)
+        self.root = self._build(pieces)
+    
+    def _build(self, intervals):
+        if not intervals:
+            return None
+        # The median endpoint belongs to some interval, so every node keeps at least one
+        endpoints = sorted(point for start, end, value in intervals for point in (start, end))
+        center = endpoints[len(endpoints) // 2]
+        
+        left, here, right = [], [], []
+        for interval in intervals:
+            if interval[1] < center:
+                left.append(interval)
+            elif interval[0] > center:
+                right.append(interval)
+            else:
+                here.append(interval)
+        
+        by_start = sorted(here, key=lambda interval: interval[0])
+        by_end = sorted(here, key=lambda interval: interval[1], reverse=True)
+        return (center, by_start, by_end, self._build(left), self._build(right))
+    
+    def overlapping(self, start, end):
+        """
+        Values of intervals overlapping the inclusive day range [start, end]
+        Wrapping ranges are supported; a value may repeat when a wrapped
+        interval overlaps both ends of the year.
+        """
+        for query_start, query_end in split_range(start, end):
+            stack = [self.root]
+            while stack:
+                node = stack.pop()
+                if node is None:
+                    continue
+                center, by_start, by_end, left, right = node
+                if query_end < center:
+                    for interval_start, interval_end, value in by_start:
+                        if interval_start > query_end:
+                            break
+                        yield value
+                    stack.append(left)
+                elif query_start > center:
+                    for interval_start, interval_end, value in by_end:
+                        if interval_end < query_start:
+                            break
+                        yield value
+                    stack.append(right)
+                else:
+                    for interval in by_start:
+                        yield interval[2]
+                    stack.append(left)
+                    stack.append(right)
+    
+    def __len__(self):
+        return self.size
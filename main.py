@@ -1,363 +1,514 @@
-"""
-AI Trip Planner - Main Application
-Personalized Trip Planner Prototype
-
-Features included in this prototype:
-✅ Festival recommendations (seasonal/country-wise)
-✅ Budget-based trip suggestions  
-✅ Seasonal travel highlights
-
-Coming Soon:
-🔄 Real-time price optimization
-🔄 Advanced AI recommendations
-🔄 Seamless booking integration
-🔄 Weather-based suggestions
-🔄 Crowd density analysis
-"""
-
-import sys
-from datetime import datetime
-from trip_planner import TripPlanner, get_ai_insights, real_time_booking
-from festival_data import get_festivals_by_month, get_festivals_by_country
-
-class TripPlannerApp:
-    def __init__(self):
-        self.planner = TripPlanner()
-        self.user_preferences = {}
-        
-    def run(self):
-        """Main application loop"""
-        self.show_welcome()
-        
-        while True:
-            self.show_menu()
-            choice = input("\nEnter your choice (1-7): ").strip()
-            
-            if choice == '1':
-                self.plan_personalized_trip()
-            elif choice == '2':
-                self.explore_festivals()
-            elif choice == '3':
-                self.seasonal_highlights()
-            elif choice == '4':
-                self.show_available_countries()
-            elif choice == '5':
-                self.show_coming_soon_features()
-            elif choice == '6':
-                self.show_about()
-            elif choice == '7':
-                print("\nThank you for using AI Trip Planner! Safe travels! 🌍✈️")
-                break
-            else:
-                print("\n❌ Invalid choice. Please try again.")
-                
-            input("\nPress Enter to continue...")
-    
-    def show_welcome(self):
-        """Display welcome message"""
-        print("=" * 60)
-        print("🌍 WELCOME TO AI TRIP PLANNER PROTOTYPE 🌍")
-        print("=" * 60)
-        print("Personalized travel recommendations with festival insights!")
-        print("This is a working prototype showcasing core features.")
-        print()
-    
-    def show_menu(self):
-        """Display main menu"""
-        print("\n" + "=" * 50)
-        print("🎯 MAIN MENU")
-        print("=" * 50)
-        print("1. 🎪 Plan Personalized Trip (with Festivals)")
-        print("2. 🎭 Explore World Festivals")  
-        print("3. 🌸 Seasonal Travel Highlights")
-        print("4. 🌍 Available Countries & Destinations")
-        print("5. 🚀 Coming Soon Features")
-        print("6. ℹ️  About This Prototype")
-        print("7. 🚪 Exit")
-        print("=" * 50)
-    
-    def plan_personalized_trip(self):
-        """Plan a personalized trip with festival recommendations"""
-        print("\n🎪 PERSONALIZED TRIP PLANNER")
-        print("-" * 40)
-        
-        # Collect user preferences
-        preferences = self.collect_preferences()
-        
-        print("\n🤖 Generating personalized recommendations...")
-        print("(Full AI integration coming soon!)")
-        
-        # Get recommendations
-        recommendations = self.planner.get_personalized_recommendations(preferences)
-        
-        if recommendations:
-            print(f"\n✨ Here are your top {len(recommendations)} recommendations:")
-            print("=" * 60)
-            
-            for i, rec in enumerate(recommendations, 1):
-                print(f"\n{i}. {rec['title']}")
-                print(f"   📍 Type: {rec['type'].title()}")
-                print(f"   📝 Description: {rec['description']}")
-                
-                if rec['type'] == 'notice':
-                    if 'suggestion' in rec:
-                        print(f"   💡 Suggestion: {rec['suggestion']}")
-                else:
-                    if 'country' in rec:
-                        print(f"   🌍 Country: {rec['country']}")
-                    elif 'countries' in rec:
-                        print(f"   🌍 Countries: {', '.join(rec['countries'])}")
-                        
-                    print(f"   💰 Budget Range: {rec['budget_range']}")
-                    if rec['estimated_cost'] > 0:
-                        print(f"   💵 Estimated Cost: ${rec['estimated_cost']}")
-                print("-" * 50)
-        else:
-            print("\n❌ No recommendations found for your preferences.")
-            print("Try adjusting your budget or travel dates.")
-    
-    def collect_preferences(self):
-        """Collect user travel preferences"""
-        preferences = {}
-        
-        print("\n📝 Let's plan your perfect trip!")
-        print("(Answer the questions below - press Enter to skip any)")
-        
-        # Travel month
-        month = input("\n🗓️  What month are you planning to travel? (e.g., March): ").strip()
-        if month:
-            preferences['travel_month'] = month
-        
-        # Budget category
-        print("\n💰 What's your budget category?")
-        print("   1. Budget (Under $1,500)")
-        print("   2. Moderate ($1,500 - $3,500)") 
-        print("   3. Luxury ($3,500+)")
-        
-        budget_choice = input("Choose (1-3): ").strip()
-        budget_map = {'1': 'budget', '2': 'moderate', '3': 'luxury'}
-        if budget_choice in budget_map:
-            preferences['budget_category'] = budget_map[budget_choice]
-        
-        # Duration
-        duration = input("\n📅 How many days will you travel? (default: 7): ").strip()
-        if duration and duration.isdigit():
-            preferences['duration'] = int(duration)
-        else:
-            preferences['duration'] = 7
-        
-        # Preferred country (optional)
-        print("\n🌍 Any preferred country or city? (optional)")
-        print("   Examples: London, Paris, UK, Germany, Japan, Thailand, etc.")
-        print("   Type 'list' to see available countries")
-        country = input("Enter preference: ").strip()
-        
-        if country.lower() == 'list':
-            self.show_available_countries()
-            country = input("\nNow enter your preferred country/city: ").strip()
-        
-        if country:
-            preferences['preferred_country'] = country
-        
-        return preferences
-    
-    def explore_festivals(self):
-        """Explore festivals by country or month"""
-        print("\n🎭 WORLD FESTIVALS EXPLORER")
-        print("-" * 40)
-        
-        print("Explore festivals by:")
-        print("1. 🗓️  Month")
-        print("2. 🌍 Country")
-        
-        choice = input("\nChoose (1-2): ").strip()
-        
-        if choice == '1':
-            self.explore_festivals_by_month()
-        elif choice == '2':
-            self.explore_festivals_by_country()
-        else:
-            print("❌ Invalid choice.")
-    
-    def explore_festivals_by_month(self):
-        """Show festivals for a specific month"""
-        month = input("\n🗓️  Enter month (e.g., March): ").strip()
-        
-        festivals = get_festivals_by_month(month)
-        
-        if festivals:
-            print(f"\n🎪 Festivals in {month.title()}:")
-            print("=" * 50)
-            
-            for festival in festivals:
-                print(f"\n🎭 {festival['name']}")
-                print(f"   🌍 Country: {festival['country']}")
-                print(f"   📝 Description: {festival['description']}")
-                print(f"   💰 Budget: {festival['budget_range']}")
-                print("-" * 30)
-        else:
-            print(f"\n❌ No festivals found for {month}.")
-            print("Try: March, April, May, June, July, August, September, October, November, December, January, February")
-    
-    def explore_festivals_by_country(self):
-        """Show festivals for a specific country"""
-        country = input("\n🌍 Enter country (e.g., Japan): ").strip()
-        
-        festivals = get_festivals_by_country(country)
-        
-        if festivals:
-            print(f"\n🎪 Festivals in {country.title()}:")
-            print("=" * 50)
-            
-            for festival in festivals:
-                print(f"\n🎭 {festival['name']}")
-                print(f"   📝 Description: {festival['description']}")
-                print(f"   💰 Budget: {festival['budget_range']}")
-                print("-" * 30)
-        else:
-            print(f"\n❌ No festivals found for {country}.")
-            print("Try: India, Japan, Germany, Thailand, Brazil, Mexico, Scotland, etc.")
-    
-    def seasonal_highlights(self):
-        """Show seasonal travel highlights"""
-        print("\n🌸 SEASONAL TRAVEL HIGHLIGHTS")
-        print("-" * 40)
-        
-        month = input("🗓️  Enter month for highlights (e.g., April): ").strip()
-        
-        if not month:
-            month = datetime.now().strftime("%B")
-            print(f"Using current month: {month}")
-        
-        highlights = self.planner.get_seasonal_highlights(month)
-        
-        print(f"\n✨ {month.title()} Travel Highlights:")
-        print("=" * 50)
-        
-        # Show festivals
-        if highlights['festivals']:
-            print("\n🎪 Featured Festivals:")
-            for festival in highlights['festivals'][:3]:  # Show top 3
-                print(f"   🎭 {festival['name']} in {festival['country']}")
-                print(f"      {festival['description']}")
-        else:
-            print("\n🎪 No major festivals this month in our database.")
-        
-        # Weather tips
-        print(f"\n🌤️  Weather Tips:")
-        print(f"   {highlights['weather_tips']}")
-        
-        # Travel tips  
-        print(f"\n💡 Travel Tips:")
-        print(f"   {highlights['travel_tips']}")
-    
-    def show_available_countries(self):
-        """Show all available countries and cities for trip planning"""
-        print("\n🌍 AVAILABLE COUNTRIES & DESTINATIONS")
-        print("=" * 60)
-        
-        from festival_data import COUNTRY_SPECIALTIES, CITY_COUNTRY_MAP
-        
-        print("\n🎪 Countries with Festival Data:")
-        print("-" * 40)
-        countries_by_type = {}
-        for country, specialties in COUNTRY_SPECIALTIES.items():
-            budget_types = [s for s in specialties if s in ['budget-friendly', 'moderate', 'expensive']]
-            if not budget_types:
-                budget_type = 'moderate'  # default
-            else:
-                budget_type = budget_types[0]
-            
-            if budget_type not in countries_by_type:
-                countries_by_type[budget_type] = []
-            countries_by_type[budget_type].append(country)
-        
-        for budget_type in ['budget-friendly', 'moderate', 'expensive']:
-            if budget_type in countries_by_type:
-                print(f"\n💰 {budget_type.replace('-', ' ').title()} Options:")
-                for country in sorted(countries_by_type[budget_type]):
-                    specialties = ', '.join(COUNTRY_SPECIALTIES[country][:2])  # Show first 2 specialties
-                    print(f"   🌍 {country}: {specialties}")
-        
-        print(f"\n🏙️ Major Cities (automatically mapped to countries):")
-        print("-" * 40)
-        cities_by_country = {}
-        for city, country in CITY_COUNTRY_MAP.items():
-            if country not in cities_by_country:
-                cities_by_country[country] = []
-            cities_by_country[country].append(city.title())
-        
-        for country in sorted(cities_by_country.keys()):
-            cities = ', '.join(sorted(cities_by_country[country])[:3])  # Show up to 3 cities
-            print(f"   🏙️ {country}: {cities}")
-        
-        print(f"\n💡 Usage Tips:")
-        print("   • You can enter either country names or city names")
-        print("   • Examples: 'London' will be mapped to 'UK'")
-        print("   • 'Paris' will be mapped to 'France'")
-        print("   • Use exact country names for best results")
-        print("   • Mix and match with any travel month for personalized results")
-    
-    def show_coming_soon_features(self):
-        """Display upcoming features"""
-        print("\n🚀 COMING SOON FEATURES")
-        print("=" * 50)
-        
-        # AI Insights
-        ai_insights = get_ai_insights({})
-        print(f"\n{ai_insights['message']}")
-        print("\nPlanned AI Features:")
-        for feature in ai_insights['planned_features']:
-            print(f"   🔄 {feature}")
-        
-        # Booking Integration
-        booking_info = real_time_booking({}, {})
-        print(f"\n{booking_info['message']}")
-        print("\nPlanned Booking Features:")
-        for feature in booking_info['planned_features']:
-            print(f"   🔄 {feature}")
-        
-        print(f"\n📊 Additional Features Coming Soon:")
-        print("   🔄 Machine Learning trip optimization")
-        print("   🔄 Social media integration") 
-        print("   🔄 Local insider recommendations")
-        print("   🔄 Multi-city route optimization")
-        print("   🔄 Travel buddy matching")
-        print("   🔄 Real-time currency conversion")
-        print("   🔄 Visa requirement checking")
-        print("   🔄 Travel insurance suggestions")
-    
-    def show_about(self):
-        """Show information about the prototype"""
-        print("\n ℹ️  ABOUT AI TRIP PLANNER PROTOTYPE")
-        print("=" * 50)
-        print("🎯 Purpose: Demonstrate core AI trip planning features")
-        print("🔧 Version: Prototype v1.0")
-        print("📅 Created: 2025")
-        print()
-        print("✅ Current Features:")
-        print("   • Festival recommendations (seasonal & country-wise)")
-        print("   • Budget-based trip suggestions") 
-        print("   • Seasonal travel highlights")
-        print("   • Interactive console interface")
-        print()
-        print("🚀 This prototype showcases the foundation for a full")
-        print("   AI-powered trip planning application with real-time")
-        print("   booking capabilities and advanced personalization.")
-        print()
-        print("💡 Future versions will include machine learning,")
-        print("   real-time APIs, and seamless booking integration.")
-
-def main():
-    """Main entry point"""
-    try:
-        app = TripPlannerApp()
-        app.run()
-    except KeyboardInterrupt:
-        print("\n\n👋 Goodbye! Thanks for trying AI Trip Planner!")
-    except Exception as e:
-        print(f"\n❌ An error occurred: {e}")
-        print("Please restart the application.")
-
-if __name__ == "__main__":
-    main()
+"""
+AI Trip Planner - Main Application
+Personalized Trip Planner Prototype
+
+Features included in this prototype:
+✅ Festival recommendations (seasonal/country-wise)
+✅ Budget-based trip suggestions  
+✅ Seasonal travel highlights
+
+Coming Soon:
+🔄 Real-time price optimization
+🔄 Advanced AI recommendations
+🔄 Seamless booking integration
+🔄 Weather-based suggestions
+🔄 Crowd density analysis
+"""
+
+import argparse
+import importlib
+import os
+import sys
+import time
+from datetime import datetime
+from functools import cached_property
+from catalog_file import CATALOG_FILE_ENV
+from interval_index import format_date_range, parse_date
+
+# The planner and catalog modules are imported on first use, so the menu
+# shows up before any catalog data is loaded
+
+class TripPlannerApp:
+    def __init__(self):
+        self.user_preferences = {}
+    
+    @cached_property
+    def planner(self):
+        """Trip planner, created the first time a screen needs it"""
+        from trip_planner import TripPlanner
+        from answer_table import load_answer_table
+        
+        # Use precomputed answers when `python answer_table.py` has been run
+        return TripPlanner(answer_table=load_answer_table())
+    
+    def run(self):
+        """Main application loop"""
+        self.show_welcome()
+        
+        while True:
+            self.show_menu()
+            choice = input("\nEnter your choice (1-7): ").strip()
+            
+            if choice == '1':
+                self.plan_personalized_trip()
+            elif choice == '2':
+                self.explore_festivals()
+            elif choice == '3':
+                self.seasonal_highlights()
+            elif choice == '4':
+                self.show_available_countries()
+            elif choice == '5':
+                self.show_coming_soon_features()
+            elif choice == '6':
+                self.show_about()
+            elif choice == '7':
+                print("\nThank you for using AI Trip Planner! Safe travels! 🌍✈️")
+                break
+            else:
+                print("\n❌ Invalid choice. Please try again.")
+            
+            input("\nPress Enter to continue...")
+    
+    def show_welcome(self):
+        """Display welcome message"""
+        print("=" * 60)
+        print("🌍 WELCOME TO AI TRIP PLANNER PROTOTYPE 🌍")
+        print("=" * 60)
+        print("Personalized travel recommendations with festival insights!")
+        print("This is a working prototype showcasing core features.")
+        print()
+    
+    def show_menu(self):
+        """Display main menu"""
+        print("\n" + "=" * 50)
+        print("🎯 MAIN MENU")
+        print("=" * 50)
+        print("1. 🎪 Plan Personalized Trip (with Festivals)")
+        print("2. 🎭 Explore World Festivals")  
+        print("3. 🌸 Seasonal Travel Highlights")
+        print("4. 🌍 Available Countries & Destinations")
+        print("5. 🚀 Coming Soon Features")
+        print("6. ℹ️  About This Prototype")
+        print("7. 🚪 Exit")
+        print("=" * 50)
+    
+    def plan_personalized_trip(self):
+        """Plan a personalized trip with festival recommendations"""
+        print("\n🎪 PERSONALIZED TRIP PLANNER")
+        print("-" * 40)
+        
+        # Collect user preferences
+        preferences = self.collect_preferences()
+        
+        print("\n🤖 Generating personalized recommendations...")
+        print("(Full AI integration coming soon!)")
+        self.show_search(preferences)
+        
+        # Get recommendations
+        recommendations = self.planner.get_personalized_recommendations(preferences)
+        
+        if recommendations:
+            print(f"\n✨ Here are your top {len(recommendations)} recommendations:")
+            print("=" * 60)
+            
+            for i, rec in enumerate(recommendations, 1):
+                print(f"\n{i}. {rec['title']}")
+                print(f"   📍 Type: {rec['type'].title()}")
+                print(f"   📝 Description: {rec['description']}")
+                
+                if rec['type'] == 'notice':
+                    if 'suggestion' in rec:
+                        print(f"   💡 Suggestion: {rec['suggestion']}")
+                else:
+                    if 'country' in rec:
+                        print(f"   🌍 Country: {rec['country']}")
+                    elif 'countries' in rec:
+                        print(f"   🌍 Countries: {', '.join(rec['countries'])}")
+                    if 'dates' in rec:
+                        print(f"   📆 Dates: {rec['dates']}")
+                    if 'distance_km' in rec:
+                        print(f"   📏 Distance: {rec['distance_km']} km away")
+                    
+                    print(f"   💰 Budget Range: {rec['budget_range']}")
+                    if rec['estimated_cost'] > 0:
+                        print(f"   💵 Estimated Cost: ${rec['estimated_cost']}")
+                print("-" * 50)
+        else:
+            print("\n❌ No recommendations found for your preferences.")
+            print("Try adjusting your budget or travel dates.")
+    
+    def show_search(self, preferences):
+        """Tell the user which country and area the planner is searching"""
+        if preferences.get('preferred_country'):
+            place = self.planner.lookup_place(preferences['preferred_country'])
+            print(f"🌍 Searching for festivals in {place['country']}...")
+            if preferences.get('near') and place['city']:
+                print(f"📍 Searching within {preferences['radius_km']:g} km of {place['city'].title()}...")
+    
+    def collect_preferences(self):
+        """Collect user travel preferences"""
+        preferences = {}
+        
+        print("\n📝 Let's plan your perfect trip!")
+        print("(Answer the questions below - press Enter to skip any)")
+        
+        # Travel month
+        month = input("\n🗓️  What month are you planning to travel? (e.g., March): ").strip()
+        if month:
+            preferences['travel_month'] = month
+        
+        # Exact travel dates (optional)
+        dates = input("📆 Exact travel dates? (e.g., 2025-09-20 to 2025-09-28, optional): ").strip()
+        if dates:
+            depart, _, return_date = dates.partition(" to ")
+            try:
+                depart_date = parse_date(depart)
+                return_date = parse_date(return_date) if return_date.strip() else None
+                if return_date and return_date < depart_date:
+                    raise ValueError("return before departure")
+            except ValueError:
+                print("❌ Couldn't read those dates - use YYYY-MM-DD to YYYY-MM-DD")
+            else:
+                preferences['depart_date'] = depart_date
+                if return_date:
+                    preferences['return_date'] = return_date
+        
+        # Budget category
+        print("\n💰 What's your budget category?")
+        print("   1. Budget (Under $1,500)")
+        print("   2. Moderate ($1,500 - $3,500)") 
+        print("   3. Luxury ($3,500+)")
+        
+        budget_choice = input("Choose (1-3): ").strip()
+        budget_map = {'1': 'budget', '2': 'moderate', '3': 'luxury'}
+        if budget_choice in budget_map:
+            preferences['budget_category'] = budget_map[budget_choice]
+        
+        # Duration
+        default_duration = 7
+        if preferences.get('return_date'):
+            default_duration = (preferences['return_date'] - preferences['depart_date']).days + 1
+        duration = input(f"\n📅 How many days will you travel? (default: {default_duration}): ").strip()
+        if duration.isdigit() and int(duration) > 0:
+            preferences['duration'] = int(duration)
+        else:
+            preferences['duration'] = default_duration
+        
+        # Preferred country (optional)
+        print("\n🌍 Any preferred country or city? (optional)")
+        print("   Examples: London, Paris, UK, Germany, Japan, Thailand, etc.")
+        print("   Type 'list' to see available countries")
+        country = input("Enter preference: ").strip()
+        
+        if country.lower() == 'list':
+            self.show_available_countries()
+            country = input("\nNow enter your preferred country/city: ").strip()
+        
+        place = self.planner.lookup_place(country) if country else None
+        if place and place['suggestions']:
+            # Near misses are only corrected when the user agrees
+            name, suggested_country = place['suggestions'][0]
+            label = name.title() if name == suggested_country.lower() else f"{name.title()} ({suggested_country})"
+            if input(f"🤔 Did you mean {label}? (y/n): ").strip().lower() in ('y', 'yes'):
+                country = name
+                place = self.planner.lookup_place(country)
+        
+        if country:
+            preferences['preferred_country'] = country
+        
+        # Search radius around a city (optional) - only for a city named exactly
+        if place and place['city'] == country.lower().strip():
+            radius = input(f"📏 Include festivals within how many km of {country.title()}? (optional, e.g., 300): ").strip()
+            if radius.isdigit() and int(radius) > 0:
+                preferences['near'] = country
+                preferences['radius_km'] = int(radius)
+        
+        return preferences
+    
+    def explore_festivals(self):
+        """Explore festivals by country or month"""
+        print("\n🎭 WORLD FESTIVALS EXPLORER")
+        print("-" * 40)
+        
+        print("Explore festivals by:")
+        print("1. 🗓️  Month")
+        print("2. 🌍 Country")
+        
+        choice = input("\nChoose (1-2): ").strip()
+        
+        if choice == '1':
+            self.explore_festivals_by_month()
+        elif choice == '2':
+            self.explore_festivals_by_country()
+        else:
+            print("❌ Invalid choice.")
+    
+    def explore_festivals_by_month(self):
+        """Show festivals for a specific month"""
+        month = input("\n🗓️  Enter month (e.g., March): ").strip()
+        
+        from festival_data import get_festivals_by_month
+        
+        festivals = get_festivals_by_month(month)
+        
+        if festivals:
+            print(f"\n🎪 Festivals in {month.title()}:")
+            print("=" * 50)
+            
+            for festival in festivals:
+                print(f"\n🎭 {festival['name']}")
+                print(f"   🌍 Country: {festival['country']}")
+                print(f"   📆 Dates: {format_date_range(festival['start'], festival['end'])}")
+                print(f"   📝 Description: {festival['description']}")
+                print(f"   💰 Budget: {festival['budget_range']}")
+                print("-" * 30)
+        else:
+            print(f"\n❌ No festivals found for {month}.")
+            print("Try: March, April, May, June, July, August, September, October, November, December, January, February")
+    
+    def explore_festivals_by_country(self):
+        """Show festivals for a specific country"""
+        country = input("\n🌍 Enter country (e.g., Japan): ").strip()
+        
+        from festival_data import get_festivals_by_country
+        
+        festivals = get_festivals_by_country(country)
+        
+        if festivals:
+            print(f"\n🎪 Festivals in {country.title()}:")
+            print("=" * 50)
+            
+            for festival in festivals:
+                print(f"\n🎭 {festival['name']}")
+                print(f"   📆 Dates: {format_date_range(festival['start'], festival['end'])}")
+                print(f"   📝 Description: {festival['description']}")
+                print(f"   💰 Budget: {festival['budget_range']}")
+                print("-" * 30)
+        else:
+            print(f"\n❌ No festivals found for {country}.")
+            print("Try: India, Japan, Germany, Thailand, Brazil, Mexico, Scotland, etc.")
+    
+    def seasonal_highlights(self):
+        """Show seasonal travel highlights"""
+        print("\n🌸 SEASONAL TRAVEL HIGHLIGHTS")
+        print("-" * 40)
+        
+        month = input("🗓️  Enter month for highlights (e.g., April): ").strip()
+        
+        if not month:
+            month = datetime.now().strftime("%B")
+            print(f"Using current month: {month}")
+        
+        highlights = self.planner.get_seasonal_highlights(month)
+        
+        print(f"\n✨ {month.title()} Travel Highlights:")
+        print("=" * 50)
+        
+        # Show festivals
+        if highlights['festivals']:
+            print("\n🎪 Featured Festivals:")
+            for festival in highlights['festivals'][:3]:  # Show top 3
+                print(f"   🎭 {festival['name']} in {festival['country']}")
+                print(f"      {festival['description']}")
+        else:
+            print("\n🎪 No major festivals this month in our database.")
+        
+        # Weather tips
+        print(f"\n🌤️  Weather Tips:")
+        print(f"   {highlights['weather_tips']}")
+        
+        # Travel tips  
+        print(f"\n💡 Travel Tips:")
+        print(f"   {highlights['travel_tips']}")
+    
+    def show_available_countries(self):
+        """Show all available countries and cities for trip planning"""
+        print("\n🌍 AVAILABLE COUNTRIES & DESTINATIONS")
+        print("=" * 60)
+        
+        from festival_data import available_countries_view
+        
+        countries_by_type, cities_by_country = available_countries_view()
+        
+        print("\n🎪 Countries with Festival Data:")
+        print("-" * 40)
+        for budget_type, countries in countries_by_type:
+            print(f"\n💰 {budget_type.replace('-', ' ').title()} Options:")
+            for country, specialties in countries:
+                print(f"   🌍 {country}: {specialties}")
+        
+        print(f"\n🏙️ Major Cities (automatically mapped to countries):")
+        print("-" * 40)
+        for country, cities in cities_by_country:
+            print(f"   🏙️ {country}: {cities}")
+        
+        print(f"\n💡 Usage Tips:")
+        print("   • You can enter either country names or city names")
+        print("   • Examples: 'London' will be mapped to 'UK'")
+        print("   • 'Paris' will be mapped to 'France'")
+        print("   • Use exact country names for best results")
+        print("   • Mix and match with any travel month for personalized results")
+    
+    def show_coming_soon_features(self):
+        """Display upcoming features"""
+        print("\n🚀 COMING SOON FEATURES")
+        print("=" * 50)
+        
+        from trip_planner import get_ai_insights, real_time_booking
+        
+        # AI Insights
+        ai_insights = get_ai_insights({})
+        print(f"\n{ai_insights['message']}")
+        print("\nPlanned AI Features:")
+        for feature in ai_insights['planned_features']:
+            print(f"   🔄 {feature}")
+        
+        # Booking Integration
+        booking_info = real_time_booking({}, {})
+        print(f"\n{booking_info['message']}")
+        print("\nPlanned Booking Features:")
+        for feature in booking_info['planned_features']:
+            print(f"   🔄 {feature}")
+        
+        print(f"\n📊 Additional Features Coming Soon:")
+        print("   🔄 Machine Learning trip optimization")
+        print("   🔄 Social media integration") 
+        print("   🔄 Local insider recommendations")
+        print("   🔄 Multi-city route optimization")
+        print("   🔄 Travel buddy matching")
+        print("   🔄 Real-time currency conversion")
+        print("   🔄 Visa requirement checking")
+        print("   🔄 Travel insurance suggestions")
+    
+    def show_about(self):
+        """Show information about the prototype"""
+        print("\n ℹ️  ABOUT AI TRIP PLANNER PROTOTYPE")
+        print("=" * 50)
+        print("🎯 Purpose: Demonstrate core AI trip planning features")
+        print("🔧 Version: Prototype v1.0")
+        print("📅 Created: 2025")
+        print()
+        print("✅ Current Features:")
+        print("   • Festival recommendations (seasonal & country-wise)")
+        print("   • Budget-based trip suggestions") 
+        print("   • Seasonal travel highlights")
+        print("   • Interactive console interface")
+        print()
+        print("🚀 This prototype showcases the foundation for a full")
+        print("   AI-powered trip planning application with real-time")
+        print("   booking capabilities and advanced personalization.")
+        print()
+        print("💡 Future versions will include machine learning,")
+        print("   real-time APIs, and seamless booking integration.")
+
+def print_startup_profile():
+    """
+    Time each step of a cold start (python main.py --startup-profile)
+    Run `python -X importtime main.py --startup-profile` for a per-module breakdown.
+    """
+    timings = []
+    
+    def timed(label, step):
+        started = time.perf_counter()
+        result = step()
+        timings.append((label, time.perf_counter() - started))
+        return result
+    
+    festival_data = timed("import festival_data (catalog)", lambda: importlib.import_module("festival_data"))
+    timed("import trip_planner", lambda: importlib.import_module("trip_planner"))
+    timed("import answer_table", lambda: importlib.import_module("answer_table"))
+    app = timed("init app", TripPlannerApp)
+    timed("init planner (answer table)", lambda: app.planner)
+    timed("build countries view", festival_data.available_countries_view)
+    
+    print("\n⏱️  STARTUP PROFILE")
+    print("=" * 50)
+    for label, seconds in timings:
+        print(f"   {label:<34} {seconds * 1000:8.1f} ms")
+    print("-" * 50)
+    print(f"   {'total':<34} {sum(seconds for label, seconds in timings) * 1000:8.1f} ms")
+    print(f"\n📦 Catalog indexes: {festival_data.get_catalog_source()}")
+    print(f"📋 Answer table: {'loaded' if app.planner.answer_table is not None else 'not built'}")
+
+def run_batch(source_path, output_path=None, k=3, workers=1):
+    """Plan every preference record in a JSONL file (or stdin) without prompts"""
+    from batch_planner import open_input, open_output, plan_file, plan_file_parallel, print_report
+    
+    app = TripPlannerApp()
+    with open_input(source_path) as source, open_output(output_path) as output:
+        if workers == 1:
+            report = plan_file(app.planner, source, output, k)
+        else:
+            report = plan_file_parallel(app.planner, source, output, k, workers or None)
+    print_report(report)
+
+def run_connected(socket_path=None, batch_path=None, output_path=None, k=3):
+    """Use a running planner daemon instead of loading the planner in this process"""
+    from planner_client import DAEMON_SOCKET_PATH, DaemonError, PlannerClient, RemotePlanner, stream_batch
+    
+    try:
+        client = PlannerClient(socket_path or DAEMON_SOCKET_PATH)
+    except DaemonError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return
+    
+    with client:
+        if batch_path:
+            from batch_planner import open_input, open_output, print_report
+            
+            with open_input(batch_path) as source, open_output(output_path) as output:
+                report = stream_batch(client, source, output, k)
+            print_report(report)
+        else:
+            app = TripPlannerApp()
+            app.planner = RemotePlanner(client)
+            run_app(app)
+
+def run_app(app):
+    """Run the interactive app until the user exits"""
+    try:
+        app.run()
+    except KeyboardInterrupt:
+        print("\n\n👋 Goodbye! Thanks for trying AI Trip Planner!")
+    except Exception as e:
+        print(f"\n❌ An error occurred: {e}")
+        print("Please restart the application.")
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="AI Trip Planner")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="print import and init timings, then exit")
+    parser.add_argument("--batch", nargs="?", const="-", metavar="FILE",
+                        help="read preference JSONL from FILE (or stdin) and write results as JSONL")
+    parser.add_argument("--output", metavar="FILE",
+                        help="write --batch results to FILE instead of stdout")
+    parser.add_argument("--top", type=int, default=3, metavar="K",
+                        help="recommendations per --batch record (default: 3)")
+    parser.add_argument("--connect", nargs="?", const="", metavar="SOCKET",
+                        help="send requests to a running planner_daemon.py (default socket if none given)")
+    parser.add_argument("--workers", type=int, default=1, metavar="N",
+                        help="plan --batch records on N processes, 0 for one per core (default: 1)")
+    parser.add_argument("--catalog", metavar="FILE",
+                        help="serve the catalog from a file built by catalog_file.py")
+    return parser.parse_args(argv)
+
+def main():
+    """Main entry point"""
+    args = parse_args(sys.argv[1:])
+    if args.catalog:
+        # Read when festival_data is first imported, and inherited by --workers processes
+        os.environ[CATALOG_FILE_ENV] = args.catalog
+    if args.startup_profile:
+        print_startup_profile()
+        return
+    if args.connect is not None:
+        run_connected(args.connect, args.batch, args.output, args.top)
+        return
+    if args.batch:
+        run_batch(args.batch, args.output, args.top, args.workers)
+        return
+    
+    run_app(TripPlannerApp())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""
+Place Index - Compiled lookup structures for place names
+A character trie maps every city, alias and country name to its country:
+exact lookups cost O(len(name)) and the same structure serves prefix
+queries for autocomplete. A segment index over the same names finds
+typo-tolerant matches within a small edit distance without comparing
+against every name.
+"""
+
+from collections import Counter
+
+# Key under which a trie node stores the value for the name ending there
+_VALUE = None
+
+class PlaceTrie:
+    def __init__(self):
+        self.root = {}
+        self.size = 0
+    
+    def insert(self, name, value):
+        """Add a (lowercase) name; re-inserting a name replaces its value"""
+        node = self.root
+        for char in name:
+            node = node.setdefault(char, {})
+        if _VALUE not in node:
+            self.size += 1
+        node[_VALUE] = value
+    
+    def lookup(self, name):
+        """Value for an exact name, or None"""
+        node = self.root
+        for char in name:
+            node = node.get(char)
+            if node is None:
+                return None
+        return node.get(_VALUE)
+    
+    def prefix_search(self, prefix, limit=10):
+        """Up to `limit` (name, value) pairs starting with prefix, alphabetically"""
+        node = self.root
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return []
+        
+        results = []
+        # Depth-first with children in sorted order, stopping at the limit
+        stack = [(prefix, node)]
+        while stack and len(results) < limit:
+            name, node = stack.pop()
+            if _VALUE in node:
+                results.append((name, node[_VALUE]))
+            children = sorted((char for char in node if char is not _VALUE), reverse=True)
+            stack.extend((name + char, node[char]) for char in children)
+        return results
+    
+    def items(self):
+        """All (name, value) pairs, in no particular order"""
+        stack = [("", self.root)]
+        while stack:
+            name, node = stack.pop()
+            if _VALUE in node:
+                yield name, node[_VALUE]
+            stack.extend((name + char, child) for char, child in node.items() if char is not _VALUE)
+    
+    def __contains__(self, name):
+        return self.lookup(name) is not None
+    
+    def __len__(self):
+        return self.size
+
+def build_place_trie(countries, aliases, city_country_map):
+    """
+    Compile country names, aliases and cities into one trie
+    On clashes cities win over aliases, and aliases over country names.
+    """
+    trie = PlaceTrie()
+    for country in countries:
+        trie.insert(country.lower(), country)
+    for alias, country in aliases.items():
+        trie.insert(alias, country)
+    for city, country in city_country_map.items():
+        trie.insert(city, country)
+    return trie
+
+def edit_distance(a, b):
+    """Levenshtein distance between two strings"""
+    return _distance_from(a)(b)
+
+class SegmentIndex:
+    """
+    Edit distance index over names, built on the pigeonhole principle
+    Every name is cut into max_distance + 2 segments. k edits touch at most k
+    of them, so a name within distance k of a query has at least two segments
+    that show up unchanged in the query, each shifted by at most k characters.
+    A search only looks those substrings up, keeps the names that turned up
+    often enough and only computes the edit distance for those.
+    """
+    
+    def __init__(self, max_distance=2):
+        self.max_distance = max_distance
+        self.parts = max_distance + 2
+        self.names = []
+        self.values = []
+        self.ids = {}           # name -> id
+        self.segments = {}      # (name length, segment number) -> {segment: [ids]}
+        self.short = {}         # name length -> ids of names too short to cut into segments
+    
+    def add(self, name, value):
+        """Add a name; re-adding a name replaces its value"""
+        name_id = self.ids.get(name)
+        if name_id is not None:
+            self.values[name_id] = value
+            return
+        name_id = self.ids[name] = len(self.names)
+        self.names.append(name)
+        self.values.append(value)
+        
+        if len(name) < self.parts:
+            self.short.setdefault(len(name), []).append(name_id)
+            return
+        for number, (start, end) in enumerate(_segments(len(name), self.parts)):
+            postings = self.segments.setdefault((len(name), number), {})
+            postings.setdefault(name[start:end], []).append(name_id)
+    
+    def search(self, word, max_distance):
+        """(distance, name, value) for every name within max_distance, closest first"""
+        if max_distance > self.max_distance:
+            # More edits than the segments were cut for - check every name
+            candidates = range(len(self.names))
+        else:
+            candidates = set()
+            hits = Counter()
+            for length in range(max(0, len(word) - max_distance), len(word) + max_distance + 1):
+                candidates.update(self.short.get(length, ()))
+                for number, (start, end) in enumerate(_segments(length, self.parts)):
+                    postings = self.segments.get((length, number))
+                    if postings is None:
+                        continue
+                    size = end - start
+                    # The segment can only have moved by as many characters as there are edits
+                    found = set()
+                    for position in range(max(0, start - max_distance), min(start + max_distance, len(word) - size) + 1):
+                        found.update(postings.get(word[position:position + size], ()))
+                    hits.update(found)
+            needed = self.parts - max_distance
+            candidates.update(name_id for name_id, count in hits.items() if count >= needed)
+        
+        distance_to = _distance_from(word)
+        matches = []
+        for name_id in candidates:
+            distance = distance_to(self.names[name_id])
+            if distance <= max_distance:
+                matches.append((distance, self.names[name_id], self.values[name_id]))
+        matches.sort()
+        return matches
+    
+    def __len__(self):
+        return len(self.names)
+
+def _segments(length, parts):
+    """(start, end) of each of `parts` near-equal segments of a string of length"""
+    size, longer = divmod(length, parts)
+    bounds = []
+    start = 0
+    for number in range(parts):
+        end = start + size + (number >= parts - longer)
+        bounds.append((start, end))
+        start = end
+    return bounds
+
+def _distance_from(word):
+    """
+    Levenshtein distance from word as a function of the other string
+    Bit-parallel (Myers/Hyyrö): the query is compiled once into per-character
+    position masks and each comparison then costs a few integer operations
+    per character instead of a row of the dynamic programming table.
+    """
+    length = len(word)
+    if not length:
+        return len
+    mask = (1 << length) - 1
+    last = 1 << (length - 1)
+    positions = {}
+    for position, char in enumerate(word):
+        positions[char] = positions.get(char, 0) | 1 << position
+    
+    def distance(text):
+        plus, minus, score = mask, 0, length
+        for char in text:
+            equal = positions.get(char, 0)
+            vertical = equal | minus
+            horizontal = (((equal & plus) + plus) ^ plus) | equal
+            up = minus | ~(horizontal | plus)
+            down = plus & horizontal
+            if up & last:
+                score += 1
+            elif down & last:
+                score -= 1
+            up = (up << 1) | 1
+            down <<= 1
+            plus = (down | ~(vertical | up)) & mask
+            minus = up & vertical & mask
+        return score
+    return distance
+
+def build_place_fuzzy_index(trie, max_distance=2):
+    """Segment index over every name in a place trie"""
+    index = SegmentIndex(max_distance)
+    for name, country in sorted(trie.items()):
+        index.add(name, country)
+    return index
+
+def typo_tolerance(text):
+    """Edits allowed when fuzzy matching text - short names must match exactly"""
+    if len(text) <= 3:
+        return 0
+    if len(text) <= 5:
+        return 1
+    return 2
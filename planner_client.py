@@ -0,0 +1,145 @@
+"""
+Planner Client - Thin client for the planner daemon
+Speaks the daemon's framing over a Unix socket: every message is a 4-byte
+big-endian length followed by compact JSON. Only stdlib socket and json are
+needed, so a client starts without loading the catalog or the planner.
+
+    request:  {"op": "recommendations", "params": {...}}
+    response: {"result": ...}  or  {"error": "...", "status": 400}
+"""
+
+import json
+import os
+import socket
+import struct
+import tempfile
+import time
+from itertools import islice
+
+DAEMON_SOCKET_PATH = os.path.join(tempfile.gettempdir(), f"trip-planner-{os.getuid()}.sock")
+
+MAX_FRAME_BYTES = 16 * 1024 * 1024
+
+FRAME_HEADER = struct.Struct('>I')
+
+class DaemonError(Exception):
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+def encode_frame(message):
+    """Length-prefixed compact JSON for one message"""
+    data = json.dumps(message, separators=(",", ":"), ensure_ascii=False, default=str).encode("utf-8")
+    return FRAME_HEADER.pack(len(data)) + data
+
+class PlannerClient:
+    """
+    Blocking client for the daemon
+    request() does one round trip; request_many() pipelines a batch of
+    requests over the same connection and returns the replies in order.
+    """
+    
+    def __init__(self, path=DAEMON_SOCKET_PATH):
+        self.path = path
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self.sock.connect(path)
+        except OSError as e:
+            self.sock.close()
+            raise DaemonError(f"No planner daemon on {path} ({e.strerror}) - start one with "
+                              f"`python planner_daemon.py`")
+        self.reader = self.sock.makefile("rb")
+    
+    def close(self):
+        self.reader.close()
+        self.sock.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def request(self, op, params=None):
+        """Result of one op, raising DaemonError if the daemon rejects it"""
+        reply = self.request_many([(op, params)])[0]
+        if "error" in reply:
+            raise DaemonError(reply["error"], reply.get("status"))
+        return reply["result"]
+    
+    def request_many(self, requests):
+        """Raw replies ({"result": ...} or {"error": ...}) for (op, params) pairs"""
+        self.sock.sendall(b"".join(encode_frame({"op": op, "params": params or {}}) for op, params in requests))
+        return [self._read_frame() for _ in requests]
+    
+    def _read_frame(self):
+        header = self.reader.read(FRAME_HEADER.size)
+        if len(header) < FRAME_HEADER.size:
+            raise DaemonError("The planner daemon closed the connection")
+        (length,) = FRAME_HEADER.unpack(header)
+        return json.loads(self.reader.read(length))
+
+class RemotePlanner:
+    """The parts of TripPlanner the interactive app uses, answered by the daemon"""
+    
+    answer_table = None
+    
+    def __init__(self, client):
+        self.client = client
+    
+    def get_personalized_recommendations(self, preferences, k=3):
+        return self.client.request("recommendations", dict(preferences, k=k))["recommendations"]
+    
+    def get_seasonal_highlights(self, month):
+        return self.client.request("highlights", {"month": month})
+    
+    def lookup_place(self, place):
+        return self.client.request("places", {"name": place})
+
+def stream_batch(client, source, output, k=3, chunk_size=256):
+    """
+    Send preference JSONL through the daemon, writing the same result lines as --batch
+    Each chunk is pipelined: all requests go out before the replies are read.
+    """
+    from batch_planner import INTERNAL_ERROR, BatchReport, parse_preferences, read_preference_lines
+    
+    report = BatchReport(getattr(source, "name", "<stdin>"))
+    started = time.perf_counter()
+    lines = read_preference_lines(source)
+    while True:
+        chunk = list(islice(lines, chunk_size))
+        if not chunk:
+            break
+        
+        results, requests = [], []
+        for line_number, text in chunk:
+            result = {"line": line_number}
+            try:
+                record = parse_preferences(text)
+            except ValueError as e:
+                result["error"] = str(e)
+            else:
+                if "id" in record:
+                    result["id"] = record.pop("id")
+                requests.append((result, ("recommendations", dict(record, k=k))))
+            results.append(result)
+        
+        replies = client.request_many([request for result, request in requests])
+        for (result, request), reply in zip(requests, replies):
+            if "error" in reply:
+                # Same stable messages as --batch: a daemon-side bug is not described
+                result["error"] = INTERNAL_ERROR if reply.get("status") == 500 else reply["error"]
+            else:
+                result["recommendations"] = reply["result"]["recommendations"]
+        
+        for result in results:
+            if "error" in result:
+                report.rejected += 1
+                if len(report.errors) < 100:
+                    report.errors.append(f"line {result['line']}: {result['error']}")
+        report.records += len(results)
+        output.write("".join(json.dumps(result, ensure_ascii=False) + "\n" for result in results))
+        report.seconds = time.perf_counter() - started
+    
+    output.flush()
+    return report
@@ -0,0 +1,134 @@
+"""
+Planner Daemon - Warm trip planner behind a Unix domain socket
+The daemon loads the catalog, indexes and planner once and answers local
+clients, so a query costs a socket round trip instead of an interpreter
+start. Frames are a 4-byte big-endian length followed by compact JSON:
+
+    request:  {"op": "recommendations", "params": {...}}
+    response: {"result": ...}  or  {"error": "...", "status": 400}
+
+ops are the HTTP service endpoints: recommendations, festivals, highlights,
+places and countries. Requests may be pipelined; replies come back in order. The
+client side lives in planner_client.py.
+
+Start the daemon with:
+    python planner_daemon.py [--socket PATH] [--catalog FILE] [--feed FEED ...]
+reload the catalog (and re-ingest the feeds) without a restart with:
+    kill -HUP <pid>
+and query it with:
+    python main.py --connect [PATH] [--batch preferences.jsonl]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import socket
+
+from catalog_file import CATALOG_FILE_ENV
+from planner_client import DAEMON_SOCKET_PATH, FRAME_HEADER, MAX_FRAME_BYTES, DaemonError, encode_frame
+
+class DaemonProtocol(asyncio.Protocol):
+    """One client connection - every complete frame in the buffer is answered in one write"""
+    
+    def __init__(self, service):
+        self.service = service
+        self.buffer = bytearray()
+        self.transport = None
+    
+    def connection_made(self, transport):
+        self.transport = transport
+    
+    def data_received(self, data):
+        from http_service import HTTPError
+        
+        self.buffer += data
+        replies = []
+        while len(self.buffer) >= FRAME_HEADER.size:
+            (length,) = FRAME_HEADER.unpack_from(self.buffer)
+            if length > MAX_FRAME_BYTES:
+                replies.append(encode_frame({"error": "Frame too large", "status": 413}))
+                self.transport.write(b"".join(replies))
+                self.transport.close()
+                return
+            if len(self.buffer) < FRAME_HEADER.size + length:
+                break
+            frame = bytes(self.buffer[FRAME_HEADER.size:FRAME_HEADER.size + length])
+            del self.buffer[:FRAME_HEADER.size + length]
+            
+            try:
+                request = json.loads(frame)
+                if not isinstance(request, dict) or not isinstance(request.get("params", {}), dict):
+                    raise ValueError("request must be an object with an object of params")
+                reply = {"result": self.service.call(request.get("op"), request.get("params", {}))}
+            except HTTPError as e:
+                reply = {"error": str(e), "status": e.status.value}
+            except ValueError as e:
+                reply = {"error": f"bad request: {e}", "status": 400}
+            except Exception as e:
+                reply = {"error": str(e), "status": 500}
+            replies.append(encode_frame(reply))
+        
+        if replies:
+            self.transport.write(b"".join(replies))
+
+async def serve(path=DAEMON_SOCKET_PATH, planner=None, feeds=()):
+    """Listen on a Unix socket until cancelled, with the festival feeds ingested on start and on every reload"""
+    from http_service import PlannerService, load_feeds, reload_on_sighup
+    
+    if planner is None:
+        from main import TripPlannerApp
+        planner = TripPlannerApp().planner
+    service = PlannerService(planner)
+    
+    _remove_stale_socket(path)
+    loop = asyncio.get_running_loop()
+    # Only this user may talk to the daemon - the socket is created 0600, so
+    # there is no moment where others could connect before a chmod
+    umask = os.umask(0o177)
+    try:
+        server = await loop.create_unix_server(lambda: DaemonProtocol(service), path)
+    finally:
+        os.umask(umask)
+    # SIGTERM shuts down cleanly, like Ctrl+C; SIGHUP reloads the catalog
+    loop.add_signal_handler(signal.SIGTERM, server.close)
+    load_feeds(feeds)
+    reload_on_sighup(loop, feeds)
+    print(f"🔌 Trip planner daemon on {path}")
+    try:
+        async with server:
+            await server.serve_forever()
+    except asyncio.CancelledError:
+        pass
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+
+def _remove_stale_socket(path):
+    """Delete a socket file left by a daemon that died, refusing to replace a live one"""
+    if not os.path.exists(path):
+        return
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            probe.connect(path)
+    except OSError:
+        os.remove(path)
+    else:
+        raise DaemonError(f"A daemon is already listening on {path}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Trip planner daemon")
+    parser.add_argument("--socket", default=DAEMON_SOCKET_PATH, help="Unix socket path")
+    parser.add_argument("--catalog", metavar="FILE", help="serve the catalog from a file built by catalog_file.py")
+    parser.add_argument("--feed", action="append", default=[], help="festival feed to ingest, re-read on SIGHUP")
+    args = parser.parse_args()
+    if args.catalog:
+        os.environ[CATALOG_FILE_ENV] = args.catalog
+    
+    try:
+        asyncio.run(serve(args.socket, feeds=args.feed))
+    except DaemonError as e:
+        print(f"❌ {e}")
+    except KeyboardInterrupt:
+        print("\n👋 Daemon stopped")
@@ -0,0 +1,46 @@
+"""
+Posting Index - Sorted row ids per value
+Every value keeps the ascending ids of the rows that hold it in a compact
+array('I'), so memory grows with the rows and not with rows x values, and
+a filter only touches the rows of the values it asks for.
+"""
+
+from array import array
+from heapq import merge
+
+_EMPTY = array('I')
+
+class PostingIndex:
+    def __init__(self):
+        self._postings = {}    # key -> array('I') of row ids, ascending
+    
+    def add(self, key, row_id):
+        """Add row_id under key - row ids must be added in ascending order"""
+        postings = self._postings.get(key)
+        if postings is None:
+            postings = self._postings[key] = array('I')
+        postings.append(row_id)
+    
+    def get(self, key):
+        """Ascending row ids holding key (empty when no row has it)"""
+        return self._postings.get(key, _EMPTY)
+    
+    def keys(self):
+        return self._postings.keys()
+    
+    def copy(self):
+        """Independent index holding the same postings"""
+        index = PostingIndex()
+        index._postings = {key: array('I', postings) for key, postings in self._postings.items()}
+        return index
+
+def union(postings):
+    """Yield the row ids in any of several ascending lists, ascending and once each"""
+    if len(postings) == 1:
+        yield from postings[0]
+        return
+    previous = None
+    for row_id in merge(*postings):
+        if row_id != previous:
+            yield row_id
+            previous = row_id
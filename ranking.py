@@ -0,0 +1,93 @@
+"""
+Ranking - Scores recommendations against user preferences
+Picks the top k candidates with a bounded heap instead of sorting them all
+"""
+
+import heapq
+
+from festival_data import COUNTRY_SPECIALTIES
+
+# Points awarded for each signal (kept as integers so scores form a few discrete tiers)
+SCORE_WEIGHTS = {
+    'exact_budget': 2,       # budget range is exactly the requested tier
+    'budget_friendly': 1,    # budget-friendly option within a bigger budget
+    'country_match': 3,      # primary country is the preferred country
+    'country_covered': 2,    # preferred country is one of several covered
+    'month_match': 2,        # festival happens in the travel month or dates
+    'nearby': 3,             # festival venue is inside the search radius
+    'specialty': 1           # per country specialty mentioned in the recommendation
+}
+
+def recommendation_country(rec):
+    """Main country of a festival or destination recommendation"""
+    if rec.get('country'):
+        return rec['country']
+    if rec.get('country_match'):
+        return rec['country_match']
+    countries = rec.get('countries') or []
+    return countries[0] if countries else None
+
+def specialty_overlap(rec, country_specialties=COUNTRY_SPECIALTIES):
+    """Count the country's specialties mentioned in a recommendation"""
+    return count_specialties(recommendation_country(rec), f"{rec['title']} {rec['description']}",
+                             rec['budget_range'], country_specialties)
+
+def count_specialties(country, text, budget_range, country_specialties=COUNTRY_SPECIALTIES):
+    """Count a country's specialties mentioned in text or matching the budget range"""
+    specialties = country_specialties.get(country, [])
+    if not specialties:
+        return 0
+    text = text.lower()
+    return sum(1 for specialty in specialties
+               if specialty in text or specialty == budget_range)
+
+def score_recommendation(rec, preferred_country=None, budget_type=None, travel_month=None, travel_dates=None,
+                         near=None, country_specialties=COUNTRY_SPECIALTIES):
+    """
+    Score one candidate recommendation
+    Festival candidates are already filtered by travel_month or travel_dates
+    and by the near search area, so any festival counts as a match for
+    whichever of those was requested.
+    """
+    return score_fields(rec['type'], recommendation_country(rec), rec.get('countries', []), rec['budget_range'],
+                        f"{rec['title']} {rec['description']}", preferred_country, budget_type,
+                        travel_month, travel_dates, near, country_specialties)
+
+def score_fields(kind, country, countries, budget_range, text, preferred_country=None, budget_type=None,
+                 travel_month=None, travel_dates=None, near=None, country_specialties=COUNTRY_SPECIALTIES):
+    """
+    score_recommendation from the fields it reads, for candidates that are not records yet
+    kind is the recommendation type, country its main country and text its
+    title and description.
+    """
+    score = 0
+    
+    if budget_type:
+        if budget_range == budget_type:
+            score += SCORE_WEIGHTS['exact_budget']
+        elif budget_range == 'budget-friendly':
+            score += SCORE_WEIGHTS['budget_friendly']
+    
+    if preferred_country:
+        if country == preferred_country:
+            score += SCORE_WEIGHTS['country_match']
+        elif preferred_country in countries:
+            score += SCORE_WEIGHTS['country_covered']
+    
+    if (travel_month or travel_dates) and kind == 'festival':
+        score += SCORE_WEIGHTS['month_match']
+    
+    if near and kind == 'festival':
+        score += SCORE_WEIGHTS['nearby']
+    
+    score += SCORE_WEIGHTS['specialty'] * count_specialties(country, text, budget_range, country_specialties)
+    return score
+
+def top_k(candidates, k, score):
+    """
+    Highest scoring k candidates in O(n log k)
+    Ties keep the order the candidates arrived in.
+    """
+    if k <= 0:
+        return []
+    return heapq.nlargest(k, candidates, key=score)
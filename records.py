@@ -0,0 +1,96 @@
+"""
+Records - Compact, immutable record types for catalog rows and recommendations
+Slotted classes avoid a per-row dict, while item access (rec['title'],
+'suggestion' in rec, rec.get(...)) keeps code written for dicts working.
+"""
+
+class Record:
+    """Base for slotted, read-only records with dict-style access"""
+    __slots__ = ()
+    
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            object.__setattr__(self, name, fields.pop(name, None))
+        if fields:
+            raise TypeError(f"{type(self).__name__} got unexpected fields: {', '.join(fields)}")
+    
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} records are read-only")
+    
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} records are read-only")
+    
+    # Dict-style access - unset (None) fields behave like missing keys
+    def __getitem__(self, key):
+        if key in self.__slots__:
+            value = getattr(self, key)
+            if value is not None:
+                return value
+        raise KeyError(key)
+    
+    def __contains__(self, key):
+        return key in self.__slots__ and getattr(self, key) is not None
+    
+    def get(self, key, default=None):
+        if key in self:
+            return getattr(self, key)
+        return default
+    
+    def keys(self):
+        return [name for name in self.__slots__ if getattr(self, name) is not None]
+    
+    def items(self):
+        return [(name, getattr(self, name)) for name in self.keys()]
+    
+    def to_dict(self):
+        """Plain dict copy (lists instead of tuples) for JSON output"""
+        return {name: list(value) if isinstance(value, tuple) else value
+                for name, value in self.items()}
+    
+    def replace(self, **changes):
+        """Copy of the record with some fields changed"""
+        fields = {name: getattr(self, name) for name in self.__slots__}
+        fields.update(changes)
+        return type(self)(**fields)
+    
+    def _values(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+    
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._values() == other._values()
+    
+    def __hash__(self):
+        return hash((type(self).__name__,) + self._values())
+    
+    def __repr__(self):
+        fields = ', '.join(f"{name}={value!r}" for name, value in self.items())
+        return f"{type(self).__name__}({fields})"
+    
+    def __reduce__(self):
+        return (_rebuild_record, (type(self), dict(self.items())))
+
+def _rebuild_record(cls, fields):
+    return cls(**fields)
+
+class Festival(Record):
+    __slots__ = ('name', 'country', 'description', 'budget_range', 'start', 'end', 'lat', 'lon')
+
+class Destination(Record):
+    __slots__ = ('title', 'description', 'countries', 'country_match', 'budget_range')
+    
+    def __init__(self, **fields):
+        if fields.get('countries') is not None:
+            fields['countries'] = tuple(fields['countries'])
+        super().__init__(**fields)
+
+class Recommendation(Record):
+    __slots__ = ('type', 'title', 'description', 'country', 'countries',
+                 'country_match', 'budget_range', 'estimated_cost', 'suggestion', 'dates',
+                 'distance_km')
+    
+    def __init__(self, **fields):
+        if fields.get('countries') is not None:
+            fields['countries'] = tuple(fields['countries'])
+        super().__init__(**fields)
@@ -0,0 +1,8 @@
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Keep the snapshot cache of test runs out of the user's cache directory
+os.environ["TRIP_PLANNER_CACHE_DIR"] = tempfile.mkdtemp(prefix="trip-planner-tests-")
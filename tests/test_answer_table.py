@@ -0,0 +1,33 @@
+import festival_data
+from answer_table import build_answer_table, catalog_fingerprint, preference_space
+from trip_planner import TripPlanner
+
+PREFERENCES = [
+    {"travel_month": "march"},
+    {"travel_month": "october", "preferred_country": "india", "budget_category": "budget"},
+    {"preferred_country": "Tokio", "duration": 4},
+    {"travel_month": "december", "depart_date": "2025-12-20", "duration": 5}
+]
+
+def test_answers_match_live_ranking():
+    planner = TripPlanner()
+    catalog = festival_data.current_catalog()
+    table = build_answer_table(planner, depth=10)
+    for key in preference_space(planner):
+        assert table.get(key, 10) == list(planner._evaluate_preference_key(key, 10, catalog))
+    # Past the stored depth the planner has to rank live
+    assert table.get((None, None, None, None, None), 11) is None
+    
+    with_table = TripPlanner(answer_table=table)
+    for preferences in PREFERENCES:
+        assert (with_table.get_personalized_recommendations(preferences, 5)
+                == planner.get_personalized_recommendations(preferences, 5))
+
+def test_fingerprint_covers_country_specialties(monkeypatch):
+    before = catalog_fingerprint()
+    assert festival_data.current_catalog().fingerprint == before
+    
+    specialties = dict(festival_data.COUNTRY_SPECIALTIES)
+    specialties["Japan"] = specialties["Japan"] + ["Onsen hopping"]
+    monkeypatch.setattr(festival_data, "COUNTRY_SPECIALTIES", specialties)
+    assert catalog_fingerprint() != before
@@ -0,0 +1,91 @@
+import io
+import json
+import random
+
+import pytest
+
+from batch_planner import INTERNAL_ERROR, BatchReport, plan_file, plan_file_parallel, plan_lines
+from trip_planner import TripPlanner
+
+def test_bad_records_become_error_lines():
+    lines = [
+        (1, '{"depart_date": "9999-12-30"}'),
+        (2, '{"id": "ok", "travel_month": "march"}'),
+        (3, '{"depart_date": "2025-01-01", "duration": 1000000000}'),
+        (4, '{"depart_date": "someday"}'),
+        (5, 'not json'),
+        (6, '[1, 2]')
+    ]
+    report = BatchReport("test")
+    results = [json.loads(line) for line in plan_lines(TripPlanner(), lines, report=report)]
+    
+    assert [result["line"] for result in results] == [1, 2, 3, 4, 5, 6]
+    assert [result["line"] for result in results if "error" in result] == [1, 3, 4, 5, 6]
+    assert results[1]["id"] == "ok" and results[1]["recommendations"]
+    assert report.records == 6 and report.rejected == 5
+
+@pytest.mark.parametrize("record, error", [
+    ({"travel_month": 3}, "travel_month must be text"),
+    ({"preferred_country": ["Japan"]}, "preferred_country must be text"),
+    ({"budget_category": {"max": 100}}, "budget_category must be text"),
+    ({"duration": "5"}, "duration must be a positive whole number of days"),
+    ({"duration": 0}, "duration must be a positive whole number of days"),
+    ({"duration": 2.5}, "duration must be a positive whole number of days"),
+    ({"depart_date": "someday"}, "depart_date must be a YYYY-MM-DD date"),
+    ({"depart_date": "2025-01-05", "return_date": 20250110}, "return_date must be a YYYY-MM-DD date")
+])
+def test_field_errors_name_the_field(record, error):
+    record["id"] = "r1"
+    [line] = plan_lines(TripPlanner(), [(1, json.dumps(record))])
+    assert json.loads(line) == {"line": 1, "id": "r1", "error": error}
+
+def test_unexpected_errors_are_not_leaked(monkeypatch):
+    planner = TripPlanner()
+    
+    def broken(preferences_list, k=3):
+        if any(preferences.get("travel_month") == "may" for preferences in preferences_list):
+            raise TypeError("can't multiply sequence by non-int of type 'float'")
+        return [() for _ in preferences_list]
+    monkeypatch.setattr(planner, "get_personalized_recommendations_batch", broken)
+    
+    report = BatchReport("test")
+    lines = [(1, '{"travel_month": "may"}'), (2, '{"travel_month": "june"}')]
+    results = [json.loads(line) for line in plan_lines(planner, lines, report=report)]
+    assert results == [{"line": 1, "error": INTERNAL_ERROR}, {"line": 2, "recommendations": []}]
+    assert report.errors == [f"line 1: {INTERNAL_ERROR} (TypeError)"]
+
+def batch_input(records=120):
+    """Preference JSONL mixing good records, bad fields, bad JSON and blank lines"""
+    rng = random.Random(22)
+    months = ["march", "april", "july", "october", "december", None]
+    countries = ["japan", "Spain", "tokyo", "narnia", None]
+    lines = []
+    for number in range(records):
+        roll = rng.random()
+        if roll < 0.1:
+            lines.append("not json")
+        elif roll < 0.15:
+            lines.append("")
+        elif roll < 0.25:
+            lines.append(json.dumps({"id": number, "duration": rng.choice([0, "5", 2.5])}))
+        else:
+            preferences = {"id": number, "travel_month": rng.choice(months), "preferred_country": rng.choice(countries),
+                           "budget_category": rng.choice(["budget", "moderate", "luxury", None]),
+                           "duration": rng.randint(1, 14)}
+            lines.append(json.dumps({field: value for field, value in preferences.items() if value is not None}))
+    return "\n".join(lines) + "\n"
+
+@pytest.mark.parametrize("workers", [1, 2, 3])
+def test_parallel_output_matches_serial(workers):
+    text = batch_input()
+    serial = io.StringIO()
+    serial_report = plan_file(TripPlanner(), io.StringIO(text), serial, k=4, chunk_size=7)
+    
+    parallel = io.StringIO()
+    parallel_report = plan_file_parallel(TripPlanner(), io.StringIO(text), parallel, k=4, workers=workers, chunk_size=7)
+    
+    assert parallel.getvalue() == serial.getvalue()
+    assert (parallel_report.records, parallel_report.rejected) == (serial_report.records, serial_report.rejected)
+    assert parallel_report.errors == serial_report.errors
+    assert serial_report.rejected > 0
+    assert sum(records for records, seconds in parallel_report.workers.values()) == serial_report.records
@@ -0,0 +1,32 @@
+import pickle
+
+import pytest
+
+import festival_data
+from catalog_file import MappedFestivalStore, write_catalog
+
+@pytest.fixture
+def mapped_catalog(tmp_path):
+    path = str(tmp_path / "catalog.bin")
+    write_catalog(path, festival_data.SEASONAL_FESTIVALS, {"Japan": ["tea ceremonies"], "Iceland": ["hot springs"]},
+                  {"reykjavik": "Iceland", "kyoto": "Japan"}, festival_data.catalog_fingerprint())
+    built = festival_data.current_catalog()
+    festival_data.load_catalog_file(path)
+    yield built, festival_data.current_catalog()
+    festival_data.swap_catalog(built)
+
+def test_snapshot_comes_from_the_file(mapped_catalog):
+    built, mapped = mapped_catalog
+    assert isinstance(mapped.festivals, MappedFestivalStore)
+    assert festival_data.get_catalog_source().startswith("catalog file")
+    assert mapped.fingerprint == built.fingerprint
+    assert dict(mapped.country_specialties) == {"Iceland": ("hot springs",), "Japan": ("tea ceremonies",)}
+    assert festival_data.normalize_country_input("reykjavik") == "Iceland"
+    assert festival_data.normalize_country_input("london") == "London"
+    assert festival_data.query_festivals(month="march") == built.query_festivals(month="march")
+
+def test_mapped_snapshot_pickles_by_path(mapped_catalog):
+    built, mapped = mapped_catalog
+    copy = pickle.loads(pickle.dumps(mapped))
+    assert isinstance(copy.festivals, MappedFestivalStore)
+    assert copy.query_festivals(country="japan") == built.query_festivals(country="japan")
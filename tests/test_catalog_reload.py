@@ -0,0 +1,102 @@
+import asyncio
+import os
+import signal
+
+import pytest
+
+import festival_data
+from catalog_file import CATALOG_FILE_ENV, write_catalog
+from http_service import reload_on_sighup
+from trip_planner import TripPlanner
+
+FEED = '{"name": "Reload Fest", "country": "Japan", "description": "d", "budget_range": "budget-friendly", "month": "march"}\n'
+TITLE = "Experience Reload Fest in Japan"
+PREFERENCES = {"travel_month": "march", "preferred_country": "japan", "budget_category": "budget"}
+
+@pytest.fixture
+def feed(tmp_path):
+    path = tmp_path / "feed.jsonl"
+    path.write_text(FEED, encoding="utf-8")
+    return str(path)
+
+@pytest.fixture(autouse=True)
+def restore_catalog(monkeypatch):
+    monkeypatch.delenv(CATALOG_FILE_ENV, raising=False)
+    snapshot = festival_data.current_catalog()
+    source = festival_data.get_catalog_source()
+    yield
+    festival_data.swap_catalog(snapshot)
+    festival_data._CATALOG_SOURCE = source
+
+def titles(recommendations):
+    return [rec.title for rec in recommendations]
+
+def test_reload_bumps_the_version(feed):
+    version = festival_data.get_catalog_version()
+    festival_data.reload_catalog()
+    assert festival_data.get_catalog_version() > version
+    assert TITLE not in titles(TripPlanner().get_personalized_recommendations(PREFERENCES, 50))
+    
+    (report,) = festival_data.reload_catalog([feed])
+    assert (report.rows, report.rejected) == (1, 0)
+    assert TITLE in titles(TripPlanner().get_personalized_recommendations(PREFERENCES, 50))
+    
+    # Feeds are re-read on every reload, not stacked onto the last one
+    rows = len(festival_data.current_catalog().festivals)
+    festival_data.reload_catalog([feed])
+    assert len(festival_data.current_catalog().festivals) == rows
+
+def test_reload_remaps_a_rebuilt_catalog_file(tmp_path, monkeypatch):
+    path = str(tmp_path / "catalog.bin")
+    write_catalog(path, festival_data.SEASONAL_FESTIVALS, {"Japan": ["tea ceremonies"]}, {"kyoto": "Japan"})
+    monkeypatch.setenv(CATALOG_FILE_ENV, path)
+    festival_data.reload_catalog()
+    before = festival_data.current_catalog()
+    
+    write_catalog(path, festival_data.SEASONAL_FESTIVALS, {"Iceland": ["hot springs"]}, {"reykjavik": "Iceland"})
+    festival_data.reload_catalog()
+    after = festival_data.current_catalog()
+    assert festival_data.get_catalog_source() == f"catalog file {path}"
+    assert dict(after.country_specialties) == {"Iceland": ("hot springs",)}
+    # The old mapping still reads the data it was opened on
+    assert dict(before.country_specialties) == {"Japan": ("tea ceremonies",)}
+
+def test_in_flight_requests_keep_their_snapshot(feed):
+    planner = TripPlanner()
+    stream = planner.iter_recommendations(PREFERENCES)
+    first = next(stream)
+    
+    festival_data.reload_catalog([feed])
+    rest = [rec for cursor, rec in stream]
+    assert TITLE not in titles(rec for rec in [first[1]] + rest)
+    assert TITLE in titles(rec for cursor, rec in planner.iter_recommendations(PREFERENCES))
+
+def test_cache_keys_change_after_a_swap(feed):
+    planner = TripPlanner()
+    before = planner.get_personalized_recommendations(PREFERENCES, 50)
+    assert planner.get_personalized_recommendations(PREFERENCES, 50) is before
+    assert (planner.cache.hits, planner.cache.misses) == (1, 1)
+    
+    festival_data.reload_catalog([feed])
+    after = planner.get_personalized_recommendations(PREFERENCES, 50)
+    assert (planner.cache.hits, planner.cache.misses) == (1, 2)
+    assert TITLE in titles(after) and TITLE not in titles(before)
+
+def test_sighup_reloads_in_the_background(feed):
+    version = festival_data.get_catalog_version()
+    
+    async def send_sighup():
+        loop = asyncio.get_running_loop()
+        reload_on_sighup(loop, [feed])
+        try:
+            os.kill(os.getpid(), signal.SIGHUP)
+            for _ in range(500):
+                if festival_data.get_catalog_version() > version:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            loop.remove_signal_handler(signal.SIGHUP)
+    
+    asyncio.run(send_sighup())
+    assert festival_data.get_catalog_version() > version
+    assert TITLE in titles(TripPlanner().get_personalized_recommendations(PREFERENCES, 50))
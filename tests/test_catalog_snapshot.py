@@ -0,0 +1,79 @@
+import os
+import pickle
+
+import pytest
+
+import catalog_snapshot
+import festival_data
+from catalog_snapshot import load_snapshot, save_snapshot, snapshot_cache_key, snapshot_cache_path
+
+@pytest.fixture
+def restore_catalog():
+    snapshot = festival_data.current_catalog()
+    yield
+    festival_data.swap_catalog(snapshot)
+
+def test_cache_hit_and_miss(tmp_path):
+    path = str(tmp_path / "snapshot.pickle")
+    snapshot = festival_data.current_catalog()
+    key = snapshot_cache_key(*festival_data._catalog_tables())
+    assert load_snapshot(key, path) is None
+    
+    assert save_snapshot(snapshot, key, path)
+    loaded = load_snapshot(key, path)
+    assert loaded.version > snapshot.version
+    assert loaded.fingerprint == snapshot.fingerprint
+    assert loaded.query_festivals(month="march") == snapshot.query_festivals(month="march")
+    assert loaded.normalize_country_input("tokyo") == "Japan"
+    
+    assert load_snapshot("some other key", path) is None
+    with open(path, "wb") as f:
+        f.write(b"not a pickle")
+    assert load_snapshot(key, path) is None
+
+def test_old_python_cache_is_ignored(tmp_path):
+    path = str(tmp_path / "snapshot.pickle")
+    with open(path, "wb") as f:
+        pickle.dump(((2, 7), "key"), f)
+        pickle.dump("stale", f)
+    assert load_snapshot("key", path) is None
+
+def test_key_covers_data_and_index_code(monkeypatch, tmp_path):
+    assert snapshot_cache_key({"a": 1}) == snapshot_cache_key({"a": 1})
+    assert snapshot_cache_key({"a": 1}) != snapshot_cache_key({"a": 2})
+    
+    source = tmp_path / "festival_store.py"
+    source.write_text("VERSION = 1\n")
+    monkeypatch.setattr(catalog_snapshot, "SNAPSHOT_SOURCES", (str(source),))
+    before = snapshot_cache_key({"a": 1})
+    source.write_text("VERSION = 2\n")
+    assert snapshot_cache_key({"a": 1}) != before
+
+def test_cache_lives_outside_the_source_tree(monkeypatch, tmp_path):
+    source_dir = os.path.dirname(os.path.abspath(catalog_snapshot.__file__))
+    monkeypatch.delenv("TRIP_PLANNER_CACHE_DIR")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert snapshot_cache_path() == str(tmp_path / "trip-planner" / "catalog_snapshot.pickle")
+    monkeypatch.delenv("XDG_CACHE_HOME")
+    assert not snapshot_cache_path().startswith(source_dir + os.sep)
+    monkeypatch.setenv("TRIP_PLANNER_CACHE_DIR", str(tmp_path / "cache"))
+    assert snapshot_cache_path() == str(tmp_path / "cache" / "catalog_snapshot.pickle")
+
+def test_rebuild_reuses_the_cache_until_the_data_changes(monkeypatch, tmp_path, restore_catalog):
+    monkeypatch.setenv("TRIP_PLANNER_CACHE_DIR", str(tmp_path))
+    festival_data.rebuild_catalog_indexes()
+    assert festival_data.get_catalog_source() == "built from data"
+    assert os.path.exists(tmp_path / "catalog_snapshot.pickle")
+    festival_data.rebuild_catalog_indexes()
+    assert festival_data.get_catalog_source() == "snapshot cache"
+    
+    specialties = dict(festival_data.COUNTRY_SPECIALTIES, Atlantis=["Sunken ruins"])
+    monkeypatch.setattr(festival_data, "COUNTRY_SPECIALTIES", specialties)
+    festival_data.rebuild_catalog_indexes()
+    assert festival_data.get_catalog_source() == "built from data"
+    assert festival_data.normalize_country_input("atlantis") == "Atlantis"
+
+def test_unwritable_cache_is_skipped(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    assert not save_snapshot(festival_data.current_catalog(), "key", str(blocker / "snapshot.pickle"))
@@ -0,0 +1,40 @@
+import pytest
+
+from cost_engine import BASE_DAILY_COSTS, DEFAULT_DAILY_COST, VARIATION_PERCENT, CostStream, estimate_costs, request_seed
+
+BUDGET_RANGES = ["budget-friendly", "moderate", "expensive", "unknown"] * 50
+DURATIONS = [1, 7, 14, 30] * 50
+
+def test_same_seed_gives_the_same_costs():
+    seed = request_seed("march", "Japan", "budget", 7)
+    assert seed == request_seed("march", "Japan", "budget", 7)
+    assert seed != request_seed("march", "Japan", "budget", 8)
+    
+    costs = estimate_costs(BUDGET_RANGES, DURATIONS, seed)
+    assert costs == estimate_costs(BUDGET_RANGES, DURATIONS, seed)
+    assert costs != estimate_costs(BUDGET_RANGES, DURATIONS, seed + 1)
+    # A prefix of the request gets the same first estimates
+    assert estimate_costs(BUDGET_RANGES[:10], DURATIONS[:10], seed) == costs[:10]
+
+def test_stream_matches_the_batch():
+    stream = CostStream(seed=42)
+    assert [stream.estimate(*pair) for pair in zip(BUDGET_RANGES, DURATIONS)] == \
+        estimate_costs(BUDGET_RANGES, DURATIONS, seed=42)
+
+@pytest.mark.parametrize("skip", [0, 1, 4095, 4096, 4097, 10000])
+def test_skip_matches_drawing_and_discarding(skip):
+    drawn = CostStream(seed=7)
+    for _ in range(skip):
+        drawn.estimate("moderate", 1)
+    skipped = CostStream(seed=7, skip=skip)
+    assert [skipped.estimate(*pair) for pair in zip(BUDGET_RANGES, DURATIONS)] == \
+        [drawn.estimate(*pair) for pair in zip(BUDGET_RANGES, DURATIONS)]
+
+def test_costs_stay_within_the_variation():
+    for seed in range(20):
+        for budget_range, duration, cost in zip(BUDGET_RANGES, DURATIONS, estimate_costs(BUDGET_RANGES, DURATIONS, seed)):
+            base = BASE_DAILY_COSTS.get(budget_range, DEFAULT_DAILY_COST) * duration
+            assert int(base * (1 - VARIATION_PERCENT / 100)) <= cost <= int(base * (1 + VARIATION_PERCENT / 100))
+
+def test_no_requests_no_costs():
+    assert estimate_costs([], [], seed=1) == []
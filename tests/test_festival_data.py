@@ -0,0 +1,72 @@
+import itertools
+
+import pytest
+
+import festival_data
+from festival_data import DESTINATION_PACKAGES, SEASONAL_FESTIVALS
+from interval_index import month_bounds, parse_month_day, ranges_overlap
+
+MONTH_NUMBERS = {month: number for number, month in enumerate(
+    ["january", "february", "march", "april", "may", "june", "july",
+     "august", "september", "october", "november", "december"], 1)}
+
+# Every festival in catalog order, from the literal table
+FESTIVALS = [festival for months in SEASONAL_FESTIVALS.values()
+             for festivals in months.values() for festival in festivals]
+COUNTRIES = sorted({festival["country"] for festival in FESTIVALS})
+
+def on_during(festival, month):
+    return ranges_overlap(parse_month_day(festival["start"]), parse_month_day(festival["end"]),
+                          *month_bounds(MONTH_NUMBERS[month]))
+
+def names(festivals):
+    return [festival.name for festival in festivals]
+
+@pytest.mark.parametrize("month, country, budget_ranges", list(itertools.product(
+    [None, "march", "july", "december"],
+    [None, "Japan", "uk", "Atlantis"],
+    [None, ["moderate"], ["budget-friendly", "expensive"]]
+)))
+def test_query_matches_a_scan(month, country, budget_ranges):
+    expected = [festival["name"] for festival in FESTIVALS
+                if (month is None or on_during(festival, month))
+                and (country is None or festival["country"].lower() == country.lower())
+                and (budget_ranges is None or festival["budget_range"] in budget_ranges)]
+    assert names(festival_data.query_festivals(month, country, budget_ranges)) == expected
+    assert names(festival_data.query_festivals(month, country, budget_ranges, limit=2)) == expected[:2]
+
+def test_lookups_by_one_field():
+    for country in COUNTRIES:
+        assert names(festival_data.get_festivals_by_country(country.upper())) == \
+            [festival["name"] for festival in FESTIVALS if festival["country"] == country]
+    assert names(festival_data.get_budget_friendly_festivals()) == \
+        [festival["name"] for festival in FESTIVALS if festival["budget_range"] == "budget-friendly"]
+    assert festival_data.get_festivals_by_month("Smarch") == ()
+    
+    spring = festival_data.get_festivals_by_season("Spring")
+    assert list(spring) == ["march", "april", "may"]
+    assert names(spring["april"]) == [festival["name"] for festival in FESTIVALS if on_during(festival, "april")]
+
+def test_repeated_lookups_share_one_result():
+    assert festival_data.get_festivals_by_month("march") is festival_data.get_festivals_by_month("march")
+    assert festival_data.get_festivals_by_country("Japan") is festival_data.get_festivals_by_country("Japan")
+
+def covers(destination, country):
+    countries = {name.lower() for name in destination["countries"]}
+    return country.lower() in countries or country.lower() == (destination["country_match"] or "").lower()
+
+@pytest.mark.parametrize("country, budget_ranges", list(itertools.product(
+    [None, "Spain", "italy", "UK", "Narnia"],
+    [None, ["moderate"], ["expensive", "budget-friendly"], []]
+)))
+def test_destinations_match_a_scan(country, budget_ranges):
+    expected = [destination["title"] for destination in DESTINATION_PACKAGES
+                if (country is None or covers(destination, country))
+                and (budget_ranges is None or destination["budget_range"] in budget_ranges)]
+    assert [destination.title for destination in festival_data.query_destinations(country, budget_ranges)] == expected
+    assert [destination.title for destination in festival_data.iter_destinations(country, budget_ranges)] == expected
+
+def test_has_destinations():
+    for destination in DESTINATION_PACKAGES:
+        assert all(festival_data.has_destinations(country.upper()) for country in destination["countries"])
+    assert not festival_data.has_destinations("Narnia")
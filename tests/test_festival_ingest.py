@@ -0,0 +1,72 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from catalog_file import MappedCatalog
+from festival_ingest import ingest_festivals, validate_festival_row
+from festival_store import FestivalStore
+
+FEED = """\
+{"name": "A Fest", "country": "Japan", "description": "d", "budget_range": "moderate", "month": "march"}
+{"name": broken
+[1, 2]
+
+{"name": "B Fest", "country": "spain", "description": "d", "budget_range": "budget-friendly", "month": "july"}
+{"name": "C Fest", "country": "Spain", "description": "d", "budget_range": "cheap", "month": "july"}
+"""
+
+def test_bad_lines_are_rejected_one_by_one(tmp_path):
+    path = tmp_path / "feed.jsonl"
+    path.write_text(FEED, encoding="utf-8")
+    store = FestivalStore()
+    
+    report = ingest_festivals(str(path), store, chunk_size=2)
+    
+    assert (report.rows, report.rejected) == (2, 3)
+    assert [error.split(":")[0] for error in report.errors] == ["line 2", "line 3", "line 6"]
+    assert [store.row(row_id).name for row_id in range(len(store))] == ["A Fest", "B Fest"]
+    assert store.row(1).country == "Spain"
+
+def test_csv_errors_name_the_line(tmp_path):
+    path = tmp_path / "feed.csv"
+    path.write_text("name,country,description,budget_range,month,start,end\n"
+                    "A Fest,Japan,d,moderate,march,03-02,03-04\n"
+                    "B Fest,Japan,d,moderate,march,3rd,03-04\n", encoding="utf-8")
+    report = ingest_festivals(str(path), FestivalStore())
+    assert report.errors == ["line 3: bad start date '3rd', expected MM-DD"]
+
+@pytest.mark.parametrize("dates, ok", [
+    ({"start": "03-02", "end": "03-04"}, True),
+    ({"start": "02-25", "end": "03-02"}, True),     # runs into the month it is filed under
+    ({"start": "03-28", "end": "04-03"}, True),     # runs on past it
+    ({"start": "12-30", "end": "03-01"}, True),     # across New Year
+    ({"end": "03-10"}, True),
+    ({"start": "02-10", "end": "02-20"}, False),
+    ({"start": "04-01"}, False),
+    ({"end": "02-10"}, False),
+    ({"start": "11-20", "end": "02-10"}, False),
+])
+def test_dates_must_fall_in_the_filed_month(dates, ok):
+    row = dict(dates, name="A Fest", country="Japan", description="d", budget_range="moderate", month="march")
+    if ok:
+        assert validate_festival_row(row)["month"] == "march"
+    else:
+        with pytest.raises(ValueError, match="miss(es)? march"):
+            validate_festival_row(row)
+
+def test_cli_writes_a_servable_catalog(tmp_path):
+    feed = tmp_path / "feed.jsonl"
+    feed.write_text(FEED, encoding="utf-8")
+    output = str(tmp_path / "catalog.bin")
+    script = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "festival_ingest.py")
+    
+    check = subprocess.run([sys.executable, script, "--check", str(feed)], capture_output=True, text=True)
+    assert check.returncode == 1
+    assert "line 3: row is not an object" in check.stdout
+    
+    subprocess.run([sys.executable, script, "--output", output, str(feed)], check=True, capture_output=True)
+    festivals = MappedCatalog(output).festivals
+    names = [festivals.row(row_id).name for row_id in range(len(festivals))]
+    assert names[-2:] == ["A Fest", "B Fest"]
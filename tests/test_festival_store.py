@@ -0,0 +1,102 @@
+import itertools
+
+from catalog_file import MappedCatalog, write_catalog
+from festival_data import CITY_COUNTRY_MAP, COUNTRY_SPECIALTIES, SEASONAL_FESTIVALS
+from festival_store import EncodedColumn, FestivalStore, build_festival_store
+from interval_index import month_bounds, ranges_overlap
+
+MONTHS = {"march": 3, "april": 4, "july": 7}
+
+STORE = build_festival_store(SEASONAL_FESTIVALS)
+NEAR = {row_id for distance, row_id in STORE.within(40.0, 10.0, 2500)}
+
+FILTERS = list(itertools.product(
+    [None, "march", "april", "july"],
+    [None, "Japan", "Spain", "Atlantis"],
+    [None, ["moderate"], ["budget-friendly", "expensive"], []],
+    [None, (60, 120), (350, 20)],
+    [None, (40.0, 10.0, 2500)]
+))
+
+def scan(store, month, country, budget_ranges, window, near):
+    """Row ids matching the filters, found by checking every row"""
+    return [row_id for row_id in range(len(store))
+            if (month is None or ranges_overlap(store.starts[row_id], store.ends[row_id], *month_bounds(MONTHS[month])))
+            and (country is None or store.countries.value(row_id).lower() == country.lower())
+            and (budget_ranges is None or store.budget_ranges.value(row_id) in budget_ranges)
+            and (window is None or ranges_overlap(store.starts[row_id], store.ends[row_id], *window))
+            and (near is None or row_id in NEAR)]
+
+def test_select_matches_a_full_scan():
+    for filters in FILTERS:
+        expected = scan(STORE, *filters)
+        assert list(STORE.select(*filters)) == expected, filters
+        assert STORE.explain(*filters)["matched"] == len(expected)
+
+def test_mapped_store_matches(tmp_path):
+    path = str(tmp_path / "catalog.bin")
+    write_catalog(path, SEASONAL_FESTIVALS, COUNTRY_SPECIALTIES, CITY_COUNTRY_MAP)
+    mapped = MappedCatalog(path).festivals
+    for filters in FILTERS:
+        assert list(mapped.select(*filters)) == list(STORE.select(*filters))
+        assert mapped.explain(*filters) == STORE.explain(*filters)
+
+def test_copies_only_index_appended_rows():
+    rows = [(STORE.row(row_id).to_dict(), STORE.months.value(row_id)) for row_id in range(len(STORE))]
+    base = FestivalStore()
+    for festival, month in rows[:30]:
+        base.append(festival, month)
+    base.build_indexes()
+    before = [list(base.select(*filters)) for filters in FILTERS]
+    
+    store = base.copy()
+    for festival, month in rows[30:35]:
+        store.append(festival, month)
+    store.build_indexes()
+    assert store._intervals.layers[0] is base._intervals.layers[0]
+    assert [(first, end) for first, end, tree in store._intervals.layers] == [(0, 30), (30, 35)]
+    
+    for festival, month in rows[35:]:
+        store.append(festival, month)
+        if len(store) % 7 == 0:
+            store.build_indexes()
+    for filters in FILTERS:
+        assert list(store.select(*filters)) == list(STORE.select(*filters)), filters
+    assert [list(base.select(*filters)) for filters in FILTERS] == before
+
+def test_months_include_festivals_running_into_them():
+    def names(month):
+        return {STORE.row(row_id).name for row_id in STORE.select(month=month)}
+    # Cherry blossoms are filed under March and last until April 10
+    assert "Cherry Blossom Festival" in names("march") & names("april")
+    assert "Christmas Markets" in names("november") & names("december")
+    assert "Holi Festival" not in names("april")
+    assert names("Smarch") == set()
+
+def test_rows_decode_to_the_source_festivals():
+    festivals = [(festival, month) for months in SEASONAL_FESTIVALS.values()
+                 for month, festivals in months.items() for festival in festivals]
+    assert len(STORE) == len(festivals)
+    for row_id, (festival, month) in enumerate(festivals):
+        assert STORE.row(row_id).to_dict() == festival
+        assert STORE.months.value(row_id) == month
+
+def test_columns_store_each_value_once():
+    # Spellings that differ only in case share a code and keep the first one seen
+    column = EncodedColumn()
+    for value in ["Japan", "Spain", "japan", "JAPAN", "Spain"]:
+        column.append(value, value.lower())
+    assert column.values == ["Japan", "Spain"]
+    assert list(column.data) == [0, 1, 0, 0, 1]
+    assert [column.value(row_id) for row_id in range(len(column))] == ["Japan", "Spain", "Japan", "Japan", "Spain"]
+    assert list(column.postings.get(0)) == [0, 2, 3]
+
+def test_columns_widen_past_256_values():
+    column = EncodedColumn()
+    for row_id in range(600):
+        column.append(f"value {row_id % 300}")
+    assert len(column.values) == 300
+    assert column.data.itemsize == 4
+    assert [column.value(row_id) for row_id in (0, 255, 256, 299, 599)] == \
+        ["value 0", "value 255", "value 256", "value 299", "value 299"]
+    assert list(column.postings.get(256)) == [256, 556]
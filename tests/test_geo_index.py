@@ -0,0 +1,116 @@
+import random
+
+import pytest
+
+from festival_data import current_catalog
+from geo_index import GeoIndex, haversine_km, radius_test
+
+def random_points(rng, count):
+    return [(rng.uniform(-90, 90), rng.uniform(-180, 180)) for _ in range(count)]
+
+def brute_force_within(points, lat, lon, radius_km):
+    """(distance_km, value) within radius_km by haversine, skipping points too close to the edge to call"""
+    matches, borderline = [], set()
+    for value, (point_lat, point_lon) in enumerate(points):
+        distance = haversine_km(lat, lon, point_lat, point_lon)
+        if abs(distance - radius_km) < 1e-6:
+            borderline.add(value)
+        elif distance < radius_km:
+            matches.append((distance, value))
+    return sorted(matches), borderline
+
+@pytest.fixture(scope="module")
+def points():
+    return random_points(random.Random(7), 1000)
+
+@pytest.fixture(scope="module")
+def index(points):
+    return GeoIndex((lat, lon, value) for value, (lat, lon) in enumerate(points))
+
+@pytest.mark.parametrize("radius_km", [1, 300, 3000, 15000])
+def test_within_matches_brute_force(points, index, radius_km):
+    for lat, lon in random_points(random.Random(radius_km), 20):
+        found = index.within(lat, lon, radius_km)
+        expected, borderline = brute_force_within(points, lat, lon, radius_km)
+        kept = [match for match in found if match[1] not in borderline]
+        assert [value for distance, value in kept] == [value for distance, value in expected]
+        assert [distance for distance, value in kept] == pytest.approx([distance for distance, value in expected], abs=1e-6)
+        # radius_test is the per-row check used next to the tree and must agree with it
+        inside = radius_test(lat, lon, radius_km)
+        assert {value for value, point in enumerate(points) if inside(*point)} == {value for distance, value in found}
+
+def test_iter_nearest_matches_brute_force(points, index):
+    for lat, lon in random_points(random.Random(9), 30):
+        expected = sorted((haversine_km(lat, lon, *point), value) for value, point in enumerate(points))[:25]
+        nearest = index.nearest(lat, lon, 25)
+        assert [value for distance, value in nearest] == [value for distance, value in expected]
+        assert [distance for distance, value in nearest] == pytest.approx([distance for distance, value in expected], abs=1e-6)
+    # The lazy walk reaches every point exactly once, in distance order
+    everything = list(index.iter_nearest(12.0, 34.0))
+    assert sorted(value for distance, value in everything) == list(range(len(points)))
+    assert [distance for distance, value in everything] == sorted(distance for distance, value in everything)
+
+@pytest.mark.parametrize("centre, nearby, far, distance_km", [
+    # Across the antimeridian: 0.2 degrees of longitude apart at the equator,
+    # while a point on the same side is much further
+    ((0.0, 179.9), (0.0, -179.9), (0.0, 179.0), 22.2),
+    ((-16.5, -179.95), (-16.5, 179.95), (-16.5, -179.0), 10.7),
+    # Over the poles: opposite longitudes 0.1 degrees from the pole
+    ((89.9, 0.0), (89.9, 180.0), (89.0, 0.0), 22.2),
+    ((-89.9, 90.0), (-89.9, -90.0), (-89.0, 90.0), 22.2)
+])
+def test_wraps_across_the_antimeridian_and_poles(centre, nearby, far, distance_km):
+    index = GeoIndex([(*nearby, "nearby"), (*far, "far")])
+    assert haversine_km(*centre, *nearby) == pytest.approx(distance_km, abs=0.1)
+    assert haversine_km(*centre, *far) > 50
+    
+    found = index.within(*centre, 50)
+    assert [value for distance, value in found] == ["nearby"]
+    assert found[0][0] == pytest.approx(distance_km, abs=0.1)
+    assert index.within_many([centre], 50) == [found]
+    assert [value for distance, value in index.nearest(*centre, 2)] == ["nearby", "far"]
+    assert radius_test(*centre, 50)(*nearby) and not radius_test(*centre, 50)(*far)
+
+def test_radius_is_exact_at_the_edge():
+    centre = (48.8566, 2.3522)
+    point = (51.5074, -0.1278)
+    distance = haversine_km(*centre, *point)
+    index = GeoIndex([(*point, "london")])
+    assert index.within(*centre, distance + 1e-6) and radius_test(*centre, distance + 1e-6)(*point)
+    assert not index.within(*centre, distance - 1e-6) and not radius_test(*centre, distance - 1e-6)(*point)
+
+def test_within_many_matches_brute_force(points, index):
+    queries = random_points(random.Random(8), 50) + [(0.0, 179.9), (89.9, 0.0), (-89.9, 45.0)]
+    for radius_km in (10, 500, 2500):
+        results = index.within_many(queries, radius_km)
+        assert len(results) == len(queries)
+        for (lat, lon), found in zip(queries, results):
+            assert found == index.within(lat, lon, radius_km)
+            expected, borderline = brute_force_within(points, lat, lon, radius_km)
+            assert [value for distance, value in found if value not in borderline] == [value for distance, value in expected]
+            for (distance, value), (expected_distance, expected_value) in zip(
+                    [match for match in found if match[1] not in borderline], expected):
+                assert distance == pytest.approx(expected_distance, abs=1e-6)
+
+def test_within_many_on_empty_inputs(index):
+    assert index.within_many([], 100) == []
+    assert GeoIndex([]).within_many([(0.0, 0.0)], 100) == [[]]
+
+def test_festivals_near_many_matches_single_queries():
+    catalog = current_catalog()
+    places = ["paris", "tokyo", (40.0, -3.7), "nowhere at all", "rio de janeiro"]
+    for month in (None, "july"):
+        batched = catalog.festivals_near_many(places, 800, month=month)
+        assert batched == tuple(catalog.festivals_near(place, 800, month=month) for place in places)
+
+def test_nearest_event_cities_visits_cities_nearest_first():
+    catalog = current_catalog()
+    expected = []
+    for distance, city in catalog.city_geo.iter_nearest(*catalog.locate_place("paris")):
+        festivals = tuple(festival for festival_distance, festival
+                          in catalog.festivals_near(catalog.city_coordinates[city], 200))
+        if festivals:
+            expected.append((distance, city, festivals))
+        if len(expected) == 3:
+            break
+    assert catalog.nearest_event_cities("paris", k=3, radius_km=200) == tuple(expected)
@@ -0,0 +1,137 @@
+import asyncio
+import json
+from http import HTTPStatus
+
+import pytest
+
+import festival_data
+from http_service import HTTPError, PlannerProtocol, PlannerService
+from trip_planner import TripPlanner
+
+@pytest.fixture(scope="module")
+def service():
+    return PlannerService(TripPlanner())
+
+@pytest.mark.parametrize("target, key", [
+    ("/recommendations?travel_month=march&budget_category=budget&duration=5&k=2", "recommendations"),
+    ("/festivals?month=march", "festivals"),
+    ("/festivals?country=japan", "festivals"),
+    ("/highlights?month=april", "festivals"),
+    ("/places?name=londn", "location"),
+    ("/countries", "countries")
+])
+def test_get_routes(service, target, key):
+    status, payload = service.handle("GET", target, b"")
+    assert status == HTTPStatus.OK
+    assert payload[key]
+
+def test_countries_come_from_the_catalog(service):
+    payload = service.call("countries", {})
+    countries_by_type, cities_by_country = festival_data.available_countries_view()
+    assert payload["countries"] == {budget_type: dict(countries) for budget_type, countries in countries_by_type}
+    assert payload["cities"] == dict(cities_by_country)
+
+def test_post_recommendations(service):
+    body = json.dumps({"travel_month": "july", "preferred_country": "Spain", "k": 2}).encode()
+    status, payload = service.handle("POST", "/recommendations", body)
+    assert status == HTTPStatus.OK
+    assert len(payload["recommendations"]) == 2
+
+def test_recommendations_match_planner(service):
+    status, payload = service.handle("GET", "/recommendations?travel_month=october&preferred_country=india", b"")
+    expected = TripPlanner().get_personalized_recommendations_batch([{"travel_month": "october",
+                                                                      "preferred_country": "india"}])[0]
+    assert payload["recommendations"] == [rec.to_dict() for rec in expected]
+
+def test_recommendations_use_the_planner_cache():
+    planner = TripPlanner()
+    service = PlannerService(planner)
+    for _ in range(3):
+        service.handle("GET", "/recommendations?travel_month=march&preferred_country=japan", b"")
+    assert planner.cache.stats()["hits"] == 2
+
+@pytest.mark.parametrize("method, target, body, status", [
+    ("GET", "/nowhere", b"", HTTPStatus.NOT_FOUND),
+    ("POST", "/festivals", b"{}", HTTPStatus.METHOD_NOT_ALLOWED),
+    ("DELETE", "/recommendations", b"", HTTPStatus.METHOD_NOT_ALLOWED),
+    ("GET", "/festivals", b"", HTTPStatus.BAD_REQUEST),
+    ("GET", "/places", b"", HTTPStatus.BAD_REQUEST),
+    ("GET", "/recommendations?duration=soon", b"", HTTPStatus.BAD_REQUEST),
+    ("GET", "/recommendations?budget_category=cheap", b"", HTTPStatus.BAD_REQUEST),
+    ("POST", "/recommendations", b'{"budget_category": ["budget"]}', HTTPStatus.BAD_REQUEST),
+    ("POST", "/recommendations", b"[1, 2]", HTTPStatus.BAD_REQUEST),
+    ("POST", "/recommendations", b"{not json", HTTPStatus.BAD_REQUEST),
+    ("GET", "/recommendations?k=-1", b"", HTTPStatus.BAD_REQUEST),
+    ("GET", "/recommendations?k=0", b"", HTTPStatus.BAD_REQUEST),
+    ("POST", "/recommendations", b'{"k": [1, 2]}', HTTPStatus.BAD_REQUEST),
+    ("POST", "/recommendations", b'{"k": true}', HTTPStatus.BAD_REQUEST),
+    ("POST", "/recommendations", b'{"duration": 2.5}', HTTPStatus.BAD_REQUEST),
+    ("POST", "/recommendations", b'{"travel_month": 3}', HTTPStatus.BAD_REQUEST),
+    ("POST", "/recommendations", b'{"near": "pariss"}', HTTPStatus.BAD_REQUEST)
+])
+def test_bad_requests(service, method, target, body, status):
+    with pytest.raises(HTTPError) as error:
+        service.handle(method, target, body)
+    assert error.value.status == status
+
+@pytest.mark.parametrize("name, params, message", [
+    ("festivals", {"month": 3}, "month must be text"),
+    ("highlights", {"month": ["may"]}, "month must be text"),
+    ("places", {"name": {"city": "paris"}}, "name must be text"),
+    ("recommendations", {"k": "2"}, "k must be a positive whole number")
+])
+def test_parameters_are_validated(service, name, params, message):
+    with pytest.raises(HTTPError, match=message) as error:
+        service.call(name, params)
+    assert error.value.status == HTTPStatus.BAD_REQUEST
+
+def test_bugs_are_not_client_errors(monkeypatch):
+    planner = TripPlanner()
+    monkeypatch.setattr(planner, "lookup_place", lambda place: None.lower())
+    service = PlannerService(planner)
+    with pytest.raises(AttributeError):
+        service.call("places", {"name": "paris"})
+    written, closed = exchange(service, b"GET /places?name=paris HTTP/1.1\r\n\r\n")
+    assert written.startswith(b"HTTP/1.1 500 Internal Server Error")
+
+def test_call_by_name(service):
+    assert service.call("festivals", {"month": "march"}) == service.handle("GET", "/festivals?month=march", b"")[1]
+    with pytest.raises(HTTPError) as error:
+        service.call("k", {})
+    assert error.value.status == HTTPStatus.NOT_FOUND
+
+class FakeTransport:
+    def __init__(self):
+        self.written = b""
+        self.closed = False
+    
+    def write(self, data):
+        self.written += data
+    
+    def close(self):
+        self.closed = True
+
+def exchange(service, data):
+    """Everything a PlannerProtocol writes back for data, and whether it closed"""
+    async def run():
+        protocol = PlannerProtocol(service)
+        transport = FakeTransport()
+        protocol.connection_made(transport)
+        protocol.data_received(data)
+        protocol.connection_lost(None)
+        return transport
+    transport = asyncio.run(run())
+    return transport.written, transport.closed
+
+def test_pipelined_requests(service):
+    written, closed = exchange(service, b"GET /countries HTTP/1.1\r\n\r\n"
+                                        b"GET /festivals?month=may HTTP/1.1\r\nConnection: close\r\n\r\n")
+    assert written.count(b"HTTP/1.1 200 OK") == 2
+    assert closed
+
+def test_negative_content_length(service):
+    written, closed = exchange(service, b"POST /recommendations HTTP/1.1\r\nContent-Length: -40\r\n\r\n"
+                                        b"GET /countries HTTP/1.1\r\n\r\n")
+    assert written.startswith(b"HTTP/1.1 400 Bad Request")
+    assert written.count(b"HTTP/1.1") == 1
+    assert closed
@@ -0,0 +1,78 @@
+import random
+from datetime import date
+
+import pytest
+
+from interval_index import (
+    LAST_DAY,
+    IntervalIndex,
+    day_of_year,
+    format_date_range,
+    month_day,
+    parse_month_day,
+    ranges_overlap,
+    travel_window
+)
+
+def days(start, end):
+    """Every day number in an inclusive range, which may wrap"""
+    if start <= end:
+        return set(range(start, end + 1))
+    return set(range(start, LAST_DAY + 1)) | set(range(0, end + 1))
+
+def random_range(rng):
+    """Mostly short ranges, some wrapping past New Year, plus a few arbitrary ones"""
+    start = rng.randrange(LAST_DAY + 1)
+    if rng.random() < 0.9:
+        return start, (start + rng.randrange(60)) % (LAST_DAY + 1)
+    return start, rng.randrange(LAST_DAY + 1)
+
+@pytest.fixture(scope="module")
+def intervals():
+    rng = random.Random(16)
+    return [(*random_range(rng), value) for value in range(400)]
+
+def test_overlap_matches_brute_force(intervals):
+    index = IntervalIndex(intervals)
+    rng = random.Random(3)
+    queries = [random_range(rng) for _ in range(200)] + [(350, 10), (0, LAST_DAY), (LAST_DAY, 0)]
+    for query in queries:
+        expected = {value for start, end, value in intervals if days(start, end) & days(*query)}
+        assert set(index.overlapping(*query)) == expected, query
+        assert {value for start, end, value in intervals if ranges_overlap(start, end, *query)} == expected
+
+def test_stabbing_matches_brute_force(intervals):
+    index = IntervalIndex(intervals)
+    for day in [0, 1, 58, 59, 180, LAST_DAY - 1, LAST_DAY]:
+        expected = {value for start, end, value in intervals if day in days(start, end)}
+        assert set(index.overlapping(day, day)) == expected, day
+
+def test_empty_index():
+    assert list(IntervalIndex([]).overlapping(0, LAST_DAY)) == []
+
+@pytest.mark.parametrize("depart, return_date, window", [
+    ("2025-12-28", "2026-01-03", (day_of_year(12, 28), day_of_year(1, 3))),
+    ("2025-12-31", "2026-01-01", (LAST_DAY, 0)),
+    ("2024-02-28", "2024-03-01", (day_of_year(2, 28), day_of_year(3, 1))),
+    ("2025-03-01", "2026-03-05", None),      # a year or more covers every day
+])
+def test_travel_windows_wrap_across_new_year(depart, return_date, window):
+    assert travel_window(depart, return_date) == window
+
+def test_return_before_departure_is_rejected():
+    with pytest.raises(ValueError):
+        travel_window("2025-03-02", "2025-03-01")
+
+def test_new_year_window_finds_festivals_on_either_side():
+    index = IntervalIndex([
+        (parse_month_day("12-20"), parse_month_day("12-24"), "christmas"),
+        (parse_month_day("12-31"), parse_month_day("01-01"), "new year"),
+        (parse_month_day("01-05"), parse_month_day("01-06"), "epiphany"),
+        (parse_month_day("01-20"), parse_month_day("01-30"), "late january"),
+    ])
+    window = travel_window(date(2025, 12, 22), date(2026, 1, 5))
+    assert set(index.overlapping(*window)) == {"christmas", "new year", "epiphany"}
+
+def test_month_days_round_trip():
+    assert [month_day(parse_month_day(text)) for text in ("01-01", "02-29", "12-31")] == ["01-01", "02-28", "12-31"]
+    assert format_date_range("12-30", "01-02") == "Dec 30 - Jan 2"
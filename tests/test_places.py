@@ -0,0 +1,97 @@
+import pytest
+
+from festival_data import (
+    CITY_COUNTRY_MAP,
+    COUNTRY_ALIASES,
+    normalize_country_input,
+    suggest_corrections,
+    suggest_places
+)
+from festival_ingest import validate_festival_row
+from place_index import PlaceTrie, SegmentIndex, build_place_trie, edit_distance
+from trip_planner import TripPlanner
+
+@pytest.mark.parametrize("text, country", [
+    ("London", "UK"),
+    ("holland", "Netherlands"),
+    ("  JAPAN ", "Japan"),
+    ("Austria", "Austria"),
+    ("Iceland", "Iceland"),
+    ("Poland", "Poland"),
+    ("barcelonna", "Barcelonna")
+])
+def test_normalize_never_guesses(text, country):
+    assert normalize_country_input(text) == country
+
+@pytest.mark.parametrize("text, suggestion", [
+    ("Austria", "australia"),
+    ("Iceland", "ireland"),
+    ("barcelonna", "barcelona"),
+    ("tokio", "tokyo")
+])
+def test_did_you_mean(text, suggestion):
+    assert suggest_corrections(text)[0][0] == suggestion
+
+def test_lookup_place():
+    planner = TripPlanner()
+    assert planner.lookup_place("Austria")["country"] == "Austria"
+    assert planner.lookup_place("Austria")["suggestions"][0] == ("australia", "Australia")
+    assert planner.lookup_place("london")["suggestions"] == []
+    assert planner.lookup_place("londn")["location"] == planner.lookup_place("london")["location"]
+
+def test_ingest_keeps_unknown_countries():
+    row = {"name": "Fest", "country": "Austria", "description": "d", "budget_range": "moderate", "month": "may"}
+    assert validate_festival_row(row)["country"] == "Austria"
+
+def test_edit_distance():
+    assert [edit_distance(a, b) for a, b in [("", "abc"), ("kitten", "sitting"), ("flaw", "lawn"), ("abc", "abc")]] == [3, 3, 2, 0]
+
+def test_segment_index_finds_every_close_name():
+    names = ["a", "ab", "ba", "abc", "abcd", "bacd", "abcde", "abdce", "edcba", "abcdef", "bcdefa", "aabbccdd"]
+    index = SegmentIndex(max_distance=2)
+    for name in names:
+        index.add(name, name.upper())
+    for word in ["", "b", "abd", "acbd", "abcdx", "bcdef", "abccdd", "aabbcdd"]:
+        for max_distance in range(4):
+            expected = sorted((edit_distance(word, name), name, name.upper()) for name in names
+                              if edit_distance(word, name) <= max_distance)
+            assert index.search(word, max_distance) == expected
+
+def test_trie_lookup_and_prefix_search():
+    names = ["paris", "parma", "par", "pamplona", "porto", "lisbon"]
+    trie = PlaceTrie()
+    for name in names:
+        trie.insert(name, name.upper())
+    trie.insert("par", "PAR again")
+    
+    assert len(trie) == len(names)
+    assert trie.lookup("parma") == "PARMA" and trie.lookup("par") == "PAR again"
+    assert trie.lookup("pa") is None and "pari" not in trie and "lisbon" in trie
+    assert sorted(trie.items()) == sorted((name, trie.lookup(name)) for name in names)
+    
+    # Alphabetical, stopping at the limit
+    for prefix in ["", "p", "pa", "par", "paris", "x"]:
+        expected = sorted(name for name in names if name.startswith(prefix))
+        assert [name for name, value in trie.prefix_search(prefix, limit=100)] == expected
+        assert [name for name, value in trie.prefix_search(prefix, limit=2)] == expected[:2]
+
+def test_cities_win_over_aliases_and_countries():
+    trie = build_place_trie(["Georgia", "Jersey"], {"georgia": "Georgia (US)", "holland": "Netherlands"},
+                            {"georgia": "Georgia City", "jersey": "UK"})
+    assert trie.lookup("georgia") == "Georgia City"
+    assert trie.lookup("jersey") == "UK"
+    assert trie.lookup("holland") == "Netherlands"
+
+def test_normalize_matches_the_tables():
+    for city, country in CITY_COUNTRY_MAP.items():
+        assert normalize_country_input(city.upper()) == country
+    for alias, country in COUNTRY_ALIASES.items():
+        if alias not in CITY_COUNTRY_MAP:
+            assert normalize_country_input(f" {alias} ") == country
+
+def test_autocomplete():
+    suggestions = suggest_places("  Lo", limit=50)
+    assert [name for name, country in suggestions] == sorted(name for name, country in suggestions)
+    assert ("london", "UK") in suggestions
+    assert all(name.startswith("lo") for name, country in suggestions)
+    assert suggest_places("zzz") == []
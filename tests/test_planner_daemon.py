@@ -0,0 +1,124 @@
+import asyncio
+import json
+import os
+import stat
+import threading
+
+import pytest
+
+from http_service import PlannerService
+from planner_client import FRAME_HEADER, DaemonError, PlannerClient, RemotePlanner, encode_frame
+from planner_daemon import DaemonProtocol, serve
+from trip_planner import TripPlanner
+
+class FakeTransport:
+    def __init__(self):
+        self.written = b""
+        self.closed = False
+    
+    def write(self, data):
+        self.written += data
+    
+    def close(self):
+        self.closed = True
+
+def replies(data):
+    """Decoded reply frames a DaemonProtocol writes back for data"""
+    protocol = DaemonProtocol(PlannerService(TripPlanner()))
+    transport = FakeTransport()
+    protocol.connection_made(transport)
+    protocol.data_received(data)
+    written = transport.written
+    messages = []
+    while written:
+        (length,) = FRAME_HEADER.unpack_from(written)
+        messages.append(json.loads(written[FRAME_HEADER.size:FRAME_HEADER.size + length]))
+        written = written[FRAME_HEADER.size + length:]
+    return messages
+
+@pytest.mark.parametrize("op, params, key", [
+    ("recommendations", {"travel_month": "march", "k": 2}, "recommendations"),
+    ("festivals", {"country": "japan"}, "festivals"),
+    ("highlights", {"month": "april"}, "festivals"),
+    ("places", {"name": "londn"}, "location"),
+    ("countries", {}, "countries")
+])
+def test_ops_route_to_the_service(op, params, key):
+    [reply] = replies(encode_frame({"op": op, "params": params}))
+    assert reply["result"][key]
+
+@pytest.mark.parametrize("frame, status", [
+    (encode_frame({"op": "nowhere"}), 404),
+    (encode_frame({"op": "festivals", "params": {}}), 400),
+    (encode_frame({"op": "festivals", "params": [1]}), 400),
+    (encode_frame([1, 2]), 400),
+    (FRAME_HEADER.pack(9) + b"{not json", 400)
+])
+def test_bad_requests(frame, status):
+    [reply] = replies(frame)
+    assert reply["status"] == status
+
+def test_pipelined_and_split_frames():
+    data = encode_frame({"op": "countries"}) + encode_frame({"op": "nowhere"}) + encode_frame({"op": "countries"})
+    protocol = DaemonProtocol(PlannerService(TripPlanner()))
+    transport = FakeTransport()
+    protocol.connection_made(transport)
+    # Frames split across reads are answered once complete, in order
+    protocol.data_received(data[:7])
+    assert transport.written == b""
+    protocol.data_received(data[7:])
+    assert transport.written.count(b'"result"') == 2 and transport.written.count(b'"error"') == 1
+
+def test_oversized_frame_closes_the_connection():
+    protocol = DaemonProtocol(PlannerService(TripPlanner()))
+    transport = FakeTransport()
+    protocol.connection_made(transport)
+    protocol.data_received(FRAME_HEADER.pack(2**31))
+    assert b"413" in transport.written and transport.closed
+
+def test_remote_planner_matches_local_planner(tmp_path):
+    path = str(tmp_path / "daemon.sock")
+    planner = TripPlanner()
+    service = PlannerService(planner)
+    loop = asyncio.new_event_loop()
+    server = loop.run_until_complete(loop.create_unix_server(lambda: DaemonProtocol(service), path))
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        with PlannerClient(path) as client:
+            remote = RemotePlanner(client)
+            preferences = {"travel_month": "october", "preferred_country": "india"}
+            assert remote.get_personalized_recommendations(preferences, 2) == [
+                rec.to_dict() for rec in planner.get_personalized_recommendations(preferences, 2)]
+            assert remote.lookup_place("tokio") == json.loads(json.dumps(planner.lookup_place("tokio")))
+            with pytest.raises(DaemonError) as error:
+                client.request("places", {})
+            assert error.value.status == 400
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        server.close()
+        loop.run_until_complete(server.wait_closed())
+        loop.close()
+
+def test_socket_is_private_from_the_start(tmp_path, monkeypatch):
+    path = str(tmp_path / "daemon.sock")
+    # No chmod after bind - the mode must come from the bind itself
+    monkeypatch.setattr(os, "chmod", lambda *args: pytest.fail("socket mode changed after bind"))
+    umask = os.umask(0o022)
+    
+    async def start_and_stop():
+        daemon = asyncio.ensure_future(serve(path, TripPlanner()))
+        while not os.path.exists(path):
+            await asyncio.sleep(0.01)
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+        daemon.cancel()
+        await daemon
+        return mode
+    
+    try:
+        assert asyncio.run(start_and_stop()) == 0o600
+        assert os.umask(umask) == 0o022
+    finally:
+        os.umask(umask)
+    assert not os.path.exists(path)
@@ -0,0 +1,80 @@
+import random
+
+import pytest
+
+from festival_data import current_catalog
+from ranking import SCORE_WEIGHTS, score_recommendation, top_k
+from records import Recommendation
+from trip_planner import TripPlanner
+
+def festival(**fields):
+    return Recommendation(**dict({"type": "festival", "title": "Experience Fest in Peru", "description": "d",
+                                  "country": "Peru", "budget_range": "moderate", "estimated_cost": 0}, **fields))
+
+@pytest.mark.parametrize("k", [0, 1, 3, 10, 200])
+def test_top_k_matches_a_stable_full_sort(k):
+    rng = random.Random(k)
+    candidates = [(rng.randrange(6), position) for position in range(100)]
+    score = lambda candidate: candidate[0]
+    assert top_k(iter(candidates), k, score) == sorted(candidates, key=score, reverse=True)[:k]
+
+def test_weights_add_up_per_signal():
+    specialties = {"Peru": ["moderate", "llamas"], "Chile": []}
+    assert score_recommendation(festival(country="Chile"), country_specialties=specialties) == 0
+    # A specialty counts once, whether it is the budget range or mentioned
+    assert score_recommendation(festival(), country_specialties=specialties) == SCORE_WEIGHTS["specialty"]
+    assert score_recommendation(festival(description="Llamas everywhere"), country_specialties=specialties) == \
+        2 * SCORE_WEIGHTS["specialty"]
+    
+    chile = festival(country="Chile")
+    assert score_recommendation(chile, budget_type="moderate", country_specialties=specialties) == \
+        SCORE_WEIGHTS["exact_budget"]
+    assert score_recommendation(festival(country="Chile", budget_range="budget-friendly"), budget_type="expensive",
+                                country_specialties=specialties) == SCORE_WEIGHTS["budget_friendly"]
+    assert score_recommendation(chile, budget_type="expensive", country_specialties=specialties) == 0
+    assert score_recommendation(chile, preferred_country="Chile", travel_month="march", near=("Lima", 0, 0, 300),
+                                country_specialties=specialties) == \
+        SCORE_WEIGHTS["country_match"] + SCORE_WEIGHTS["month_match"] + SCORE_WEIGHTS["nearby"]
+
+def test_month_and_area_only_count_for_festivals():
+    destination = Recommendation(type="destination", title="Andes", description="d", countries=["Peru", "Chile"],
+                                 country_match="Peru", budget_range="moderate", estimated_cost=0)
+    assert score_recommendation(destination, preferred_country="Chile", travel_month="march", near=("Lima", 0, 0, 300),
+                                country_specialties={}) == SCORE_WEIGHTS["country_covered"]
+    assert score_recommendation(destination, preferred_country="Peru", country_specialties={}) == \
+        SCORE_WEIGHTS["country_match"]
+
+@pytest.mark.parametrize("preferences", [
+    {},
+    {"travel_month": "march", "budget_category": "moderate"},
+    {"preferred_country": "japan", "budget_category": "luxury"},
+    {"travel_month": "june", "near": "london"},
+])
+def test_rows_score_like_their_recommendations(preferences):
+    planner = TripPlanner()
+    catalog = current_catalog()
+    key = planner._preference_key(preferences, catalog)
+    budget_ranges, score = planner._ranking_context(key, catalog)
+    score_row = planner._festival_row_score(key, catalog)
+    
+    rows = list(planner._festival_rows(catalog, *key[:2], budget_ranges, *key[3:]))
+    records = [planner._festival_recommendation(catalog.festivals.row(row_id), key[4]) for row_id in rows]
+    assert rows
+    assert [score_row(row_id) for row_id in rows] == [score(rec) for rec in records]
+
+@pytest.mark.parametrize("preferences", [
+    {"travel_month": "march"},
+    {"travel_month": "july", "preferred_country": "spain", "budget_category": "moderate"},
+    {"budget_category": "budget"},
+])
+def test_recommendations_are_the_best_candidates(preferences):
+    planner = TripPlanner()
+    catalog = current_catalog()
+    key = planner._preference_key(preferences, catalog)
+    budget_ranges, score = planner._ranking_context(key, catalog)
+    candidates = list(planner._iter_candidates(catalog, *key[:2], budget_ranges, *key[3:]))
+    expected = sorted(candidates, key=score, reverse=True)[:5]
+    
+    recommendations = planner.get_personalized_recommendations(preferences, 5)
+    assert [rec.replace(estimated_cost=0) for rec in recommendations if rec.type != "notice"] == \
+        expected[:len(recommendations) - sum(rec.type == "notice" for rec in recommendations)]
@@ -0,0 +1,94 @@
+import threading
+
+import pytest
+
+from festival_data import get_catalog_version
+from recommendation_cache import RecommendationCache
+from trip_planner import TripPlanner
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+def test_least_recently_used_is_evicted_first():
+    cache = RecommendationCache(maxsize=3)
+    for key in "abc":
+        cache.put(key, key.upper())
+    assert cache.get("a") == "A"
+    cache.put("d", "D")
+    cache.put("b", "B2")
+    cache.put("e", "E")
+    
+    assert [cache.get(key) for key in "abcde"] == [None, "B2", None, "D", "E"]
+    assert cache.stats()["evictions"] == 3
+
+def test_entries_expire_after_their_ttl():
+    clock = FakeClock()
+    cache = RecommendationCache(ttl=10, clock=clock)
+    cache.put("short", 1, ttl=2)
+    cache.put("default", 2)
+    
+    clock.now = 1.9
+    assert (cache.get("short"), cache.get("default")) == (1, 2)
+    clock.now = 2.0
+    assert (cache.get("short"), cache.get("default")) == (None, 2)
+    clock.now = 10.0
+    assert cache.get("default") is None
+    assert len(cache) == 0
+
+def test_stats_count_hits_misses_and_evictions():
+    clock = FakeClock()
+    cache = RecommendationCache(maxsize=2, ttl=5, clock=clock)
+    assert cache.stats() == {"hits": 0, "misses": 0, "evictions": 0, "size": 0, "maxsize": 2, "hit_rate": 0.0}
+    
+    cache.put("a", 1)
+    cache.get("a")
+    cache.get("b")
+    cache.put("b", 2)
+    cache.put("c", 3)
+    clock.now = 5
+    cache.get("c")
+    assert cache.stats() == {"hits": 1, "misses": 2, "evictions": 1, "size": 1, "maxsize": 2, "hit_rate": 1 / 3}
+
+@pytest.mark.parametrize("maxsize", [0, -1])
+def test_disabled_cache_stores_nothing(maxsize):
+    cache = RecommendationCache(maxsize=maxsize)
+    cache.put("a", 1)
+    assert cache.get("a") is None and len(cache) == 0
+
+def test_planner_keys_carry_the_catalog_version_and_request_shape():
+    planner = TripPlanner()
+    preferences = {"travel_month": "march", "preferred_country": "japan"}
+    planner.get_personalized_recommendations(preferences)
+    # Spellings of the same country share an entry
+    planner.get_personalized_recommendations(dict(preferences, preferred_country="Tokyo"))
+    planner.get_personalized_recommendations(preferences, k=5)
+    planner.get_personalized_recommendations(dict(preferences, duration=10))
+    
+    keys = list(planner.cache._entries)
+    assert len(keys) == 3
+    assert {key[0] for key in keys} == {get_catalog_version()}
+    assert planner.cache.stats()["hits"] == 1
+
+def test_concurrent_use_keeps_the_cache_consistent():
+    cache = RecommendationCache(maxsize=50)
+    
+    def worker(offset):
+        for i in range(2000):
+            key = (offset + i) % 80
+            if cache.get(key) is None:
+                cache.put(key, key)
+    
+    threads = [threading.Thread(target=worker, args=(offset,)) for offset in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    stats = cache.stats()
+    assert stats["hits"] + stats["misses"] == 8 * 2000
+    assert len(cache) == 50
+    assert all(cache.get(key) in (None, key) for key in range(80))
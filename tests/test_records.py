@@ -0,0 +1,75 @@
+import pickle
+
+import pytest
+
+import festival_data
+from festival_data import current_catalog, get_festivals_by_country, get_festivals_by_month, query_festivals
+from records import Destination, Festival, Recommendation
+from trip_planner import TripPlanner
+
+def test_festival_queries_return_shared_read_only_rows():
+    festivals = get_festivals_by_month("march")
+    assert isinstance(festivals, tuple) and festivals
+    assert get_festivals_by_month("march") is festivals
+    assert get_festivals_by_country("japan") is get_festivals_by_country("japan")
+    
+    with pytest.raises(AttributeError):
+        festivals[0].name = "Renamed"
+    with pytest.raises(TypeError):
+        festivals[0]["name"] = "Renamed"
+    assert festivals[0].replace(name="Renamed").name == "Renamed"
+    assert get_festivals_by_month("march")[0] == festivals[0]
+
+def test_catalog_is_isolated_from_its_source_data(monkeypatch):
+    snapshot = current_catalog()
+    with pytest.raises(TypeError):
+        snapshot.city_coordinates["atlantis"] = (0.0, 0.0)
+    with pytest.raises(TypeError):
+        snapshot.country_specialties["Japan"] = ()
+    
+    # Editing the module data without a rebuild leaves the served catalog alone
+    before = query_festivals(month="march")
+    march = [festival for months in festival_data.SEASONAL_FESTIVALS.values()
+             for month, festivals in months.items() if month == "march" for festival in festivals]
+    monkeypatch.setitem(march[0], "name", "Renamed")
+    assert query_festivals(month="march") == before
+
+def test_cached_recommendations_are_shared_read_only():
+    planner = TripPlanner()
+    preferences = {"travel_month": "april", "preferred_country": "japan"}
+    recommendations = planner.get_personalized_recommendations(preferences)
+    assert planner.get_personalized_recommendations(preferences) is recommendations
+    with pytest.raises(AttributeError):
+        recommendations[0].estimated_cost = 0
+    to_dict = recommendations[0].to_dict()
+    to_dict["title"] = "Changed"
+    assert planner.get_personalized_recommendations(preferences)[0].title != "Changed"
+
+def test_records_behave_like_dicts_without_one():
+    festival = Festival(name="Holi", country="India", description="Colors", budget_range="budget-friendly")
+    assert not hasattr(festival, "__dict__")
+    assert festival["name"] == "Holi" and festival.get("lat") is None and festival.get("lat", 0) == 0
+    assert "country" in festival and "lat" not in festival and "nonsense" not in festival
+    with pytest.raises(KeyError):
+        festival["start"]
+    assert festival.keys() == ["name", "country", "description", "budget_range"]
+    assert festival.to_dict() == dict(festival.items())
+    assert repr(festival) == "Festival(name='Holi', country='India', description='Colors', budget_range='budget-friendly')"
+
+def test_unknown_fields_are_rejected():
+    with pytest.raises(TypeError, match="unexpected fields: venue"):
+        Festival(name="Holi", venue="Mathura")
+
+def test_equal_records_hash_alike_and_pickle():
+    destination = Destination(title="Andes", description="d", countries=["Peru", "Chile"], budget_range="moderate")
+    assert destination.countries == ("Peru", "Chile")
+    assert destination.to_dict()["countries"] == ["Peru", "Chile"]
+    same = Destination(title="Andes", description="d", countries=("Peru", "Chile"), budget_range="moderate")
+    assert destination == same and hash(destination) == hash(same)
+    assert len({destination, same, destination.replace(title="Alps")}) == 2
+    assert pickle.loads(pickle.dumps(destination)) == destination
+    
+    recommendation = Recommendation(type="festival", title="t", description="d", budget_range="moderate",
+                                    estimated_cost=0)
+    assert recommendation != Festival(description="d", budget_range="moderate")
+    assert pickle.loads(pickle.dumps(recommendation)) == recommendation
@@ -0,0 +1,27 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from festival_ingest import validate_festival_row
+from synthetic_catalog import catalog_scale, iter_synthetic_festivals, synthetic_catalog, synthetic_countries
+
+def test_same_seed_same_catalog():
+    store, specialties, city_country_map, city_coordinates = synthetic_catalog(500, seed=3)
+    again = synthetic_catalog(500, seed=3)
+    assert [store.row(row_id) for row_id in range(len(store))] == [again[0].row(row_id) for row_id in range(500)]
+    assert (specialties, city_country_map, city_coordinates) == again[1:]
+    other = synthetic_catalog(500, seed=4)[0]
+    assert [store.row(row_id) for row_id in range(500)] != [other.row(row_id) for row_id in range(500)]
+
+def test_scale():
+    assert catalog_scale(100) == (10, 10)
+    assert catalog_scale(10**4) == (100, 1000)
+    assert catalog_scale(10**7) == (1000, 10**6)
+    assert len(set(synthetic_countries(1000))) == 1000
+
+def test_festivals_are_valid_feed_rows():
+    countries = synthetic_countries(20)
+    for month, festival in iter_synthetic_festivals(300, countries):
+        row = dict(festival, month=month)
+        assert validate_festival_row(row) == row
@@ -0,0 +1,56 @@
+from itertools import islice
+
+import pytest
+
+from festival_data import current_catalog
+from trip_planner import TripPlanner
+
+PREFERENCES = [
+    {},
+    {"travel_month": "march"},
+    {"travel_month": "october", "preferred_country": "india", "budget_category": "budget"},
+    {"travel_month": "july", "preferred_country": "Spain", "budget_category": "luxury", "duration": 10},
+    {"preferred_country": "Tokio", "duration": 4},
+    {"preferred_country": "narnia"},
+    {"travel_month": "december", "depart_date": "2025-12-20", "duration": 5},
+    {"travel_month": "june", "near": "paris"}
+]
+
+@pytest.fixture(scope="module")
+def planner():
+    return TripPlanner()
+
+def test_batch_matches_single_requests(planner):
+    # Repeats make the batch share evaluated keys between requests
+    preferences_list = PREFERENCES + [dict(preferences, duration=12) for preferences in PREFERENCES]
+    results = TripPlanner().get_personalized_recommendations_batch(preferences_list, k=5)
+    assert results == [planner.get_personalized_recommendations(preferences, 5)
+                       for preferences in preferences_list]
+
+@pytest.mark.parametrize("preferences", PREFERENCES)
+def test_stream_matches_list(planner, preferences):
+    expected = list(planner.get_personalized_recommendations(preferences, 5))
+    streamed = list(islice(planner.iter_recommendations(preferences), 5))
+    assert [rec for cursor, rec in streamed] == expected
+    
+    # Resuming from a cursor picks up right after it
+    cursor = streamed[0][0]
+    assert [rec for cursor, rec in islice(planner.iter_recommendations(preferences, cursor), 4)] == expected[1:]
+
+@pytest.mark.parametrize("preferences, message", [
+    ({"near": "pariss"}, "did you mean Paris?"),
+    ({"near": "austria"}, "Unknown city for near: 'austria'"),
+    ({"near": ["paris"]}, "near must be text"),
+    ({"near": "paris", "radius_km": 0}, "radius_km must be a positive number"),
+    ({"near": "paris", "radius_km": -5}, "radius_km must be a positive number"),
+    ({"near": "paris", "radius_km": "far"}, "radius_km must be a positive number"),
+    ({"near": "paris", "radius_km": True}, "radius_km must be a positive number")
+])
+def test_near_is_never_guessed(planner, preferences, message):
+    with pytest.raises(ValueError, match=message):
+        planner.get_personalized_recommendations(preferences)
+
+def test_near_radius(planner):
+    catalog = current_catalog()
+    assert planner._search_area({"near": " Paris "}, catalog) == ("Paris", *catalog.city_coordinates["paris"], 300.0)
+    assert planner._search_area({"near": "paris", "radius_km": 12.5}, catalog)[-1] == 12.5
@@ -1,328 +1,530 @@
-"""
-AI Trip Planner - Core Logic
-Prototype for personalized trip recommendations with festival integration
-"""
-
-import random
-from datetime import datetime, timedelta
-from festival_data import (
-    get_festivals_by_month, 
-    get_festivals_by_country, 
-    get_budget_friendly_festivals,
-    normalize_country_input
-)
-
-class TripPlanner:
-    def __init__(self):
-        self.budget_ranges = {
-            "budget": {"min": 500, "max": 1500, "type": "budget-friendly"},
-            "moderate": {"min": 1500, "max": 3500, "type": "moderate"}, 
-            "luxury": {"min": 3500, "max": 10000, "type": "expensive"}
-        }
-        
-    def get_personalized_recommendations(self, preferences):
-        """
-        Generate personalized trip recommendations based on user preferences
-        This is a prototype - full AI integration coming soon!
-        """
-        recommendations = []
-        
-        # Get festival recommendations
-        festival_recs = self._get_festival_recommendations(preferences)
-        recommendations.extend(festival_recs)
-        
-        # Add destination recommendations (prototype)
-        destination_recs = self._get_destination_recommendations(preferences)
-        recommendations.extend(destination_recs)
-        
-        return recommendations[:3]  # Limit to top 3 for prototype
-    
-    def _get_festival_recommendations(self, preferences):
-        """Get festival recommendations based on preferences"""
-        recommendations = []
-        
-        # Normalize country input if provided
-        preferred_country = None
-        if preferences.get('preferred_country'):
-            preferred_country = normalize_country_input(preferences['preferred_country'])
-            print(f"🌍 Searching for festivals in {preferred_country}...")
-        
-        # Get base festivals list
-        all_festivals = []
-        if preferences.get('travel_month') and preferred_country:
-            # Get festivals for specific month AND country
-            month_festivals = get_festivals_by_month(preferences['travel_month'])
-            all_festivals = [f for f in month_festivals if f['country'] == preferred_country]
-        elif preferences.get('travel_month'):
-            all_festivals = get_festivals_by_month(preferences['travel_month'])
-        elif preferred_country:
-            all_festivals = get_festivals_by_country(preferred_country)
-        else:
-            all_festivals = get_budget_friendly_festivals()
-        
-        # Filter by budget type if specified
-        budget_type = None
-        if preferences.get('budget_category'):
-            budget_type = self.budget_ranges[preferences['budget_category']]['type']
-            
-        filtered_festivals = []
-        for festival in all_festivals:
-            # Apply budget filter
-            if budget_type:
-                # Allow budget-friendly for all budget types, and match exact budget types
-                if festival['budget_range'] == budget_type or (budget_type in ['moderate', 'expensive'] and festival['budget_range'] == 'budget-friendly'):
-                    filtered_festivals.append(festival)
-            else:
-                filtered_festivals.append(festival)
-        
-        # If no festivals found for the specific country, provide a message
-        if preferred_country and not filtered_festivals:
-            # Return a "no festivals found" recommendation
-            rec = {
-                'type': 'notice',
-                'title': f"No festivals found for {preferred_country}",
-                'description': f"We don't have festival data for {preferred_country} in our current database. Try exploring our available destinations or check our general recommendations.",
-                'country': preferred_country,
-                'budget_range': 'N/A',
-                'estimated_cost': 0,
-                'suggestion': f"Explore general attractions and cultural sites in {preferred_country}"
-            }
-            recommendations.append(rec)
-        
-        # Create festival recommendations
-        for festival in filtered_festivals[:2]:  # Limit to 2 for prototype
-            rec = {
-                'type': 'festival',
-                'title': f"Experience {festival['name']} in {festival['country']}",
-                'description': festival['description'],
-                'country': festival['country'],
-                'budget_range': festival['budget_range'],
-                'estimated_cost': self._estimate_cost(festival['budget_range'], preferences.get('duration', 7))
-            }
-            recommendations.append(rec)
-        
-        return recommendations
-    
-    def _get_destination_recommendations(self, preferences):
-        """Get general destination recommendations (prototype)"""
-        preferred_country = None
-        if preferences.get('preferred_country'):
-            preferred_country = normalize_country_input(preferences['preferred_country'])
-        
-        # All available destinations
-        all_destinations = [
-            {
-                'type': 'destination',
-                'title': 'London Cultural Experience',
-                'description': 'Explore royal palaces, museums, and historic landmarks in London',
-                'countries': ['UK'],
-                'country_match': 'UK',
-                'budget_range': 'expensive',
-                'estimated_cost': self._estimate_cost('expensive', preferences.get('duration', 7))
-            },
-            {
-                'type': 'destination',
-                'title': 'UK Heritage Trail',
-                'description': 'Discover castles, countryside, and British culture',
-                'countries': ['UK'],
-                'country_match': 'UK',
-                'budget_range': 'moderate',
-                'estimated_cost': self._estimate_cost('moderate', preferences.get('duration', 7))
-            },
-            {
-                'type': 'destination',
-                'title': 'Paris Art & Romance',
-                'description': 'Museums, cafes, and iconic landmarks in the City of Light',
-                'countries': ['France'],
-                'country_match': 'France',
-                'budget_range': 'expensive',
-                'estimated_cost': self._estimate_cost('expensive', preferences.get('duration', 7))
-            },
-            {
-                'type': 'destination',
-                'title': 'Mediterranean Adventure',
-                'description': 'Beaches, history, and culture in Southern Europe',
-                'countries': ['Spain', 'Italy', 'Greece'],
-                'country_match': 'Spain',
-                'budget_range': 'moderate',
-                'estimated_cost': self._estimate_cost('moderate', preferences.get('duration', 7))
-            },
-            {
-                'type': 'destination',
-                'title': 'Cultural Heritage Tour - Europe',
-                'description': 'Explore historical sites and local traditions',
-                'countries': ['Italy', 'France', 'Spain'],
-                'country_match': None,
-                'budget_range': 'moderate',
-                'estimated_cost': self._estimate_cost('moderate', preferences.get('duration', 7))
-            },
-            {
-                'type': 'destination', 
-                'title': 'Tropical Paradise - Southeast Asia',
-                'description': 'Beautiful beaches and exotic culture',
-                'countries': ['Thailand', 'Indonesia', 'Philippines'],
-                'country_match': 'Thailand',
-                'budget_range': 'budget-friendly',
-                'estimated_cost': self._estimate_cost('budget-friendly', preferences.get('duration', 7))
-            },
-            {
-                'type': 'destination',
-                'title': 'Japanese Cultural Discovery',
-                'description': 'Traditional temples, modern cities, and cherry blossoms',
-                'countries': ['Japan'],
-                'country_match': 'Japan',
-                'budget_range': 'expensive',
-                'estimated_cost': self._estimate_cost('expensive', preferences.get('duration', 7))
-            },
-            {
-                'type': 'destination',
-                'title': 'German Cultural Experience',
-                'description': 'Historic cities, castles, and beer culture',
-                'countries': ['Germany'],
-                'country_match': 'Germany',
-                'budget_range': 'moderate',
-                'estimated_cost': self._estimate_cost('moderate', preferences.get('duration', 7))
-            }
-        ]
-        
-        # Filter by preferred country first
-        if preferred_country:
-            country_destinations = [d for d in all_destinations if d['country_match'] == preferred_country or preferred_country in d['countries']]
-            if country_destinations:
-                destinations = country_destinations
-            else:
-                # If no destinations found for preferred country, return a notice
-                return [{
-                    'type': 'notice',
-                    'title': f"Limited destinations for {preferred_country}",
-                    'description': f"We have limited destination packages for {preferred_country}. Consider exploring our festival recommendations or general travel options.",
-                    'countries': [preferred_country],
-                    'budget_range': 'N/A',
-                    'estimated_cost': 0
-                }]
-        else:
-            destinations = all_destinations
-        
-        # Filter by budget
-        budget_type = None
-        if preferences.get('budget_category'):
-            budget_type = self.budget_ranges[preferences['budget_category']]['type']
-            filtered_destinations = []
-            for d in destinations:
-                if budget_type:
-                    # Allow budget-friendly for all budgets, match exact budget types
-                    if d['budget_range'] == budget_type or (budget_type in ['moderate', 'expensive'] and d['budget_range'] == 'budget-friendly'):
-                        filtered_destinations.append(d)
-                else:
-                    filtered_destinations.append(d)
-            destinations = filtered_destinations
-        
-        return destinations[:1]  # Return 1 for prototype
-    
-    def _estimate_cost(self, budget_range, duration_days):
-        """Estimate trip cost based on budget range and duration"""
-        base_costs = {
-            'budget-friendly': 80,
-            'moderate': 200,
-            'expensive': 500
-        }
-        
-        base_cost = base_costs.get(budget_range, 150)
-        total_cost = base_cost * duration_days
-        
-        # Add some randomness for realism
-        variation = random.randint(-20, 20) / 100
-        total_cost = int(total_cost * (1 + variation))
-        
-        return total_cost
-    
-    def get_seasonal_highlights(self, month):
-        """Get seasonal highlights for a specific month"""
-        festivals = get_festivals_by_month(month)
-        
-        highlights = {
-            'festivals': festivals,
-            'weather_tips': self._get_weather_tips(month),
-            'travel_tips': self._get_travel_tips(month)
-        }
-        
-        return highlights
-    
-    def _get_weather_tips(self, month):
-        """Get weather tips for the month (prototype data)"""
-        weather_tips = {
-            'march': 'Spring weather, pack layers',
-            'april': 'Mild temperatures, perfect for sightseeing',
-            'may': 'Warm weather begins, light clothing recommended',
-            'june': 'Summer begins, hot in many destinations',
-            'july': 'Peak summer, very hot in Europe and Asia',
-            'august': 'Hot summer continues, monsoon in some regions',
-            'september': 'Pleasant weather, great for travel',
-            'october': 'Cool temperatures, autumn colors',
-            'november': 'Cool weather, fewer crowds',
-            'december': 'Winter begins, holiday season',
-            'january': 'Cold in northern hemisphere, summer in south',
-            'february': 'Still cold in north, good for tropical destinations'
-        }
-        
-        return weather_tips.get(month.lower(), 'Check local weather conditions')
-    
-    def _get_travel_tips(self, month):
-        """Get travel tips for the month"""
-        tips = {
-            'march': 'Book early for spring festivals',
-            'april': 'Cherry blossom season - book accommodations early',
-            'may': 'Great weather for outdoor activities',
-            'june': 'Peak season begins - expect higher prices',
-            'july': 'Peak tourist season - book well in advance',
-            'august': 'Very busy season, consider alternative dates',
-            'september': 'Shoulder season - good prices and weather',
-            'october': 'Excellent time to travel, beautiful autumn',
-            'november': 'Low season - great deals available',
-            'december': 'Holiday season - book early for festivities',
-            'january': 'Low season in most places - good deals',
-            'february': 'Still low season - ideal for budget travel'
-        }
-        
-        return tips.get(month.lower(), 'Research local conditions before travel')
-
-# Prototype AI functions (placeholder for advanced AI)
-def get_ai_insights(preferences):
-    """
-    AI-powered insights - Coming Soon!
-    Full machine learning integration will include:
-    - Real-time price predictions
-    - Weather-based recommendations  
-    - Crowd density analysis
-    - Personalized itinerary optimization
-    """
-    return {
-        'status': 'coming_soon',
-        'message': '🤖 Advanced AI insights coming soon!',
-        'planned_features': [
-            'Real-time price optimization',
-            'Weather-based activity suggestions',
-            'Crowd density predictions',
-            'Personalized itinerary generation'
-        ]
-    }
-
-def real_time_booking(destination, dates):
-    """
-    Real-time booking integration - Coming Soon!
-    Will include integration with:
-    - Flight booking APIs
-    - Hotel reservation systems
-    - Activity booking platforms  
-    - Transport arrangements
-    """
-    return {
-        'status': 'coming_soon',
-        'message': '✈️ Seamless booking integration coming soon!',
-        'planned_features': [
-            'One-click flight booking',
-            'Hotel reservations',
-            'Activity bookings',
-            'Transport arrangements'
-        ]
-    }
+"""
+AI Trip Planner - Core Logic
+Prototype for personalized trip recommendations with festival integration
+"""
+
+from datetime import date, datetime, timedelta
+from functools import lru_cache, partial
+from itertools import chain
+from cost_engine import CostStream, estimate_costs, request_seed
+from geo_index import haversine_km
+from interval_index import format_date_range, parse_date, travel_window
+from ranking import score_fields, score_recommendation, top_k
+from recommendation_cache import RecommendationCache
+from records import Recommendation
+from festival_data import (
+    get_festivals_by_month, 
+    current_catalog
+)
+
+# Search radius for the `near` preference when no radius_km is given
+DEFAULT_RADIUS_KM = 300
+
+# Preferences that must be text when given (trip dates may also be dates)
+TEXT_PREFERENCES = ("travel_month", "preferred_country", "budget_category", "near")
+DATE_PREFERENCES = ("depart_date", "return_date")
+
+def check_preferences(preferences):
+    """
+    Raise ValueError naming the first preference of the wrong type
+    Runs before any planning work, so a bad field always gets the same message.
+    """
+    for field in TEXT_PREFERENCES:
+        value = preferences.get(field)
+        if value is not None and not isinstance(value, str):
+            raise ValueError(f"{field} must be text")
+    for field in DATE_PREFERENCES:
+        value = preferences.get(field)
+        if value is None or isinstance(value, date):
+            continue
+        try:
+            parse_date(value)
+        except (ValueError, AttributeError):
+            raise ValueError(f"{field} must be a YYYY-MM-DD date")
+    duration = preferences.get('duration', 7)
+    if isinstance(duration, bool) or not isinstance(duration, int) or duration < 1:
+        raise ValueError("duration must be a positive whole number of days")
+
+class TripPlanner:
+    def __init__(self, cost_seed=0, cache_size=512, cache_ttl=300, answer_table=None):
+        self.cost_seed = cost_seed
+        self.answer_table = answer_table
+        self.cache = RecommendationCache(maxsize=cache_size, ttl=cache_ttl)
+        self.budget_ranges = {
+            "budget": {"min": 500, "max": 1500, "type": "budget-friendly"},
+            "moderate": {"min": 1500, "max": 3500, "type": "moderate"}, 
+            "luxury": {"min": 3500, "max": 10000, "type": "expensive"}
+        }
+    
+    def get_personalized_recommendations(self, preferences, k=3):
+        """
+        Generate personalized trip recommendations based on user preferences
+        Returns the k best scoring recommendations (top 3 by default) as a
+        tuple of read-only records. This is a prototype - full AI integration coming soon!
+        """
+        # One catalog snapshot for the whole request, even if a reload swaps in another
+        catalog = current_catalog()
+        key = self._preference_key(preferences, catalog)
+        
+        # Entries from older snapshots are never hit again and age out of the LRU
+        cache_key = (catalog.version,) + key + (preferences.get('duration', 7), k)
+        recommendations = self.cache.get(cache_key)
+        if recommendations is None:
+            recommendations = self._lookup_preference_key(key, k, catalog)
+            recommendations = self._price_recommendations(recommendations, key, preferences)
+            self.cache.put(cache_key, recommendations)
+        
+        # A tuple of read-only records - the cached copy is handed out as is
+        return recommendations
+    
+    def invalidate_cache(self):
+        """
+        Clear all cached recommendations at once
+        Not needed after a catalog swap - cache keys carry the catalog version.
+        """
+        self.cache.invalidate()
+    
+    def get_personalized_recommendations_batch(self, preferences_list, k=3):
+        """
+        Generate recommendations for many users at once
+        Requests sharing (month, country, budget category, dates, area) are evaluated once
+        and only priced per request. Results match the single-request API.
+        """
+        catalog = current_catalog()
+        normalize = lru_cache(maxsize=None)(catalog.normalize_country_input)
+        evaluated = {}
+        results = []
+        
+        for preferences in preferences_list:
+            key = self._preference_key(preferences, catalog, normalize)
+            if key not in evaluated:
+                evaluated[key] = self._lookup_preference_key(key, k, catalog)
+            results.append(self._price_recommendations(evaluated[key], key, preferences))
+        
+        return results
+    
+    def iter_recommendations(self, preferences, cursor=None):
+        """
+        Lazily yield (cursor, recommendation) pairs in ranked order
+        Candidates are streamed from the indexes once per score tier, so memory
+        stays flat however many festivals match. Pass a cursor back in to
+        resume right after the recommendation it came with.
+        """
+        catalog = current_catalog()
+        key = self._preference_key(preferences, catalog)
+        month, preferred_country, budget_category, window, near = key
+        budget_ranges, score = self._ranking_context(key, catalog)
+        duration = preferences.get('duration', 7)
+        
+        phase, resume_score, resume_position, priced = self._parse_cursor(cursor)
+        
+        # Notices come first, same as get_personalized_recommendations
+        if phase == 'notice':
+            for position, notice in enumerate(self._get_notices(catalog, month, preferred_country, budget_ranges, window, near)):
+                if position > resume_position:
+                    yield f"notice:{position}:0", notice
+            resume_score, resume_position = None, -1
+        
+        # Prices match the list API for the same request
+        costs = CostStream(seed=request_seed(self.cost_seed, key, duration), skip=priced)
+        
+        # One pass to find the score tiers, then one pass per tier from the top
+        tiers = {score(rec) for rec in self._iter_candidates(catalog, month, preferred_country, budget_ranges, window, near)}
+        for tier in sorted(tiers, reverse=True):
+            if resume_score is not None and tier > resume_score:
+                continue
+            for position, rec in enumerate(self._iter_candidates(catalog, month, preferred_country, budget_ranges, window, near)):
+                if tier == resume_score and position <= resume_position:
+                    continue
+                if score(rec) != tier:
+                    continue
+                rec = rec.replace(estimated_cost=costs.estimate(rec.budget_range, duration))
+                priced += 1
+                yield f"{tier}:{position}:{priced}", rec
+    
+    def _parse_cursor(self, cursor):
+        """Split a stream cursor into (phase, score tier, position, priced count)"""
+        if cursor is None:
+            return 'notice', None, -1, 0
+        tier, position, priced = cursor.split(':')
+        if tier == 'notice':
+            return 'notice', None, int(position), 0
+        return 'ranked', int(tier), int(position), int(priced)
+    
+    def _preference_key(self, preferences, catalog, normalize=None):
+        """Reduce preferences to the (month, country, budget category, date window, area) group key"""
+        check_preferences(preferences)
+        normalize = normalize or catalog.normalize_country_input
+        month = preferences.get('travel_month')
+        country = preferences.get('preferred_country')
+        budget_category = preferences.get('budget_category') or None
+        if budget_category is not None and budget_category not in self.budget_ranges:
+            raise ValueError(f"Unknown budget_category {budget_category!r} - "
+                             f"choose one of {', '.join(self.budget_ranges)}")
+        return (
+            month.lower() if month else None,
+            normalize(country) if country else None,
+            budget_category,
+            self._travel_window(preferences),
+            self._search_area(preferences, catalog)
+        )
+    
+    def _travel_window(self, preferences):
+        """
+        Day-number window for the depart_date/return_date preferences
+        Without a return date the trip lasts `duration` days from departure.
+        """
+        depart = preferences.get('depart_date')
+        if not depart:
+            return None
+        return_date = preferences.get('return_date')
+        if not return_date:
+            duration = preferences.get('duration', 7)
+            try:
+                return_date = parse_date(depart) + timedelta(days=duration - 1)
+            except OverflowError:
+                raise ValueError(f"A {duration}-day trip from {depart} ends past the last supported date")
+        return travel_window(depart, return_date)
+    
+    def _search_area(self, preferences, catalog):
+        """
+        (place, lat, lon, radius_km) for the `near` preference
+        Festivals are then matched by distance instead of by exact country.
+        The place must name a known city exactly - near misses are offered as
+        suggestions in the error, never applied.
+        """
+        place = preferences.get('near')
+        if not place:
+            return None
+        city = place.lower().strip()
+        if city not in catalog.city_coordinates:
+            suggestions = [name.title() for name, country in catalog.suggest_corrections(city)
+                           if name in catalog.city_coordinates]
+            hint = f" - did you mean {', '.join(suggestions)}?" if suggestions else ""
+            raise ValueError(f"Unknown city for near: {place!r}{hint}")
+        
+        radius_km = preferences.get('radius_km')
+        if radius_km is None:
+            radius_km = DEFAULT_RADIUS_KM
+        if isinstance(radius_km, bool) or not isinstance(radius_km, (int, float)) or not radius_km > 0:
+            raise ValueError("radius_km must be a positive number of km")
+        return (city.title(), *catalog.city_coordinates[city], float(radius_km))
+    
+    def _lookup_preference_key(self, key, k, catalog):
+        """Fetch unpriced recommendations from the answer table, or evaluate them"""
+        # The table only answers for the catalog data it was built from
+        if self.answer_table is not None and self.answer_table.fingerprint == catalog.fingerprint:
+            recommendations = self.answer_table.get(key, k)
+            if recommendations is not None:
+                return recommendations
+        return self._evaluate_preference_key(key, k, catalog)
+    
+    def _evaluate_preference_key(self, key, k, catalog):
+        """Build the top k unpriced recommendations for a preference group key"""
+        month, preferred_country, budget_category, window, near = key
+        budget_ranges, score = self._ranking_context(key, catalog)
+        
+        # Notices always come first
+        recommendations = self._get_notices(catalog, month, preferred_country, budget_ranges, window, near)
+        
+        # Rank festivals and destinations together. Festivals are ranked as row
+        # ids scored from the store columns, so only the winners become records.
+        score_row = self._festival_row_score(key, catalog)
+        candidates = chain(
+            self._festival_rows(catalog, month, preferred_country, budget_ranges, window, near),
+            self._get_destination_recommendations(catalog, preferred_country, budget_ranges)
+        )
+        winners = top_k(candidates, k - len(recommendations),
+                        lambda candidate: score_row(candidate) if isinstance(candidate, int) else score(candidate))
+        recommendations.extend(self._festival_recommendation(catalog.festivals.row(candidate), near)
+                               if isinstance(candidate, int) else candidate for candidate in winners)
+        
+        return recommendations[:k]
+    
+    def _ranking_context(self, key, catalog):
+        """Get the allowed budget ranges and the scoring function for a group key"""
+        budget_type = self._budget_type(key)
+        score = partial(score_recommendation, **self._score_preferences(key, catalog))
+        return self._allowed_budget_ranges(budget_type), score
+    
+    def _festival_row_score(self, key, catalog):
+        """
+        Scoring function for festival row ids of the catalog's store
+        Gives the same score as the festival's recommendation would get, read
+        straight from the store columns without decoding the row.
+        """
+        festivals = catalog.festivals
+        names, descriptions = festivals.names, festivals.descriptions
+        country_of, budget_range_of = festivals.countries.value, festivals.budget_ranges.value
+        score = partial(score_fields, 'festival', **self._score_preferences(key, catalog))
+        
+        def score_row(row_id):
+            country = country_of(row_id)
+            text = f"{self._festival_title(names[row_id], country)} {descriptions[row_id]}"
+            return score(country, (), budget_range_of(row_id), text)
+        return score_row
+    
+    def _budget_type(self, key):
+        """Festival/destination budget range for the key's budget category, None if not specified"""
+        budget_category = key[2]
+        return self.budget_ranges[budget_category]['type'] if budget_category else None
+    
+    def _score_preferences(self, key, catalog):
+        """Keyword arguments of score_recommendation for a group key"""
+        month, preferred_country, budget_category, window, near = key
+        return {
+            'preferred_country': preferred_country,
+            'budget_type': self._budget_type(key),
+            'travel_month': month,
+            'travel_dates': window,
+            'near': near,
+            'country_specialties': catalog.country_specialties
+        }
+    
+    def _iter_candidates(self, catalog, month, preferred_country, budget_ranges, window=None, near=None):
+        """Stream festival then destination candidates"""
+        return chain(
+            self._get_festival_recommendations(catalog, month, preferred_country, budget_ranges, window, near),
+            self._get_destination_recommendations(catalog, preferred_country, budget_ranges)
+        )
+    
+    def _price_recommendations(self, recommendations, key, preferences):
+        """
+        Copy recommendations with cost estimates for the requested duration
+        Costs are seeded from the request, so identical requests get identical prices.
+        """
+        duration = preferences.get('duration', 7)
+        to_price = [rec for rec in recommendations if rec.type != 'notice']
+        costs = iter(estimate_costs(
+            [rec.budget_range for rec in to_price],
+            [duration] * len(to_price),
+            seed=request_seed(self.cost_seed, key, duration)
+        ))
+        
+        return tuple(rec if rec.type == 'notice' else rec.replace(estimated_cost=next(costs))
+                     for rec in recommendations)
+    
+    def _get_notices(self, catalog, month, preferred_country, budget_ranges, window=None, near=None):
+        """Explain when we have no festivals or destinations for the preferred country or area"""
+        notices = []
+        if not preferred_country and near is None:
+            return notices
+        
+        festivals = catalog.iter_festivals(**self._festival_filters(month, preferred_country, budget_ranges, window, near))
+        no_festivals = next(festivals, None) is None
+        if no_festivals and near is not None:
+            place, lat, lon, radius_km = near
+            notices.append(Recommendation(
+                type='notice',
+                title=f"No festivals within {radius_km:g} km of {place}",
+                description=f"None of the festivals in our current database are held within {radius_km:g} km of {place} at that time.",
+                budget_range='N/A',
+                estimated_cost=0,
+                suggestion="Try a larger search radius or different travel dates"
+            ))
+        elif no_festivals:
+            # Return a "no festivals found" recommendation
+            notices.append(Recommendation(
+                type='notice',
+                title=f"No festivals found for {preferred_country}",
+                description=f"We don't have festival data for {preferred_country} in our current database. Try exploring our available destinations or check our general recommendations.",
+                country=preferred_country,
+                budget_range='N/A',
+                estimated_cost=0,
+                suggestion=f"Explore general attractions and cultural sites in {preferred_country}"
+            ))
+        
+        if preferred_country and not catalog.has_destinations(preferred_country):
+            # If no destinations found for preferred country, return a notice
+            notices.append(Recommendation(
+                type='notice',
+                title=f"Limited destinations for {preferred_country}",
+                description=f"We have limited destination packages for {preferred_country}. Consider exploring our festival recommendations or general travel options.",
+                countries=[preferred_country],
+                budget_range='N/A',
+                estimated_cost=0
+            ))
+        
+        return notices
+    
+    def _festival_filters(self, month, preferred_country, budget_ranges, window, near):
+        """
+        Festival query for the preferences
+        Travel dates take precedence over the month, and a search area over the country.
+        """
+        filters = {'budget_ranges': budget_ranges}
+        if window is not None:
+            filters['window'] = window
+        else:
+            filters['month'] = month
+        if near is not None:
+            filters['near'] = near[1:]
+        else:
+            filters['country'] = preferred_country
+        return filters
+    
+    def _get_festival_recommendations(self, catalog, month, preferred_country, budget_ranges, window=None, near=None):
+        """Yield festival candidates matching the preferences (unpriced)"""
+        rows = self._festival_rows(catalog, month, preferred_country, budget_ranges, window, near)
+        for festival in catalog.festivals.rows(rows):
+            yield self._festival_recommendation(festival, near)
+    
+    def _festival_rows(self, catalog, month, preferred_country, budget_ranges, window=None, near=None):
+        """Row ids of the festivals matching the preferences, in catalog order"""
+        # Get festivals straight from the index
+        if month or preferred_country or window or near:
+            filters = self._festival_filters(month, preferred_country, budget_ranges, window, near)
+        else:
+            # No month, country, dates or area - budget-friendly festivals fit every budget
+            filters = {'budget_ranges': ['budget-friendly']}
+        return catalog.festivals.select(**filters)
+    
+    def _festival_title(self, name, country):
+        return f"Experience {name} in {country}"
+    
+    def _festival_recommendation(self, festival, near=None):
+        """Unpriced recommendation for a Festival record"""
+        return Recommendation(
+            type='festival',
+            title=self._festival_title(festival.name, festival.country),
+            description=festival.description,
+            country=festival.country,
+            budget_range=festival.budget_range,
+            estimated_cost=0,
+            dates=format_date_range(festival.start, festival.end),
+            distance_km=round(haversine_km(near[1], near[2], festival.lat, festival.lon)) if near else None
+        )
+    
+    def _allowed_budget_ranges(self, budget_type):
+        """Budget ranges that fit a budget type (None means no filter)"""
+        if not budget_type:
+            return None
+        # Allow budget-friendly for all budget types, and match exact budget types
+        if budget_type in ['moderate', 'expensive']:
+            return [budget_type, 'budget-friendly']
+        return [budget_type]
+    
+    def _get_destination_recommendations(self, catalog, preferred_country, budget_ranges):
+        """Yield destination package candidates matching the preferences (unpriced)"""
+        for destination in catalog.iter_destinations(country=preferred_country, budget_ranges=budget_ranges):
+            yield Recommendation(
+                type='destination',
+                title=destination.title,
+                description=destination.description,
+                countries=destination.countries,
+                country_match=destination.country_match,
+                budget_range=destination.budget_range,
+                estimated_cost=0
+            )
+    
+    def lookup_place(self, place):
+        """
+        What the catalog knows about a place the user typed
+        Returns the country it maps to, the known city it names (typos
+        tolerated) and that city's (lat, lon), with None for unknown parts.
+        Unknown places also get did-you-mean suggestions as (name, country)
+        pairs, nearest first.
+        """
+        catalog = current_catalog()
+        city = catalog.resolve_city(place)
+        suggestions = catalog.suggest_corrections(place)
+        if suggestions and suggestions[0][0] == place.lower().strip():
+            # An exact match needs no suggestions
+            suggestions = []
+        return {
+            'country': catalog.normalize_country_input(place),
+            'city': city,
+            'location': catalog.city_coordinates[city] if city else None,
+            'suggestions': suggestions
+        }
+    
+    def get_seasonal_highlights(self, month):
+        """Get seasonal highlights for a specific month"""
+        festivals = get_festivals_by_month(month)
+        
+        highlights = {
+            'festivals': festivals,
+            'weather_tips': self._get_weather_tips(month),
+            'travel_tips': self._get_travel_tips(month)
+        }
+        
+        return highlights
+    
+    def _get_weather_tips(self, month):
+        """Get weather tips for the month (prototype data)"""
+        weather_tips = {
+            'march': 'Spring weather, pack layers',
+            'april': 'Mild temperatures, perfect for sightseeing',
+            'may': 'Warm weather begins, light clothing recommended',
+            'june': 'Summer begins, hot in many destinations',
+            'july': 'Peak summer, very hot in Europe and Asia',
+            'august': 'Hot summer continues, monsoon in some regions',
+            'september': 'Pleasant weather, great for travel',
+            'october': 'Cool temperatures, autumn colors',
+            'november': 'Cool weather, fewer crowds',
+            'december': 'Winter begins, holiday season',
+            'january': 'Cold in northern hemisphere, summer in south',
+            'february': 'Still cold in north, good for tropical destinations'
+        }
+        
+        return weather_tips.get(month.lower(), 'Check local weather conditions')
+    
+    def _get_travel_tips(self, month):
+        """Get travel tips for the month"""
+        tips = {
+            'march': 'Book early for spring festivals',
+            'april': 'Cherry blossom season - book accommodations early',
+            'may': 'Great weather for outdoor activities',
+            'june': 'Peak season begins - expect higher prices',
+            'july': 'Peak tourist season - book well in advance',
+            'august': 'Very busy season, consider alternative dates',
+            'september': 'Shoulder season - good prices and weather',
+            'october': 'Excellent time to travel, beautiful autumn',
+            'november': 'Low season - great deals available',
+            'december': 'Holiday season - book early for festivities',
+            'january': 'Low season in most places - good deals',
+            'february': 'Still low season - ideal for budget travel'
+        }
+        
+        return tips.get(month.lower(), 'Research local conditions before travel')
+
+# Prototype AI functions (placeholder for advanced AI)
+def get_ai_insights(preferences):
+    """
+    AI-powered insights - Coming Soon!
+    Full machine learning integration will include:
+    - Real-time price predictions
+    - Weather-based recommendations  
+    - Crowd density analysis
+    - Personalized itinerary optimization
+    """
+    return {
+        'status': 'coming_soon',
+        'message': '🤖 Advanced AI insights coming soon!',
+        'planned_features': [
+            'Real-time price optimization',
+            'Weather-based activity suggestions',
+            'Crowd density predictions',
+            'Personalized itinerary generation'
+        ]
+    }
+
+def real_time_booking(destination, dates):
+    """
+    Real-time booking integration - Coming Soon!
+    Will include integration with:
+    - Flight booking APIs
+    - Hotel reservation systems
+    - Activity booking platforms  
+    - Transport arrangements
+    """
+    return {
+        'status': 'coming_soon',
+        'message': '✈️ Seamless booking integration coming soon!',
+        'planned_features': [
+            'One-click flight booking',
+            'Hotel reservations',
+            'Activity bookings',
+            'Transport arrangements'
+        ]
+    }